@@ -0,0 +1,306 @@
+"""
+End-to-end throughput benchmarks for `dbferry migrate` and `dbferry verify`.
+
+Seeds a local Postgres with synthetic scenarios (see datagen.py), times
+MigrationManager.run and a full verification, and stores or compares
+results against named baselines in benchmarks/baselines/.
+
+    python -m benchmarks.bench --scenarios narrow,wide --repeat 3 --save main
+    python -m benchmarks.bench --compare main --threshold 0.10
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import psycopg2
+
+from benchmarks.datagen import SCENARIOS, Scenario, seed
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+SOURCE_DB = "dbferry_bench_src"
+TARGET_DB = "dbferry_bench_tgt"
+
+
+def _recreate(conn_args: dict, database: str):
+    conn = psycopg2.connect(dbname="postgres", **conn_args)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f'DROP DATABASE IF EXISTS "{database}";')
+            cur.execute(f'CREATE DATABASE "{database}";')
+    finally:
+        conn.close()
+
+
+def _config(conn_args: dict, engine: str, workers: int, pipe_mode: bool):
+    from dbferry.core.config import DBConfig, MigrationConfig, OptionsConfig
+
+    def db(database: str) -> DBConfig:
+        return DBConfig(
+            type="postgres",
+            host=conn_args["host"],
+            port=conn_args["port"],
+            database=database,
+            user=conn_args["user"],
+            password=conn_args["password"],
+            sslmode="disable",
+        )
+
+    return MigrationConfig(
+        source=db(SOURCE_DB),
+        target=db(TARGET_DB),
+        options=OptionsConfig(
+            workers=workers,
+            engine=engine,
+            pipe_mode=pipe_mode,
+            # Every repetition starts cold
+            schema_snapshot=False,
+        ),
+    )
+
+
+def _verify(cfg, tables: list[str]) -> bool:
+    from dbferry.core.connection import ConnectionManager
+    from dbferry.core.schema import SchemaCache
+    from dbferry.core.verify import ChecksumVerifier, RowCounter
+
+    def connect(db_cfg):
+        adapter = ConnectionManager.get_adapter(db_cfg)
+        adapter.connect()
+        return adapter
+
+    counts = RowCounter(
+        connect_source=lambda: connect(cfg.source),
+        connect_target=lambda: connect(cfg.target),
+        workers=cfg.options.workers,
+    ).count(tables)
+
+    source, target = connect(cfg.source), connect(cfg.target)
+    try:
+        schemas = SchemaCache(source)
+        verifier = ChecksumVerifier(source, target)
+        diffs = [verifier.verify_table(s) for s in schemas.load(tables)]
+    finally:
+        source.close()
+        target.close()
+    return all(c.matched for c in counts) and all(d.matched for d in diffs)
+
+
+def run_scenario(scenario: Scenario, conn_args: dict, repeat: int, **options) -> dict:
+    from dbferry.core.migrate import MigrationManager
+
+    _recreate(conn_args, SOURCE_DB)
+    conn = psycopg2.connect(dbname=SOURCE_DB, **conn_args)
+    try:
+        started = time.perf_counter()
+        seed(conn, scenario)
+        seed_seconds = time.perf_counter() - started
+    finally:
+        conn.close()
+
+    migrate_times, verify_times = [], []
+    rows = nbytes = 0
+    ok = True
+    for _ in range(repeat):
+        _recreate(conn_args, TARGET_DB)
+        cfg = _config(conn_args, **options)
+        if cfg.options.engine == "asyncio":
+            from dbferry.core.async_migrate import AsyncMigrationManager as manager_cls
+        else:
+            manager_cls = MigrationManager
+
+        # Journal, snapshot and report files go to a throwaway directory
+        with tempfile.TemporaryDirectory(prefix="dbferry-bench-") as workdir:
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                mgr = manager_cls(config=cfg, dry_run=False)
+                started = time.perf_counter()
+                mgr.run()
+                migrate_times.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                ok &= _verify(cfg, scenario.tables)
+                verify_times.append(time.perf_counter() - started)
+            finally:
+                os.chdir(cwd)
+
+        report = mgr.metrics.to_dict()
+        ok &= all(t["status"] == "done" for t in report["tables"].values())
+        rows, nbytes = report["totals"]["rows"], report["totals"]["bytes"]
+
+    migrate = statistics.median(migrate_times)
+    return {
+        "rows": rows,
+        "bytes": nbytes,
+        "seed_seconds": round(seed_seconds, 3),
+        "migrate_seconds": round(migrate, 3),
+        "migrate_runs": [round(t, 3) for t in migrate_times],
+        "verify_seconds": round(statistics.median(verify_times), 3),
+        "rows_per_second": round(rows / migrate, 1) if migrate else None,
+        "verified": ok,
+    }
+
+
+def _meta(options: dict, scale: float, repeat: int) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "recorded": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scale": scale,
+        "repeat": repeat,
+        **options,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """Print a comparison table; returns False if any scenario regressed."""
+    from dbferry.core.console import Printer as p
+
+    rows, regressed = [], False
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            rows.append([name, "—", f"{result['migrate_seconds']:.3f}s", "—", "new"])
+            continue
+        for metric in ("migrate_seconds", "verify_seconds"):
+            before, after = base[metric], result[metric]
+            delta = (after - before) / before if before else 0.0
+            if delta > threshold:
+                status, regressed = "[red]slower[/red]", True
+            elif delta < -threshold:
+                status = "[green]faster[/green]"
+            else:
+                status = "same"
+            rows.append(
+                [
+                    f"{name} {metric.split('_')[0]}",
+                    f"{before:.3f}s",
+                    f"{after:.3f}s",
+                    f"{delta:+.1%}",
+                    status,
+                ]
+            )
+    p.table(
+        title=f"Against baseline (±{threshold:.0%} noise band)",
+        columns=["Scenario", "Baseline", "Current", "Change", "Status"],
+        rows=rows,
+    )
+    if baseline["meta"].get("scale") != current["meta"].get("scale"):
+        p.warn(
+            "Baseline was recorded at a different --scale; numbers aren't comparable."
+        )
+    return not regressed
+
+
+@click.command()
+@click.option("--scenarios", default=",".join(SCENARIOS), show_default=True)
+@click.option("--scale", default=1.0, show_default=True, help="Multiply row counts")
+@click.option(
+    "--repeat",
+    default=3,
+    show_default=True,
+    help="Runs per scenario; the median counts",
+)
+@click.option("--engine", type=click.Choice(["threads", "asyncio"]), default="threads")
+@click.option("--workers", default=4, show_default=True)
+@click.option("--pipe-mode/--no-pipe-mode", default=True, show_default=True)
+@click.option("--save", "save_as", help="Store results as baselines/<name>.json")
+@click.option(
+    "--compare", "compare_to", help="Compare results with baselines/<name>.json"
+)
+@click.option("--threshold", default=0.10, show_default=True, help="Allowed slowdown")
+@click.option("--host", default=lambda: os.environ.get("PGHOST", "127.0.0.1"))
+@click.option("--port", default=lambda: int(os.environ.get("PGPORT", 5432)), type=int)
+@click.option("--user", default=lambda: os.environ.get("PGUSER", "postgres"))
+@click.option("--password", default=lambda: os.environ.get("PGPASSWORD", ""))
+@click.option("--verbose", is_flag=True, help="Show dbferry's own output")
+def main(
+    scenarios,
+    scale,
+    repeat,
+    engine,
+    workers,
+    pipe_mode,
+    save_as,
+    compare_to,
+    threshold,
+    host,
+    port,
+    user,
+    password,
+    verbose,
+):
+    """Benchmark dbferry migrate + verify against synthetic Postgres data."""
+    # dbferry.log is written to the working directory; keep it out of the tree
+    os.chdir(tempfile.mkdtemp(prefix="dbferry-bench-"))
+    from dbferry.core.console import Printer as p
+    from dbferry.core.console import get_console
+
+    console = get_console()
+
+    names = [s.strip() for s in scenarios.split(",") if s.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise click.BadParameter(f"unknown scenario(s): {', '.join(unknown)}")
+
+    baseline = None
+    if compare_to:
+        path = BASELINE_DIR / f"{compare_to}.json"
+        if not path.exists():
+            raise click.BadParameter(f"no baseline at {path}")
+        baseline = json.loads(path.read_text())
+
+    conn_args = {"host": host, "port": port, "user": user, "password": password}
+    options = {"engine": engine, "workers": workers, "pipe_mode": pipe_mode}
+    current = {"meta": _meta(options, scale, repeat), "results": {}}
+
+    for name in names:
+        scenario = SCENARIOS[name].scaled(scale)
+        p.info(
+            f"Running {name}: {scenario.rows} rows × {len(scenario.tables)} table(s)..."
+        )
+        console.quiet = not verbose
+        try:
+            result = run_scenario(scenario, conn_args, repeat, **options)
+        finally:
+            console.quiet = False
+        current["results"][name] = result
+        p.info(
+            f"{name}: migrate {result['migrate_seconds']:.3f}s "
+            f"({result['rows_per_second']} rows/s), verify {result['verify_seconds']:.3f}s"
+            + ("" if result["verified"] else " [red](verification failed)[/red]")
+        )
+
+    if save_as:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{save_as}.json"
+        path.write_text(json.dumps(current, indent=2) + "\n")
+        p.success(f"Saved baseline {path}")
+
+    failed = not all(r["verified"] for r in current["results"].values())
+    if baseline is not None and not compare(baseline, current, threshold):
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
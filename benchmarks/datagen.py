@@ -0,0 +1,146 @@
+"""
+Synthetic schemas and data for the benchmark suite.
+
+Everything is generated server-side with generate_series, so seeding a
+few hundred MB takes seconds and is identical from run to run.
+"""
+
+from dataclasses import dataclass, field, replace
+from math import ceil
+
+ENUM_NAME = "bench_level"
+ENUM_VALUES = ("low", "mid", "high")
+
+
+@dataclass
+class Scenario:
+    name: str
+    rows: int  # rows per table
+    width: int = 4  # payload columns per table, cycling through `types`
+    payload_bytes: int = 64  # size of each text/jsonb/bytea value
+    types: tuple[str, ...] = ("text", "jsonb", "bytea", "enum")
+    fk_depth: int = 0  # tables chained by foreign keys below the root
+    description: str = field(default="", compare=False)
+
+    @property
+    def tables(self) -> list[str]:
+        return [f"bench_{level}" for level in range(self.fk_depth + 1)]
+
+    def scaled(self, factor: float) -> "Scenario":
+        return replace(self, rows=max(1, int(self.rows * factor)))
+
+
+SCENARIOS = {
+    s.name: s
+    for s in [
+        Scenario(
+            "narrow",
+            rows=500_000,
+            width=1,
+            payload_bytes=16,
+            types=("text",),
+            description="many small rows; per-row and per-batch overhead",
+        ),
+        Scenario(
+            "wide",
+            rows=100_000,
+            width=16,
+            payload_bytes=64,
+            description="mixed text/jsonb/bytea/enum columns; encoding cost",
+        ),
+        Scenario(
+            "blobs",
+            rows=2_000,
+            width=2,
+            payload_bytes=64 * 1024,
+            types=("bytea", "jsonb"),
+            description="large values; memory and bytes on the wire",
+        ),
+        Scenario(
+            "deep",
+            rows=50_000,
+            width=2,
+            payload_bytes=32,
+            types=("text", "enum"),
+            fk_depth=6,
+            description="long FK chain; scheduling and constraint build",
+        ),
+    ]
+}
+
+
+def _value(kind: str, column: int, payload: int) -> str:
+    """SQL expression for one payload column of row `g`."""
+    # md5 gives 32 hex characters; repeat it until the payload is covered
+    hex_repeat = ceil(payload * 2 / 32)
+    text = f"left(repeat(md5((g + {column})::text), {hex_repeat}), {payload})"
+    if kind == "text":
+        return text
+    if kind == "jsonb":
+        return f"jsonb_build_object('id', g, 'col', {column}, 'body', {text})"
+    if kind == "bytea":
+        return (
+            f"decode(left(repeat(md5((g + {column})::text), {hex_repeat}), "
+            f"{payload * 2}), 'hex')"
+        )
+    if kind == "enum":
+        values = ", ".join(f"'{v}'" for v in ENUM_VALUES)
+        return (
+            f"(ARRAY[{values}])[1 + (g + {column}) % {len(ENUM_VALUES)}]::{ENUM_NAME}"
+        )
+    raise ValueError(f"Unknown column type: {kind}")
+
+
+def _column_type(kind: str) -> str:
+    return ENUM_NAME if kind == "enum" else kind
+
+
+def ddl(scenario: Scenario) -> list[str]:
+    statements = [
+        f"CREATE TYPE {ENUM_NAME} AS ENUM ({', '.join(repr(v) for v in ENUM_VALUES)});"
+    ]
+    for level, table in enumerate(scenario.tables):
+        columns = ["id integer PRIMARY KEY"]
+        if level:
+            columns.append(
+                f"parent_id integer NOT NULL REFERENCES {scenario.tables[level - 1]}(id)"
+            )
+        for i in range(scenario.width):
+            kind = scenario.types[i % len(scenario.types)]
+            columns.append(f"c{i} {_column_type(kind)}")
+        statements.append(f"CREATE TABLE {table} ({', '.join(columns)});")
+        if level:
+            statements.append(f"CREATE INDEX ON {table} (parent_id);")
+    return statements
+
+
+def inserts(scenario: Scenario) -> list[str]:
+    statements = []
+    for level, table in enumerate(scenario.tables):
+        exprs = ["g"]
+        if level:
+            # Scatter children over all parents
+            exprs.append(f"1 + (g * 7919) % {scenario.rows}")
+        for i in range(scenario.width):
+            kind = scenario.types[i % len(scenario.types)]
+            exprs.append(_value(kind, i, scenario.payload_bytes))
+        statements.append(
+            f"INSERT INTO {table} SELECT {', '.join(exprs)} "
+            f"FROM generate_series(1, {scenario.rows}) g;"
+        )
+    return statements
+
+
+def seed(conn, scenario: Scenario):
+    """Create and fill the scenario's tables through a psycopg2 connection."""
+    with conn.cursor() as cur:
+        for statement in ddl(scenario) + inserts(scenario):
+            cur.execute(statement)
+    conn.commit()
+
+    # ANALYZE gives the planner (and dbferry's range splitting) real statistics
+    autocommit = conn.autocommit
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute("VACUUM ANALYZE;")
+    conn.autocommit = autocommit
@@ -0,0 +1,148 @@
+"""
+CLI startup-time benchmark with a budget.
+
+Times fresh interpreters running `import dbferry.cli`, `dbferry --help` and
+`dbferry init`, each measured as the median wall time above a bare
+`python -c pass` and held to a per-command budget. It also checks that none
+of the heavy modules (database drivers, networkx, yaml, rich) get imported
+just to print the help. Exits 1 when a command goes over its budget or a
+heavy module shows up.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 20 --budget-factor 2  # slower machines
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules `dbferry --help` must not pay for; commands import them on use
+HEAVY_MODULES = [
+    "psycopg2",
+    "psycopg",
+    "pymysql",
+    "sqlite3",
+    "networkx",
+    "yaml",
+    "rich",
+    "dbferry.core.adapters",
+]
+
+# Command → (interpreter arguments, budget in ms above bare interpreter start).
+# `init` also loads yaml and rich to write and announce the sample config.
+COMMANDS = {
+    "import": (["-c", "import dbferry.cli"], 100),
+    "help": (["-m", "dbferry.cli", "--help"], 100),
+    "init": (["-m", "dbferry.cli", "init"], 200),
+}
+
+# Prints the modules loaded after the CLI rendered its help
+_LOADED_SCRIPT = """
+import json, sys
+from dbferry.cli import app
+try:
+    app(["--help"])
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(ROOT), env.get("PYTHONPATH")])
+    )
+    return env
+
+
+def _time(args: list[str], repeat: int) -> float:
+    """Median wall time of `python <args>` in milliseconds, each run in a fresh directory."""
+    times = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="dbferry-startup-") as cwd:
+            started = time.perf_counter()
+            subprocess.run(
+                [sys.executable, *args],
+                cwd=cwd,
+                env=_env(),
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+            times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def heavy_imports() -> list[str]:
+    """Heavy modules loaded by a fresh `dbferry --help`."""
+    out = subprocess.run(
+        [sys.executable, "-c", _LOADED_SCRIPT],
+        cwd=tempfile.gettempdir(),
+        env=_env(),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    loaded = json.loads(out.strip().splitlines()[-1])
+    return [
+        name
+        for name in HEAVY_MODULES
+        if any(m == name or m.startswith(name + ".") for m in loaded)
+    ]
+
+
+@click.command()
+@click.option(
+    "--repeat",
+    default=10,
+    show_default=True,
+    help="Runs per command; the median counts",
+)
+@click.option(
+    "--budget-factor",
+    default=1.0,
+    show_default=True,
+    help="Multiply every command's budget",
+)
+def main(repeat, budget_factor):
+    """Check dbferry's CLI startup time against a budget."""
+    # dbferry.log is written to the working directory; keep it out of the tree
+    os.chdir(tempfile.mkdtemp(prefix="dbferry-startup-"))
+    from dbferry.core.console import Printer as p
+
+    interpreter = _time(["-c", "pass"], repeat)
+    rows, failed = [], False
+    for name, (args, budget) in COMMANDS.items():
+        budget_ms = budget * budget_factor
+        overhead = _time(args, repeat) - interpreter
+        if overhead > budget_ms:
+            status, failed = "[red]over budget[/red]", True
+        else:
+            status = "[green]ok[/green]"
+        rows.append([name, f"{overhead:.1f} ms", f"{budget_ms:.0f} ms", status])
+    p.table(
+        title=f"CLI startup (above {interpreter:.1f} ms interpreter start)",
+        columns=["Command", "Median", "Budget", "Status"],
+        rows=rows,
+    )
+
+    heavy = heavy_imports()
+    if heavy:
+        failed = True
+        p.error(f"`dbferry --help` imported: {', '.join(heavy)}")
+    else:
+        p.success("`dbferry --help` imported no drivers, networkx, yaml or rich.")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 import click
 from pathlib import Path
-import yaml
 
 from dbferry.core.config import ConfigLoader
 from dbferry.core.console import Printer as p
@@ -48,6 +47,8 @@ def init():
         },
     }
 
+    import yaml
+
     with open(config_path, "w") as f:
         yaml.dump(sample_config, f, sort_keys=False)
 
@@ -93,7 +94,6 @@ def check(config):
             try:
                 p.info(f"Connecting to {name} database ({db_cfg.type})...")
                 adapter = conn_mgr.get_adapter(db_cfg)
-                adapter.connect()
                 adapter.test_connection()
                 results[name] = True
                 p.success(f"{name.capitalize()} connection successful")
@@ -119,7 +119,12 @@ def check(config):
     "--config", default="migration.yml", help="Path to the migration config file"
 )
 @click.option("--dry-run", is_flag=True, help="Simulate migration without writing data")
-def migrate(config, dry_run):
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue an interrupted migration from its checkpoint journal",
+)
+def migrate(config, dry_run, resume):
     """
     Run a mock migration based on the provided configuration.
     """
@@ -137,7 +142,10 @@ def migrate(config, dry_run):
 
     try:
         cfg = ConfigLoader.load(path)
-        mgr = MigrationManager(config=cfg, dry_run=dry_run)
+        manager_cls = MigrationManager
+        if cfg.options.engine == "asyncio":
+            from dbferry.core.async_migrate import AsyncMigrationManager as manager_cls
+        mgr = manager_cls(config=cfg, dry_run=dry_run, resume=resume)
         mgr.run()
     except Exception as e:
         p.error(f"Migration failed: {e}")
@@ -147,13 +155,133 @@ def migrate(config, dry_run):
 @click.option(
     "--config", default="migration.yml", help="Path to the migration config file"
 )
-def verify(config):
+def sync(config):
+    """
+    Copy rows changed since the last migrate/sync pass and upsert them on the target.
+    """
+    from dbferry.core.sync import SyncManager
+
+    path = Path(config)
+    if not path.exists():
+        p.error(f"Config file not found: {path}")
+        return
+
+    try:
+        cfg = ConfigLoader.load(path)
+        if SyncManager(cfg).run():
+            p.panel("✅ Sync complete.", title="Sync", style="green")
+        else:
+            p.panel("⚠️ Some tables failed to sync.", title="Sync", style="yellow")
+    except Exception as e:
+        p.error(f"Sync failed: {e}")
+
+
+@app.command()
+@click.option(
+    "--config", default="migration.yml", help="Path to the migration config file"
+)
+@click.option("--out", required=True, help="Directory to write the export to")
+@click.option(
+    "--chunk-rows", default=100_000, show_default=True, help="Rows per chunk file"
+)
+@click.option(
+    "--workers",
+    type=int,
+    help="Processes compressing chunks (default: options.workers)",
+)
+@click.option(
+    "--level", default=6, show_default=True, help="gzip compression level (1-9)"
+)
+def export(config, out, chunk_rows, workers, level):
+    """
+    Export the source tables to chunked, compressed files for an offline import.
+    """
+    from dbferry.core.archive import ExportManager
+
+    path = Path(config)
+    if not path.exists():
+        p.error(f"Config file not found: {path}")
+        return
+
+    try:
+        cfg = ConfigLoader.load(path)
+        if ExportManager(cfg, out, chunk_rows, workers, level).run():
+            p.panel(f"✅ Export written to {out}.", title="Export", style="green")
+    except Exception as e:
+        p.error(f"Export failed: {e}")
+
+
+@app.command("import")
+@click.option(
+    "--config", default="migration.yml", help="Path to the migration config file"
+)
+@click.option(
+    "--from", "from_dir", required=True, help="Directory written by `dbferry export`"
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Skip chunks already loaded by an interrupted import",
+)
+@click.option(
+    "--workers", type=int, help="Chunks loaded in parallel (default: options.workers)"
+)
+def import_(config, from_dir, resume, workers):
+    """
+    Load an export made by `dbferry export` into the target database.
+    """
+    from dbferry.core.archive import ImportManager
+
+    path = Path(config)
+    if not path.exists():
+        p.error(f"Config file not found: {path}")
+        return
+
+    try:
+        cfg = ConfigLoader.load(path)
+        if ImportManager(cfg, from_dir, resume, workers).run():
+            p.panel("✅ Import complete.", title="Import", style="green")
+        else:
+            p.panel("⚠️ Some tables failed to import.", title="Import", style="yellow")
+    except Exception as e:
+        p.error(f"Import failed: {e}")
+
+
+@app.command()
+@click.option(
+    "--config", default="migration.yml", help="Path to the migration config file"
+)
+@click.option(
+    "--checksum",
+    is_flag=True,
+    help="Also compare table contents by checksum and locate differing rows",
+)
+@click.option(
+    "--fast",
+    is_flag=True,
+    help="Compare statistics estimates first; count exactly only where they differ",
+)
+@click.option(
+    "--tolerance",
+    default=0.01,
+    show_default=True,
+    help="Relative difference between estimates accepted by --fast",
+)
+@click.option(
+    "--workers", default=8, show_default=True, help="Concurrent count queries"
+)
+def verify(config, checksum, fast, tolerance, workers):
     """
     Verify that the target database matches the source after migration.
     Compares row counts table-by-table and renders a summary.
+    With --checksum, also compares content digests per primary key range.
     """
     from dbferry.core.connection import ConnectionManager
     from dbferry.core.config import ConfigLoader
+    from dbferry.core.schema import SchemaCache
+    from dbferry.core.snapshot import SchemaSnapshot
+    from dbferry.core.subset import apply_subsets
+    from dbferry.core.verify import ChecksumVerifier, RowCounter
 
     path = Path(config)
     if not path.exists():
@@ -162,45 +290,113 @@ def verify(config):
 
     p.info(f"Starting verification using {config}...")
 
+    conn_mgr = ConnectionManager()
     try:
         cfg = ConfigLoader.load(path)
-        conn_mgr = ConnectionManager()
-
-        source = conn_mgr.get_adapter(cfg.source)
-        target = conn_mgr.get_adapter(cfg.target)
-
-        source.connect()
-        target.connect()
-
-        tables = source.list_tables()
+        # One pool per database, shared by the count and checksum passes
+        source = conn_mgr.attach(conn_mgr.get_adapter(cfg.source))
+        target = conn_mgr.attach(conn_mgr.get_adapter(cfg.target))
+
+        schemas = SchemaCache(source)
+        if cfg.options.schema_snapshot:
+            SchemaSnapshot(cfg.source).restore(schemas)
+        tables = schemas.list_tables()
         if not tables:
             p.warn("No tables found in source database.")
             return
 
         p.info(f"Discovered {len(tables)} tables from source database.")
 
-        rows = []
-        for tbl in tables:
-            try:
-                src_count = source.count_rows(tbl)
-                tgt_count = target.count_rows(tbl)
-
-                if src_count == tgt_count:
-                    status = "[green]✓ Match[/green]"
-                else:
-                    status = f"[yellow]⚠ Mismatch ({abs(src_count - tgt_count)} diff)[/yellow]"
+        # Compare subset tables against the rows their filters select
+        filters = {}
+        if cfg.options.subset:
+            filters = {
+                s.name: s.row_filter
+                for s in apply_subsets(schemas, tables, cfg.options.subset)
+                if s.row_filter
+            }
+
+        counter = RowCounter(
+            connect_source=lambda: conn_mgr.acquire(cfg.source),
+            connect_target=lambda: conn_mgr.acquire(cfg.target),
+            workers=workers,
+            fast=fast,
+            tolerance=tolerance,
+            filters=filters,
+            release=conn_mgr.release,
+        )
 
-                rows.append([tbl, str(src_count), str(tgt_count), status])
-            except Exception as e:
-                rows.append([tbl, "—", "—", f"[red]Error: {e}[/red]"])
+        rows = []
+        for result in counter.count(tables):
+            tbl, src_count, tgt_count = result.table, result.source, result.target
+            if result.error:
+                rows.append([tbl, "—", "—", f"[red]Error: {result.error}[/red]"])
+                continue
+
+            if not result.exact:
+                status = "[green]≈ Match (estimate)[/green]"
+            elif src_count == tgt_count:
+                status = "[green]✓ Match[/green]"
+            else:
+                status = (
+                    f"[yellow]⚠ Mismatch ({abs(src_count - tgt_count)} diff)[/yellow]"
+                )
+
+            rows.append([tbl, str(src_count), str(tgt_count), status])
 
         p.table(
             title="Verification Summary",
             columns=["Table", "Source Rows", "Target Rows", "Status"],
             rows=rows,
         )
+        verified = all("Match" in r[-1] for r in rows)
+
+        if checksum:
+            verifier = ChecksumVerifier(source, target)
+            checksum_rows = []
+            for tbl in tables:
+                try:
+                    diff = verifier.verify_table(schemas.get(tbl))
+                except Exception as e:
+                    verified = False
+                    checksum_rows.append(
+                        [tbl, "—", "—", "—", "—", f"[red]Error: {e}[/red]"]
+                    )
+                    continue
+
+                if diff.matched:
+                    status = "[green]✓ Match[/green]"
+                else:
+                    verified = False
+                    status = "[yellow]⚠ Content differs[/yellow]"
+                    for label, keys in [
+                        ("missing on target", diff.missing),
+                        ("extra on target", diff.extra),
+                        ("changed", diff.changed),
+                    ]:
+                        if keys:
+                            sample = ", ".join(str(k) for k in keys[:5])
+                            p.warn(f"{tbl}: {len(keys)} row(s) {label}, e.g. {sample}")
+                if diff.note:
+                    status += f" ({diff.note})"
+                checksum_rows.append(
+                    [
+                        tbl,
+                        str(diff.ranges_checked),
+                        str(len(diff.missing)),
+                        str(len(diff.extra)),
+                        str(len(diff.changed)),
+                        status,
+                    ]
+                )
+
+            p.table(
+                title="Checksum Summary",
+                columns=["Table", "Ranges", "Missing", "Extra", "Changed", "Status"],
+                rows=checksum_rows,
+            )
 
-        if all("Match" in r[-1] for r in rows):
+        if verified:
             p.panel(
                 "All tables verified successfully.", title="Verification", style="green"
             )
@@ -213,6 +409,8 @@ def verify(config):
 
     except Exception as e:
         p.error(f"Verification failed: {e}")
+    finally:
+        conn_mgr.close()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,55 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict
+from typing import Any, Callable, Dict, Iterator, List
+from dbferry.core.batch import Batch
+from dbferry.core.chunking import Chunk
 from dbferry.core.config import DBConfig
-from dbferry.core.schema import TableSchema
+from dbferry.core.schema import EnumType, TableSchema
+
+
+def literal_default(default: str | None) -> str | None:
+    """
+    A column default reduced to a plain literal other engines accept
+    (booleans become 1/0); None for expressions such as nextval() or now().
+    """
+    if default is None:
+        return None
+    literal = default.split("::", 1)[0].strip()
+    if literal.lower() in ("true", "false"):
+        return "1" if literal.lower() == "true" else "0"
+    try:
+        float(literal)
+        return literal
+    except ValueError:
+        pass
+    if literal.startswith("'") and literal.endswith("'"):
+        return literal
+    return None
+
+
+def with_row_filter(
+    where: str, row_filter: str | None, paramstyle: str = "pyformat"
+) -> str:
+    """
+    AND a table's row filter (options.subset) into a WHERE clause. Drivers
+    with %s placeholders need any literal % in the filter doubled.
+    """
+    if not row_filter:
+        return where
+    if paramstyle == "pyformat":
+        row_filter = row_filter.replace("%", "%%")
+    return f"({row_filter}) AND {where}"
 
 
 class BaseAdapter(ABC):
     """Abstract base class for all DB adapters."""
 
+    # False for engines that allow a single writer at a time
+    parallel_writes = True
+
+    # True for engines that read and write single column values piece by
+    # piece (stream_value / write_value) and keep large objects
+    streams_large_values = False
+
     def __init__(self, config: DBConfig):
         self.config = config
         self.conn: Any = None
@@ -36,22 +79,219 @@ class BaseAdapter(ABC):
         """Return the schema definition for the given table."""
         pass
 
+    def get_table_schemas(self, table_names: List[str]) -> Dict[str, TableSchema]:
+        """
+        Return schemas for many tables at once, keyed by name.
+        Adapters should override this with set-based catalog queries.
+        """
+        return {name: self.get_table_schema(name) for name in table_names}
+
+    @abstractmethod
+    def create_table(
+        self,
+        schema: TableSchema,
+        constraints: bool = True,
+        enums: List[EnumType] | None = None,
+    ) -> None:
+        """
+        Create a table based on the provided schema.
+        With `constraints=False` the primary key is left for `build_indexes`.
+        `enums` are the source's enum types, for engines that declare an
+        enum's values on the column rather than as a type of its own.
+        """
+        pass
+
     @abstractmethod
-    def create_table(self, schema: TableSchema) -> None:
-        """Create a table based on the provided schema."""
+    def fetch_rows(self, table_name: str, limit: int = 1000) -> Batch:
+        """Fetch up to `limit` rows from a table."""
         pass
 
     @abstractmethod
-    def fetch_rows(self, table_name: str, limit: int = 1000) -> List[Dict[str, Any]]:
-        """Fetch rows from a table as a list of dicts."""
+    def stream_rows(
+        self,
+        schema: TableSchema,
+        batch_size: int | Callable[[], int] = 1000,
+        chunk: Chunk | None = None,
+        start_after: tuple | None = None,
+    ) -> Iterator[Batch]:
+        """
+        Yield the rows of a table (or of one chunk of it) in batches of at
+        most `batch_size` rows, in primary key order when there is one.
+        Only `schema.columns` are selected, and only rows passing
+        `schema.row_filter`.
+        A callable `batch_size` is asked again before every batch.
+        `start_after` resumes after the given primary key value.
+        """
         pass
 
     @abstractmethod
-    def insert_rows(self, table_name: str, rows: List[Dict[str, Any]]) -> None:
-        """Insert rows into a table."""
+    def insert_rows(self, table_name: str, batch: Batch) -> int | None:
+        """Insert a batch into a table; returns the bytes sent when known."""
         pass
 
     @abstractmethod
-    def count_rows(self, table_name: str) -> int:
-        """Return the number of rows in a given table."""
+    def count_rows(self, table_name: str, where: str | None = None) -> int:
+        """Return the number of rows in a given table (matching `where`)."""
         pass
+
+    def set_autocommit(self, enabled: bool) -> None:
+        """Switch the connection between autocommit and explicit transactions."""
+        self.conn.autocommit = enabled
+
+    def ping(self) -> bool:
+        """Cheap liveness check, run by the pool on connections left idle."""
+        try:
+            cur = self.conn.cursor()
+            cur.execute("SELECT 1;")
+            cur.fetchone()
+            cur.close()
+            return True
+        except Exception:
+            return False
+
+    def reset(self) -> None:
+        """End any open transaction and go back to autocommit, before reuse."""
+        self.conn.rollback()
+        self.set_autocommit(True)
+
+    def avg_row_width(self, table_name: str) -> float | None:
+        """Average row size in bytes, if the database keeps statistics."""
+        return None
+
+    def table_size_bytes(self, table_name: str) -> int:
+        """On-disk size of a table, used to decide whether to split it."""
+        return 0
+
+    def key_ranges(self, schema: TableSchema, count: int) -> List[Chunk]:
+        """
+        Split a table into about `count` disjoint chunks that can be copied in
+        parallel. Adapters that can't split tables return an empty list.
+        """
+        return []
+
+    def last_key(self, schema: TableSchema, chunk: Chunk | None = None) -> tuple | None:
+        """Highest primary key present in a table (or chunk), used to resume loads."""
+        raise NotImplementedError(
+            f"{type(self).__name__} can't resume partially loaded tables"
+        )
+
+    def truncate_table(self, table_name: str) -> None:
+        """Remove every row of a table, e.g. to copy it again from the start."""
+        raise NotImplementedError(f"{type(self).__name__} can't truncate tables")
+
+    def drop_table(self, table_name: str) -> None:
+        """Drop a table if it exists."""
+        raise NotImplementedError(f"{type(self).__name__} can't drop tables")
+
+    def list_enum_types(self) -> List[EnumType]:
+        """Return user-defined enum types. Engines without enums return []."""
+        return []
+
+    def create_enum(self, enum: EnumType) -> None:
+        """Create an enum type. Engines without enums store the values as text."""
+        pass
+
+    def catalog_fingerprint(self) -> str | None:
+        """
+        Cheap digest that changes whenever the schema changes, used to reuse
+        an on-disk schema snapshot. None disables snapshotting.
+        """
+        return None
+
+    def set_maintenance_memory(self, value: str) -> None:
+        """Raise the session's memory budget for index builds (e.g. "1GB")."""
+        pass
+
+    def build_indexes(self, schema: TableSchema) -> None:
+        """Create primary key, unique keys and secondary indexes after the load."""
+        pass
+
+    def add_foreign_keys(self, schema: TableSchema) -> List[str]:
+        """Add foreign keys without checking existing rows; returns their names."""
+        return []
+
+    def validate_foreign_keys(self, schema: TableSchema) -> None:
+        """Check existing rows against foreign keys added by `add_foreign_keys`."""
+        pass
+
+    def range_digest(
+        self,
+        schema: TableSchema,
+        lower: tuple | None = None,
+        upper: tuple | None = None,
+    ) -> tuple[int, str]:
+        """Row count and content digest of the rows with `lower <= pk < upper`."""
+        raise NotImplementedError(f"{type(self).__name__} can't compute checksums")
+
+    def split_key(
+        self,
+        schema: TableSchema,
+        lower: tuple | None,
+        upper: tuple | None,
+        offset: int,
+    ) -> tuple | None:
+        """Primary key found `offset` rows into a key range."""
+        raise NotImplementedError(f"{type(self).__name__} can't compute checksums")
+
+    def row_digests(
+        self, schema: TableSchema, lower: tuple | None, upper: tuple | None
+    ) -> Dict[tuple, str]:
+        """Per-row digests keyed by primary key for a key range."""
+        raise NotImplementedError(f"{type(self).__name__} can't compute checksums")
+
+    def estimate_rows(self, table_names: List[str]) -> Dict[str, int | None]:
+        """Cheap row estimates from statistics; missing entries mean unknown."""
+        return {}
+
+    def max_value(self, table_name: str, column: str) -> Any:
+        """Largest value of a column, used as a sync watermark."""
+        raise NotImplementedError(f"{type(self).__name__} can't track watermarks")
+
+    def wide_columns(self, schema: TableSchema) -> List[str]:
+        """Columns that may hold values too large to fetch whole."""
+        return []
+
+    def stream_value(
+        self,
+        schema: TableSchema,
+        column: str,
+        key: tuple,
+        piece_bytes: int,
+        snapshot_id: str | None = None,
+    ) -> Iterator[tuple[int, bytes]]:
+        """
+        Read one value, of the row with primary key `key`, as (offset, bytes)
+        pieces; in the snapshot `snapshot_id` named, if given.
+        """
+        raise NotImplementedError(f"{type(self).__name__} can't stream column values")
+
+    def write_value(
+        self,
+        schema: TableSchema,
+        column: str,
+        key: tuple,
+        pieces: Iterator[tuple[int, bytes]],
+    ) -> int:
+        """Set one value from its pieces, in the open transaction; returns bytes written."""
+        raise NotImplementedError(f"{type(self).__name__} can't stream column values")
+
+    def large_objects(self, schemas: List[TableSchema] | None = None) -> List[int]:
+        """
+        OIDs of the database's large objects, or only of those referenced by
+        the oid columns of `schemas`' rows. Engines without them return [].
+        """
+        return []
+
+    def read_large_object(self, oid: int, piece_bytes: int) -> Iterator[bytes]:
+        """Read a large object in pieces."""
+        raise NotImplementedError(f"{type(self).__name__} has no large objects")
+
+    def write_large_object(self, oid: int, pieces: Iterator[bytes]) -> int:
+        """Create a large object with the given OID and commit it; returns its size."""
+        raise NotImplementedError(f"{type(self).__name__} has no large objects")
+
+    def upsert_rows(
+        self, table_name: str, batch: Batch, key_columns: List[str]
+    ) -> None:
+        """Insert rows, updating existing ones that share the same key."""
+        raise NotImplementedError(f"{type(self).__name__} can't upsert rows")
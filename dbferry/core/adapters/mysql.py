@@ -0,0 +1,786 @@
+from typing import Any, Callable, Dict, Iterator, List
+import datetime
+import decimal
+import json
+import ssl
+import uuid
+import pymysql
+import pymysql.cursors
+from pymysql import err
+from pymysql.connections import Connection, MySQLResult
+from pymysql.constants import CR
+from dbferry.core.adapters.base import BaseAdapter, literal_default, with_row_filter
+from dbferry.core.batch import Batch, Converter, Converters, typed
+from dbferry.core.chunking import Chunk
+from dbferry.core.schema import (
+    ColumnSchema,
+    EnumType,
+    ForeignKeySchema,
+    IndexSchema,
+    TableSchema,
+    UniqueKeySchema,
+)
+
+
+# Postgres type → MySQL column type. Unknown types are stored as LONGTEXT.
+_MYSQL_TYPES = {
+    "smallint": "SMALLINT",
+    "integer": "INT",
+    "bigint": "BIGINT",
+    "boolean": "BOOLEAN",
+    "real": "FLOAT",
+    "double precision": "DOUBLE",
+    # Unconstrained numeric has no MySQL equivalent; this is DECIMAL's maximum
+    "numeric": "DECIMAL(65, 30)",
+    "bytea": "LONGBLOB",
+    "json": "JSON",
+    "jsonb": "JSON",
+    "ARRAY": "JSON",
+    "uuid": "CHAR(36)",
+    "date": "DATE",
+    "timestamp without time zone": "DATETIME(6)",
+    "timestamp with time zone": "DATETIME(6)",  # stored in UTC
+    "time without time zone": "TIME(6)",
+}
+
+# Key and index columns can't be LONGTEXT/LONGBLOB; 255 utf8mb4 characters
+# keep composite indexes under InnoDB's 3072-byte limit.
+_KEY_TYPES = {"LONGTEXT": "VARCHAR(255)", "LONGBLOB": "VARBINARY(255)"}
+
+# MySQL data type → type reported to other engines
+_REPORTED_TYPES = {
+    "tinyint": "smallint",
+    "smallint": "smallint",
+    "mediumint": "integer",
+    "int": "integer",
+    "bigint": "bigint",
+    "decimal": "numeric",
+    "float": "real",
+    "double": "double precision",
+    "date": "date",
+    "datetime": "timestamp without time zone",
+    "timestamp": "timestamp without time zone",
+    "time": "time without time zone",
+    "year": "integer",
+    "json": "jsonb",
+    "binary": "bytea",
+    "varbinary": "bytea",
+    "tinyblob": "bytea",
+    "blob": "bytea",
+    "mediumblob": "bytea",
+    "longblob": "bytea",
+}
+
+_BINARY_TYPES = ("binary", "varbinary", "tinyblob", "blob", "mediumblob", "longblob")
+
+# Characters that must be backslash-escaped in LOAD DATA fields
+_LOAD_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"}
+)
+
+# Errors raised when the server refuses LOAD DATA LOCAL
+_LOCAL_INFILE_DISABLED = (1148, 3948)
+
+# Bytes per packet when streaming LOAD DATA LOCAL contents
+_PACKET_BYTES = 1024 * 1024
+
+
+def _ident(name: str) -> str:
+    """Trim a generated identifier to MySQL's 64-character limit."""
+    return name[:64]
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def mysql_type(
+    pg_type: str, keyed: bool = False, enums: Dict[str, List[str]] | None = None
+) -> str:
+    if enums and pg_type in enums:
+        return f"ENUM({', '.join(_quote(v) for v in enums[pg_type])})"
+    mapped = _MYSQL_TYPES.get(pg_type, _MYSQL_TYPES.get(pg_type.lower(), "LONGTEXT"))
+    return _KEY_TYPES.get(mapped, mapped) if keyed else mapped
+
+
+def mysql_value(value: Any) -> Any:
+    """Coerce a value from another engine into something MySQL stores as is."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        # Sessions run in UTC
+        return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    if isinstance(value, datetime.timedelta):
+        return (
+            f"{value.days} days {value.seconds} seconds "
+            f"{value.microseconds} microseconds"
+        )
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def load_data_field(value: Any, binary: bool = False) -> bytes:
+    """
+    Render one value as a LOAD DATA field. Binary columns are sent as hex
+    and decoded with UNHEX() on the server, so no byte is mistaken for text.
+    """
+    if value is None:
+        return b"\\N"
+    value = mysql_value(value)
+    if isinstance(value, bytes):
+        if binary:
+            return value.hex().encode()
+        value = value.decode()
+    return str(value).translate(_LOAD_ESCAPES).encode()
+
+
+def _load_binary(value: Any) -> bytes:
+    return load_data_field(value, binary=True)
+
+
+# Source type → LOAD DATA field converter for the values drivers usually
+# return; anything else goes through load_data_field.
+_NUMBER_FIELD = ((int, float, decimal.Decimal), lambda v: str(v).encode())
+_LOAD_CONVERTERS = {
+    **dict.fromkeys(("smallint", "integer", "bigint"), _NUMBER_FIELD),
+    **dict.fromkeys(("real", "double precision", "numeric"), _NUMBER_FIELD),
+    "boolean": ((bool, int), lambda v: b"1" if v else b"0"),
+}
+
+# Source types whose driver values pymysql escapes correctly as they are
+_NATIVE_TYPES = {
+    "smallint",
+    "integer",
+    "bigint",
+    "boolean",
+    "real",
+    "double precision",
+    "numeric",
+    "text",
+    "character varying",
+    "character",
+    "date",
+}
+
+
+def load_converter(column_type: str) -> Converter:
+    """LOAD DATA field converter for one source column, chosen once per table."""
+    types, fast = _LOAD_CONVERTERS.get(
+        column_type.lower(),
+        ((str,), lambda v: v.translate(_LOAD_ESCAPES).encode()),
+    )
+    return typed(types, fast, load_data_field)
+
+
+def value_converter(column_type: str) -> Converter | None:
+    """None for columns pymysql takes as is, else mysql_value."""
+    return None if column_type.lower() in _NATIVE_TYPES else mysql_value
+
+
+# _MemoryResult and _StreamingConnection override pymysql internals; the
+# pymysql range pinned in pyproject.toml is the one they were checked against.
+
+
+class _MemoryResult(MySQLResult):
+    """Answers LOAD DATA LOCAL requests with the connection's pending buffer."""
+
+    def _read_load_local_packet(self, first_packet):
+        conn = self.connection
+        data, conn.load_buffer = conn.load_buffer, None
+        if data is None:
+            # Never read a file the server names; only what we queued
+            raise err.OperationalError(
+                CR.CR_UNKNOWN_ERROR, "Unexpected LOAD DATA LOCAL request"
+            )
+        view = memoryview(data)
+        try:
+            for start in range(0, len(view), _PACKET_BYTES):
+                conn.write_packet(view[start : start + _PACKET_BYTES])
+        finally:
+            # An empty packet ends the upload
+            conn.write_packet(b"")
+            ok_packet = conn._read_packet()
+
+        if not ok_packet.is_ok_packet():
+            raise err.OperationalError(
+                CR.CR_COMMANDS_OUT_OF_SYNC, "Commands Out of Sync"
+            )
+        self._read_ok_packet(ok_packet)
+
+
+class _StreamingConnection(Connection):
+    """
+    pymysql connection whose LOAD DATA LOCAL INFILE reads from memory:
+    set `load_buffer` before running the statement.
+    """
+
+    load_buffer: bytes | None = None
+    warning_count: int = 0
+
+    def _read_query_result(self, unbuffered=False):
+        self._result = None
+        result = _MemoryResult(self)
+        if unbuffered:
+            result.init_unbuffered_query()
+        else:
+            result.read()
+        self._result = result
+        if result.server_status is not None:
+            self.server_status = result.server_status
+        self.warning_count = result.warning_count
+        return result.affected_rows
+
+
+def _ssl_args(sslmode: str | None) -> Dict[str, Any]:
+    """pymysql TLS arguments for a libpq-style sslmode."""
+    if sslmode == "disable":
+        return {"ssl_disabled": True}
+    if sslmode == "require":
+        # Encrypt without verifying the certificate, as libpq does
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return {"ssl": context}
+    if sslmode == "verify-ca":
+        return {"ssl_verify_cert": True}
+    if sslmode == "verify-full":
+        return {"ssl_verify_cert": True, "ssl_verify_identity": True}
+    return {}
+
+
+class MySQLAdapter(BaseAdapter):
+    """
+    MySQL / MariaDB. Bulk writes stream each batch to LOAD DATA LOCAL INFILE
+    from memory; nothing touches the disk and the server can't ask for
+    files. Tables are created with their primary key only (InnoDB clusters
+    rows on it) and get unique and secondary indexes after the load.
+
+    The server must allow local loads (`local_infile=1`); otherwise batches
+    fall back to multi-row INSERTs.
+    """
+
+    def __init__(self, config):
+        super().__init__(config)
+        self._load_data = True
+        # Enum types by name: MySQL declares their values on each column
+        self._enum_types: Dict[str, List[str]] = {}
+        self._binary_columns: Dict[str, set[str]] = {}
+        self._load_converters = Converters(load_converter)
+        self._value_converters = Converters(value_converter)
+
+    def connect(self):
+        try:
+            self.conn = _StreamingConnection(
+                host=self.config.host,
+                port=self.config.port or 3306,
+                user=self.config.user,
+                password=self.config.password,
+                database=self.config.database,
+                charset="utf8mb4",
+                autocommit=True,
+                local_infile=True,
+                **_ssl_args(self.config.sslmode),
+            )
+        except pymysql.err.OperationalError as e:
+            raise ConnectionError(f"MySQL connection failed: {e}")
+        with self.conn.cursor() as cur:
+            # Double-quoted identifiers, as in every other adapter
+            cur.execute(
+                "SET SESSION sql_mode = CONCAT_WS(',', NULLIF(@@sql_mode, ''), "
+                "'ANSI_QUOTES'), time_zone = '+00:00';"
+            )
+        return self.conn
+
+    def test_connection(self) -> bool:
+        conn = self.connect()
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1;")
+        self.close()
+        return True
+
+    def close(self):
+        if getattr(self, "conn", None) and self.conn.open:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+
+    def set_autocommit(self, enabled: bool):
+        # pymysql exposes autocommit as a method, not an attribute
+        self.conn.autocommit(enabled)
+
+    # Schema ----------------------------------------------------------------
+
+    def list_tables(self) -> List[str]:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT table_name FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_type = 'BASE TABLE' "
+                "ORDER BY table_name;"
+            )
+            return [r[0] for r in cur.fetchall()]
+
+    def get_table_schema(self, table_name: str) -> TableSchema:
+        return self.get_table_schemas([table_name])[table_name]
+
+    def get_table_schemas(self, table_names: List[str]) -> Dict[str, TableSchema]:
+        names = list(table_names)
+        if not names:
+            return {}
+        columns = {name: [] for name in names}
+        primary_keys = {name: [] for name in names}
+        unique_keys = {name: {} for name in names}
+        indexes = {name: {} for name in names}
+        foreign_keys = {name: [] for name in names}
+        fk_names = {name: set() for name in names}
+        placeholders = ", ".join(["%s"] * len(names))
+
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT table_name, column_name, data_type, column_type,
+                       is_nullable, column_default
+                FROM information_schema.columns
+                WHERE table_schema = DATABASE() AND table_name IN ({placeholders})
+                ORDER BY table_name, ordinal_position;
+                """,
+                names,
+            )
+            for tbl, name, data_type, column_type, nullable, default in cur:
+                if column_type == "tinyint(1)":
+                    reported = "boolean"
+                elif data_type == "bigint" and "unsigned" in column_type:
+                    reported = "numeric"
+                else:
+                    reported = _REPORTED_TYPES.get(data_type, "text")
+                columns[tbl].append(
+                    ColumnSchema(
+                        name=name,
+                        type=reported,
+                        nullable=nullable == "YES",
+                        # MySQL reports string defaults unquoted; keep numbers only
+                        default=literal_default(default) if default else None,
+                    )
+                )
+
+            cur.execute(
+                f"""
+                SELECT table_name, index_name, non_unique, column_name
+                FROM information_schema.statistics
+                WHERE table_schema = DATABASE() AND table_name IN ({placeholders})
+                ORDER BY table_name, index_name, seq_in_index;
+                """,
+                names,
+            )
+            for tbl, index, non_unique, column in cur:
+                if index == "PRIMARY":
+                    primary_keys[tbl].append(column)
+                elif not non_unique:
+                    unique_keys[tbl].setdefault(index, []).append(column)
+                elif column is not None:
+                    indexes[tbl].setdefault(index, []).append(column)
+
+            cur.execute(
+                f"""
+                SELECT table_name, constraint_name, column_name,
+                       referenced_table_name, referenced_column_name
+                FROM information_schema.key_column_usage
+                WHERE table_schema = DATABASE() AND table_name IN ({placeholders})
+                AND referenced_table_name IS NOT NULL
+                ORDER BY table_name, constraint_name, ordinal_position;
+                """,
+                names,
+            )
+            fks: Dict[tuple, ForeignKeySchema] = {}
+            for tbl, constraint, column, ref_table, ref_column in cur:
+                fk_names[tbl].add(constraint)
+                fk = fks.get((tbl, constraint))
+                if fk is None:
+                    fk = fks[tbl, constraint] = ForeignKeySchema(
+                        columns=[], ref_table=ref_table, ref_columns=[], name=constraint
+                    )
+                    foreign_keys[tbl].append(fk)
+                fk.columns.append(column)
+                fk.ref_columns.append(ref_column)
+
+        schemas = {}
+        for name in names:
+            schemas[name] = TableSchema(
+                name=name,
+                columns=columns[name],
+                primary_key=primary_keys[name] or None,
+                unique_keys=[
+                    UniqueKeySchema(columns=cols) for cols in unique_keys[name].values()
+                ],
+                foreign_keys=foreign_keys[name],
+                indexes=[
+                    _index_schema(name, index, cols)
+                    for index, cols in indexes[name].items()
+                    # InnoDB creates these to back its foreign keys
+                    if index not in fk_names[name]
+                ],
+            )
+        return schemas
+
+    def create_enum(self, enum: EnumType):
+        self._enum_types[enum.name] = list(enum.values)
+
+    def create_table(
+        self,
+        schema: TableSchema,
+        constraints: bool = True,
+        enums: List[EnumType] | None = None,
+    ):
+        """
+        The primary key is always part of the table: InnoDB stores rows in
+        key order, and adding it later would rebuild the whole table.
+        Unique keys and secondary indexes wait for `build_indexes` unless
+        `constraints` is set. Columns of one of the `enums` become ENUM columns.
+        """
+        for enum in enums or []:
+            self.create_enum(enum)
+        keyed = _key_columns(schema)
+        cols_sql = []
+        for col in schema.columns:
+            col_type = mysql_type(
+                col.type, keyed=col.name in keyed, enums=self._enum_types
+            )
+            col_sql = f'"{col.name}" {col_type}'
+            if not col.nullable:
+                col_sql += " NOT NULL"
+            default = literal_default(col.default)
+            if default is not None and not col_type.startswith(("LONG", "JSON")):
+                col_sql += f" DEFAULT {default}"
+            cols_sql.append(col_sql)
+        if schema.primary_key:
+            pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
+            cols_sql.append(f"PRIMARY KEY ({pk_cols})")
+
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{schema.name}" '
+                    f'({", ".join(cols_sql)}) '
+                    f"ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;"
+                )
+        except pymysql.MySQLError as e:
+            raise Exception(f"Failed to create table {schema.name}: {e}")
+        if constraints:
+            self.build_indexes(schema)
+
+    def build_indexes(self, schema: TableSchema):
+        """Add unique keys and secondary indexes in one ALTER, i.e. one table pass."""
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT DISTINCT index_name FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = %s;",
+                (schema.name,),
+            )
+            existing = {r[0] for r in cur.fetchall()}
+
+            clauses = []
+            for uk in schema.unique_keys or []:
+                name = _ident(f"{schema.name}_{'_'.join(uk.columns)}_key")
+                if name not in existing:
+                    cols = ", ".join(f'"{c}"' for c in uk.columns)
+                    clauses.append(f'ADD UNIQUE INDEX "{name}" ({cols})')
+            for index in schema.indexes or []:
+                # Only plain column lists translate across engines
+                columns = index.plain_columns()
+                name = _ident(index.name)
+                if columns and name not in existing:
+                    cols = ", ".join(f'"{c}"' for c in columns)
+                    clauses.append(f'ADD INDEX "{name}" ({cols})')
+            if clauses:
+                cur.execute(f'ALTER TABLE "{schema.name}" {", ".join(clauses)};')
+
+    def add_foreign_keys(self, schema: TableSchema) -> List[str]:
+        """
+        Add foreign keys with foreign_key_checks off, which skips checking
+        existing rows (MySQL's closest match to NOT VALID).
+        """
+        added = []
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT constraint_name FROM information_schema.table_constraints "
+                "WHERE table_schema = DATABASE() AND table_name = %s "
+                "AND constraint_type = 'FOREIGN KEY';",
+                (schema.name,),
+            )
+            existing = {r[0] for r in cur.fetchall()}
+            cur.execute("SET SESSION foreign_key_checks = 0;")
+            try:
+                for fk in schema.foreign_keys or []:
+                    name = _ident(fk.constraint_name(schema.name))
+                    if name in existing:
+                        continue
+                    cols = ", ".join(f'"{c}"' for c in fk.columns)
+                    ref_cols = ", ".join(f'"{c}"' for c in fk.ref_columns)
+                    cur.execute(
+                        f'ALTER TABLE "{schema.name}" ADD CONSTRAINT "{name}" '
+                        f"FOREIGN KEY ({cols}) "
+                        f'REFERENCES "{fk.ref_table}" ({ref_cols});'
+                    )
+                    added.append(name)
+            finally:
+                cur.execute("SET SESSION foreign_key_checks = 1;")
+        return added
+
+    def validate_foreign_keys(self, schema: TableSchema):
+        """Look for rows whose foreign key has no parent; MySQL has no VALIDATE."""
+        with self.conn.cursor() as cur:
+            for fk in schema.foreign_keys or []:
+                pairs = list(zip(fk.columns, fk.ref_columns))
+                # Like MATCH SIMPLE: a key with any NULL column isn't checked
+                join = " AND ".join(f'p."{rc}" = c."{c}"' for c, rc in pairs)
+                present = " AND ".join(f'c."{c}" IS NOT NULL' for c in fk.columns)
+                cur.execute(
+                    f'SELECT COUNT(*) FROM "{schema.name}" c '
+                    f'LEFT JOIN "{fk.ref_table}" p ON {join} '
+                    f'WHERE {present} AND p."{fk.ref_columns[0]}" IS NULL;'
+                )
+                orphans = cur.fetchone()[0]
+                if orphans:
+                    raise RuntimeError(
+                        f"{orphans} row(s) in {schema.name}"
+                        f"({', '.join(fk.columns)}) have no match in "
+                        f"{fk.ref_table}({', '.join(fk.ref_columns)})"
+                    )
+
+    def avg_row_width(self, table_name: str) -> float | None:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT avg_row_length FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s;",
+                (table_name,),
+            )
+            row = cur.fetchone()
+        return float(row[0]) if row and row[0] else None
+
+    # Rows ------------------------------------------------------------------
+
+    def fetch_rows(self, table_name: str, limit: int = 1000) -> Batch:
+        with self.conn.cursor() as cur:
+            cur.execute(f'SELECT * FROM "{table_name}" LIMIT %s;', (limit,))
+            return Batch([d[0] for d in cur.description], list(cur.fetchall()))
+
+    def stream_rows(
+        self,
+        schema: TableSchema,
+        batch_size: int | Callable[[], int] = 1000,
+        chunk: Chunk | None = None,
+        start_after: tuple | None = None,
+    ) -> Iterator[Batch]:
+        """
+        Keyset pagination on the primary key when there is one, otherwise an
+        unbuffered cursor, so only one batch is held in memory.
+        """
+        where, params = self._predicate(chunk)
+        where = with_row_filter(where, schema.row_filter)
+        columns = ", ".join(f'"{c.name}"' for c in schema.columns)
+        names = [c.name for c in schema.columns]
+
+        if not schema.primary_key:
+            if start_after is not None:
+                raise ValueError(f"Table {schema.name} has no primary key to resume on")
+            with self.conn.cursor(pymysql.cursors.SSCursor) as cur:
+                cur.execute(
+                    f'SELECT {columns} FROM "{schema.name}" WHERE {where};', params
+                )
+                while True:
+                    limit = batch_size() if callable(batch_size) else batch_size
+                    fetched = cur.fetchmany(limit)
+                    if not fetched:
+                        return
+                    yield Batch(names, list(fetched), schema)
+
+        pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
+        placeholders = ", ".join(["%s"] * len(schema.primary_key))
+        last_key = start_after
+        while True:
+            limit = batch_size() if callable(batch_size) else batch_size
+            sql = f'SELECT {columns} FROM "{schema.name}" WHERE {where}'
+            args = list(params)
+            if last_key is not None:
+                sql += f" AND ({pk_cols}) > ({placeholders})"
+                args += list(last_key)
+            sql += f" ORDER BY {pk_cols} LIMIT %s;"
+            with self.conn.cursor() as cur:
+                cur.execute(sql, (*args, limit))
+                fetched = cur.fetchall()
+            if not fetched:
+                return
+            batch = Batch(names, list(fetched), schema)
+            yield batch
+            if len(fetched) < limit:
+                return
+            last_key = batch.last_key(schema.primary_key)
+
+    def insert_rows(self, table_name: str, batch: Batch):
+        """
+        Stream the batch to LOAD DATA LOCAL INFILE from an in-memory buffer.
+        Returns the bytes sent, or None when the server only accepts INSERTs.
+        """
+        if not batch:
+            return 0
+        columns = batch.columns
+        if not self._load_data:
+            self._insert_values(table_name, batch)
+            return None
+
+        binary = self._binary(table_name)
+        flags = [col in binary for col in columns]
+        converters = [
+            _load_binary if is_binary else convert
+            for convert, is_binary in zip(
+                self._load_converters(table_name, batch), flags
+            )
+        ]
+        payload = b"".join(
+            b"\t".join([c(v) for c, v in zip(converters, row)]) + b"\n"
+            for row in batch.rows
+        )
+        targets = ", ".join(
+            f"@v{i}" if is_binary else f'"{col}"'
+            for i, (col, is_binary) in enumerate(zip(columns, flags))
+        )
+        sets = ", ".join(
+            f'"{col}" = UNHEX(@v{i})'
+            for i, (col, is_binary) in enumerate(zip(columns, flags))
+            if is_binary
+        )
+        sql = (
+            f"LOAD DATA LOCAL INFILE 'dbferry-batch' INTO TABLE \"{table_name}\" "
+            "CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+            f"LINES TERMINATED BY '\\n' ({targets})" + (f" SET {sets}" if sets else "")
+        )
+
+        self.conn.load_buffer = payload
+        try:
+            with self.conn.cursor() as cur:
+                loaded = cur.execute(sql)
+                if self.conn.warning_count or loaded != len(batch):
+                    # LOCAL loads turn errors and duplicates into warnings
+                    cur.execute("SHOW WARNINGS LIMIT 3;")
+                    details = "; ".join(r[2] for r in cur.fetchall())
+                    raise RuntimeError(
+                        f"LOAD DATA into {table_name} loaded {loaded} of "
+                        f"{len(batch)} rows: {details or 'no details'}"
+                    )
+        except pymysql.err.OperationalError as e:
+            if e.args[0] not in _LOCAL_INFILE_DISABLED:
+                raise
+            self._load_data = False
+            self._insert_values(table_name, batch)
+            return None
+        finally:
+            self.conn.load_buffer = None
+        return len(payload)
+
+    def _insert_values(self, table_name: str, batch: Batch):
+        cols = ", ".join(f'"{col}"' for col in batch.columns)
+        placeholders = ", ".join(["%s"] * len(batch.columns))
+        with self.conn.cursor() as cur:
+            # pymysql rewrites this into multi-row INSERT statements
+            cur.executemany(
+                f'INSERT INTO "{table_name}" ({cols}) VALUES ({placeholders})',
+                batch.converted(self._value_converters(table_name, batch)),
+            )
+
+    def upsert_rows(self, table_name: str, batch: Batch, key_columns):
+        if not batch:
+            return
+        columns = batch.columns
+        cols = ", ".join(f'"{col}"' for col in columns)
+        placeholders = ", ".join(["%s"] * len(columns))
+        updates = [col for col in columns if col not in key_columns] or key_columns[:1]
+        assignments = ", ".join(f'"{col}" = VALUES("{col}")' for col in updates)
+        with self.conn.cursor() as cur:
+            cur.executemany(
+                f'INSERT INTO "{table_name}" ({cols}) VALUES ({placeholders}) '
+                f"ON DUPLICATE KEY UPDATE {assignments}",
+                batch.converted(self._value_converters(table_name, batch)),
+            )
+
+    def count_rows(self, table_name: str, where: str | None = None) -> int:
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(
+                    f'SELECT COUNT(*) FROM "{table_name}" '
+                    f'WHERE {with_row_filter("TRUE", where)};',
+                    (),
+                )
+                return cur.fetchone()[0]
+        except pymysql.MySQLError as e:
+            raise RuntimeError(f"Failed to count rows in {table_name}: {e}")
+
+    def last_key(self, schema: TableSchema, chunk: Chunk | None = None) -> tuple | None:
+        where, params = self._predicate(chunk)
+        pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
+        pk_desc = ", ".join(f'"{col}" DESC' for col in schema.primary_key)
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f'SELECT {pk_cols} FROM "{schema.name}" WHERE {where} '
+                f"ORDER BY {pk_desc} LIMIT 1;",
+                params,
+            )
+            row = cur.fetchone()
+        return tuple(row) if row else None
+
+    def truncate_table(self, table_name: str) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute(f'TRUNCATE TABLE "{table_name}";')
+
+    def drop_table(self, table_name: str) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute(f'DROP TABLE IF EXISTS "{table_name}";')
+
+    def max_value(self, table_name: str, column: str) -> Any:
+        with self.conn.cursor() as cur:
+            cur.execute(f'SELECT MAX("{column}") FROM "{table_name}";')
+            return cur.fetchone()[0]
+
+    def _binary(self, table_name: str) -> set[str]:
+        """Binary columns of a target table, looked up once per adapter."""
+        if table_name not in self._binary_columns:
+            with self.conn.cursor() as cur:
+                cur.execute(
+                    "SELECT column_name FROM information_schema.columns "
+                    "WHERE table_schema = DATABASE() AND table_name = %s "
+                    f"AND data_type IN ({', '.join(['%s'] * len(_BINARY_TYPES))});",
+                    (table_name, *_BINARY_TYPES),
+                )
+                self._binary_columns[table_name] = {r[0] for r in cur.fetchall()}
+        return self._binary_columns[table_name]
+
+    @staticmethod
+    def _predicate(chunk: Chunk | None) -> tuple[str, tuple]:
+        # Postgres casts don't apply here
+        if chunk is None:
+            return "TRUE", ()
+        return Chunk(chunk.column, chunk.lower, chunk.upper).predicate()
+
+
+def _index_schema(table: str, name: str, columns: List[str]) -> IndexSchema:
+    cols = ", ".join(f'"{c}"' for c in columns)
+    return IndexSchema(
+        name=name, definition=f'CREATE INDEX "{name}" ON "{table}" ({cols})'
+    )
+
+
+def _key_columns(schema: TableSchema) -> set[str]:
+    """Columns that end up in a key or index and so need a bounded type."""
+    keyed = set(schema.primary_key or [])
+    for uk in schema.unique_keys or []:
+        keyed.update(uk.columns)
+    for index in schema.indexes or []:
+        keyed.update(index.plain_columns() or [])
+    for fk in schema.foreign_keys or []:
+        keyed.update(fk.columns)
+    return keyed
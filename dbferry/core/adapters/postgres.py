@@ -1,19 +1,137 @@
-from typing import Any, Dict, List
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+import datetime
+import decimal
+import io
+import uuid
 import psycopg2
+import psycopg2.extras
 from psycopg2 import OperationalError
-from dbferry.core.adapters.base import BaseAdapter
+from dbferry.core.adapters.base import BaseAdapter, with_row_filter
+from dbferry.core.batch import Batch, Converter, Converters, typed
+from dbferry.core.chunking import Chunk
 from dbferry.core.schema import (
     ColumnSchema,
     EnumType,
     ForeignKeySchema,
+    IndexSchema,
     TableSchema,
     UniqueKeySchema,
 )
 
 
+# Characters that must be backslash-escaped in COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+_COPY_PLAIN_TYPES = (
+    str,
+    int,
+    float,
+    decimal.Decimal,
+    uuid.UUID,
+    datetime.date,
+    datetime.time,
+)
+
+
+# Types whose values can be streamed piece by piece: the expression sizing a
+# value, and the placeholder a row holds until the value is filled in.
+# octet_length reads the size from the TOAST pointer; json and jsonb only
+# know their stored (maybe compressed) size that cheaply, so values stored
+# in enough bytes to expand past the limit are measured as text.
+_JSON_SIZE = "CASE WHEN pg_column_size({0}) > {1} THEN octet_length({0}::text) END"
+_WIDE_TYPES = {
+    "bytea": ("octet_length({0})", "''::bytea"),
+    "text": ("octet_length({0})", "''::text"),
+    "json": (_JSON_SIZE, "'null'::json"),
+    "jsonb": (_JSON_SIZE, "'null'::jsonb"),
+    "xml": ("octet_length({0}::text)", "''::xml"),
+}
+
+# TOAST compression (pglz, lz4) stays well under this ratio
+_MAX_COMPRESSION = 256
+
+
+def _ident(name: str) -> str:
+    """Trim a generated identifier to Postgres' 63-byte limit."""
+    return name.encode()[:63].decode(errors="ignore")
+
+
+class CopyUnsupported(Exception):
+    """Raised when a value has no safe COPY text representation."""
+
+
+def copy_text(value: Any) -> str:
+    """Render a single Python value as a COPY text-format field."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        # bytea hex format; the leading backslash itself needs escaping
+        return "\\\\x" + bytes(value).hex()
+    if isinstance(value, datetime.timedelta):
+        return (
+            f"{value.days} days {value.seconds} seconds "
+            f"{value.microseconds} microseconds"
+        )
+    if isinstance(value, _COPY_PLAIN_TYPES):
+        return str(value).translate(_COPY_ESCAPES)
+    raise CopyUnsupported(f"cannot COPY value of type {type(value).__name__}")
+
+
+def _copy_bool(value: Any) -> str:
+    return "t" if value else "f"
+
+
+def _copy_bytea(value: Any) -> str:
+    return "\\\\x" + bytes(value).hex()
+
+
+def _copy_escaped(value: str) -> str:
+    return value.translate(_COPY_ESCAPES)
+
+
+# Source type → COPY field converter for the values drivers usually return;
+# anything else goes through copy_text.
+_COPY_CONVERTERS = {
+    **dict.fromkeys(("smallint", "integer", "bigint"), ((int,), str)),
+    **dict.fromkeys(
+        ("real", "double precision", "numeric"), ((float, decimal.Decimal, int), str)
+    ),
+    "boolean": ((bool, int), _copy_bool),
+    "bytea": ((bytes, memoryview), _copy_bytea),
+}
+
+
+def copy_converter(column_type: str) -> Converter:
+    """COPY text converter for one source column, chosen once per table."""
+    types, fast = _COPY_CONVERTERS.get(column_type.lower(), ((str,), _copy_escaped))
+    return typed(types, fast, copy_text)
+
+
+def encode_copy_rows(batch: Batch, converters: List[Converter]) -> str:
+    """Encode a batch as a COPY text-format payload."""
+    return "".join(
+        "\t".join([c(v) for c, v in zip(converters, row)]) + "\n" for row in batch.rows
+    )
+
+
+def _wide_size(schema: TableSchema, column: str, limit: int) -> str:
+    """SQL expression for the size of one wide column's value, exact above `limit`."""
+    col_type = next(c.type.lower() for c in schema.columns if c.name == column)
+    return _WIDE_TYPES[col_type][0].format(f'"{column}"', limit // _MAX_COMPRESSION)
+
+
 class PostgresAdapter(BaseAdapter):
     """Adapter for Postgres Database"""
 
+    streams_large_values = True
+
+    def __init__(self, config):
+        super().__init__(config)
+        self._copy_converters = Converters(copy_converter)
+
     def connect(self):
         try:
             self.conn = psycopg2.connect(
@@ -23,8 +141,14 @@ class PostgresAdapter(BaseAdapter):
                 user=self.config.user,
                 password=self.config.password,
                 sslmode=self.config.sslmode or "prefer",
+                # COPY payloads are encoded with the client encoding, which
+                # is SQL_ASCII on SQL_ASCII databases unless set here
+                client_encoding="utf8",
             )
             self.conn.autocommit = True
+            # Keep json/jsonb as their text form so they pass through unchanged
+            psycopg2.extras.register_default_json(self.conn, loads=lambda v: v)
+            psycopg2.extras.register_default_jsonb(self.conn, loads=lambda v: v)
             return self.conn
         except OperationalError as e:
             raise ConnectionError(f"Postgres connection failed: {e}")
@@ -46,91 +170,155 @@ class PostgresAdapter(BaseAdapter):
                 pass
 
     def get_table_schema(self, table_name: str) -> TableSchema:
+        return self.get_table_schemas([table_name])[table_name]
+
+    def get_table_schemas(self, table_names: List[str]) -> Dict[str, TableSchema]:
+        """
+        Introspect many tables at once: one set-based query each for columns,
+        primary keys, unique keys and foreign keys, however many tables.
+        """
+        names = list(table_names)
+        columns = {name: [] for name in names}
+        primary_keys = {name: [] for name in names}
+        unique_keys = {name: [] for name in names}
+        foreign_keys = {name: [] for name in names}
+        indexes = {name: [] for name in names}
         cur = self.conn.cursor()
 
         # Columns
         cur.execute(
             """
-            SELECT column_name, data_type, udt_name, is_nullable, column_default
+            SELECT table_name, column_name, data_type, udt_name, is_nullable,
+                   column_default
             FROM information_schema.columns
-            WHERE table_schema = 'public' AND table_name = %s;
+            WHERE table_schema = 'public' AND table_name = ANY(%s)
+            ORDER BY table_name, ordinal_position;
             """,
-            (table_name,),
+            (names,),
         )
-
-        columns = []
-        for n, t, udt, nn, d in cur.fetchall():
+        for tbl, n, t, udt, nn, d in cur.fetchall():
             # Handle enums or custom types
             if t == "USER-DEFINED":
                 t = udt
-            columns.append(
+            columns[tbl].append(
                 ColumnSchema(name=n, type=t, nullable=(nn == "YES"), default=d)
             )
 
-        # Primary key
+        # Primary keys
         cur.execute(
             """
-            SELECT a.attname
+            SELECT c.relname, a.attname
             FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
             JOIN pg_attribute a ON a.attrelid = i.indrelid
                 AND a.attnum = ANY(i.indkey)
-            WHERE i.indrelid = %s::regclass
-            AND i.indisprimary;
+            WHERE n.nspname = 'public' AND c.relname = ANY(%s)
+            AND i.indisprimary
+            ORDER BY c.relname, array_position(i.indkey::int2[], a.attnum);
             """,
-            (table_name,),
+            (names,),
         )
-        primary_key = [r[0] for r in cur.fetchall()]
+        for tbl, col in cur.fetchall():
+            primary_keys[tbl].append(col)
 
         # Unique keys
         cur.execute(
             """
             SELECT
-                i.relname AS index_name,
+                t.relname AS table_name,
                 ARRAY_AGG(a.attname ORDER BY a.attnum) AS column_names
             FROM pg_class t
+            JOIN pg_namespace n ON n.oid = t.relnamespace
             JOIN pg_index ix ON t.oid = ix.indrelid
             JOIN pg_class i ON i.oid = ix.indexrelid
             JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = ANY(ix.indkey)
-            WHERE t.relname = %s AND ix.indisunique AND NOT ix.indisprimary
-            GROUP BY i.relname;
+            WHERE n.nspname = 'public' AND t.relname = ANY(%s)
+            AND ix.indisunique AND NOT ix.indisprimary
+            GROUP BY t.relname, i.relname;
             """,
-            (table_name,),
+            (names,),
         )
-        unique_keys = [
-            UniqueKeySchema(columns=list(cols)) for _, cols in cur.fetchall()
-        ]
+        for tbl, cols in cur.fetchall():
+            unique_keys[tbl].append(UniqueKeySchema(columns=list(cols)))
 
-        # Foreign keys
+        # Foreign keys, with conkey/confkey unnested in order so composite
+        # keys keep their column pairing
         cur.execute(
             """
             SELECT
-                kcu.column_name,
-                ccu.table_name AS ref_table,
-                ccu.column_name AS ref_column
-            FROM information_schema.table_constraints AS tc
-            JOIN information_schema.key_column_usage AS kcu
-            ON tc.constraint_name = kcu.constraint_name
-            JOIN information_schema.constraint_column_usage AS ccu
-            ON ccu.constraint_name = tc.constraint_name
-            WHERE constraint_type = 'FOREIGN KEY' AND tc.table_name = %s;
+                t.relname,
+                c.conname,
+                r.relname,
+                ARRAY(
+                    SELECT a.attname::text
+                    FROM unnest(c.conkey) WITH ORDINALITY AS k(attnum, pos)
+                    JOIN pg_attribute a
+                    ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+                    ORDER BY k.pos
+                ),
+                ARRAY(
+                    SELECT a.attname::text
+                    FROM unnest(c.confkey) WITH ORDINALITY AS k(attnum, pos)
+                    JOIN pg_attribute a
+                    ON a.attrelid = c.confrelid AND a.attnum = k.attnum
+                    ORDER BY k.pos
+                )
+            FROM pg_constraint c
+            JOIN pg_class t ON t.oid = c.conrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            JOIN pg_class r ON r.oid = c.confrelid
+            WHERE c.contype = 'f' AND n.nspname = 'public'
+            AND t.relname = ANY(%s)
+            ORDER BY t.relname, c.conname;
             """,
-            (table_name,),
+            (names,),
         )
-        foreign_keys = [
-            ForeignKeySchema(column=c, ref_table=rt, ref_column=rc)
-            for c, rt, rc in cur.fetchall()
-        ]
+        for tbl, name, rt, cols, ref_cols in cur.fetchall():
+            foreign_keys[tbl].append(
+                ForeignKeySchema(
+                    columns=list(cols),
+                    ref_table=rt,
+                    ref_columns=list(ref_cols),
+                    name=name,
+                )
+            )
 
-        cur.close()
-        return TableSchema(
-            name=table_name,
-            columns=columns,
-            primary_key=primary_key,
-            unique_keys=unique_keys,
-            foreign_keys=foreign_keys,
+        # Secondary indexes
+        cur.execute(
+            """
+            SELECT t.relname, i.relname, pg_get_indexdef(ix.indexrelid)
+            FROM pg_index ix
+            JOIN pg_class t ON t.oid = ix.indrelid
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname = 'public' AND t.relname = ANY(%s)
+            AND NOT ix.indisunique AND NOT ix.indisprimary;
+            """,
+            (names,),
         )
+        for tbl, idx, definition in cur.fetchall():
+            indexes[tbl].append(IndexSchema(name=idx, definition=definition))
 
-    def create_table(self, schema: TableSchema):
+        cur.close()
+        return {
+            name: TableSchema(
+                name=name,
+                columns=columns[name],
+                primary_key=primary_keys[name],
+                unique_keys=unique_keys[name],
+                foreign_keys=foreign_keys[name],
+                indexes=indexes[name],
+            )
+            for name in names
+        }
+
+    def create_table(
+        self,
+        schema: TableSchema,
+        constraints: bool = True,
+        enums: List[EnumType] | None = None,
+    ):
         cols_sql = []
         cur = self.conn.cursor()
 
@@ -161,8 +349,8 @@ class PostgresAdapter(BaseAdapter):
                 col_sql += f" DEFAULT {col.default}"
             cols_sql.append(col_sql)
 
-        # Add primary key constraint if specified
-        if schema.primary_key:
+        # Add primary key constraint if specified and not deferred
+        if schema.primary_key and constraints:
             pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
             cols_sql.append(f"PRIMARY KEY ({pk_cols})")
 
@@ -176,6 +364,94 @@ class PostgresAdapter(BaseAdapter):
         finally:
             cur.close()
 
+    def set_maintenance_memory(self, value: str):
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT set_config('maintenance_work_mem', %s, false);", (value,)
+            )
+
+    def _constraint_exists(self, table_name: str, name: str) -> bool:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT 1 FROM pg_constraint WHERE conrelid = %s::regclass "
+                "AND conname = %s;",
+                (f'"{table_name}"', name),
+            )
+            return cur.fetchone() is not None
+
+    def build_indexes(self, schema: TableSchema):
+        """Create the primary key, unique keys and secondary indexes."""
+        cur = self.conn.cursor()
+        try:
+            if schema.primary_key:
+                name = _ident(f"{schema.name}_pkey")
+                # A table created with an inline PK already has one
+                cur.execute(
+                    "SELECT 1 FROM pg_index WHERE indrelid = %s::regclass "
+                    "AND indisprimary;",
+                    (f'"{schema.name}"',),
+                )
+                if cur.fetchone() is None:
+                    pk_cols = ", ".join(f'"{c}"' for c in schema.primary_key)
+                    cur.execute(
+                        f'ALTER TABLE "{schema.name}" '
+                        f'ADD CONSTRAINT "{name}" PRIMARY KEY ({pk_cols});'
+                    )
+
+            for uk in schema.unique_keys or []:
+                name = _ident(f"{schema.name}_{'_'.join(uk.columns)}_key")
+                cols = ", ".join(f'"{c}"' for c in uk.columns)
+                cur.execute(
+                    f'CREATE UNIQUE INDEX IF NOT EXISTS "{name}" '
+                    f'ON "{schema.name}" ({cols});'
+                )
+
+            for idx in schema.indexes or []:
+                cur.execute(
+                    idx.definition.replace(
+                        "CREATE INDEX ", "CREATE INDEX IF NOT EXISTS ", 1
+                    )
+                )
+        finally:
+            cur.close()
+
+    def add_foreign_keys(self, schema: TableSchema) -> List[str]:
+        """
+        Add foreign keys as NOT VALID: a quick catalog change that skips
+        checking existing rows. Returns the names of the constraints added.
+        """
+        added = []
+        with self.conn.cursor() as cur:
+            for fk in schema.foreign_keys or []:
+                name = _ident(fk.constraint_name(schema.name))
+                if self._constraint_exists(schema.name, name):
+                    continue
+                cols = ", ".join(f'"{c}"' for c in fk.columns)
+                ref_cols = ", ".join(f'"{c}"' for c in fk.ref_columns)
+                cur.execute(
+                    f'ALTER TABLE "{schema.name}" ADD CONSTRAINT "{name}" '
+                    f"FOREIGN KEY ({cols}) "
+                    f'REFERENCES "{fk.ref_table}" ({ref_cols}) NOT VALID;'
+                )
+                added.append(name)
+        return added
+
+    def validate_foreign_keys(self, schema: TableSchema):
+        """
+        Validate NOT VALID foreign keys. Only takes a SHARE UPDATE EXCLUSIVE
+        lock, so tables stay readable and writable while it scans.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass "
+                "AND contype = 'f' AND NOT convalidated;",
+                (f'"{schema.name}"',),
+            )
+            for (name,) in cur.fetchall():
+                cur.execute(
+                    f'ALTER TABLE "{schema.name}" VALIDATE CONSTRAINT "{name}";'
+                )
+
     def list_tables(self) -> List[str]:
         query = """
         SELECT table_name
@@ -189,28 +465,566 @@ class PostgresAdapter(BaseAdapter):
         cur.close()
         return tables
 
-    def fetch_rows(self, table_name: str, limit: int = 1000) -> List[Dict[str, Any]]:
+    def fetch_rows(self, table_name: str, limit: int = 1000) -> Batch:
         cur = self.conn.cursor()
         cur.execute(f'SELECT * FROM "{table_name}" LIMIT {limit};')
         columns = [desc[0] for desc in cur.description]
-        rows = [dict(zip(columns, row)) for row in cur.fetchall()]
+        batch = Batch(columns, cur.fetchall())
         cur.close()
-        return rows
+        return batch
 
-    def insert_rows(self, table_name: str, rows: list[dict]):
-        if not rows:
-            return
+    def stream_rows(
+        self,
+        schema: TableSchema,
+        batch_size: int | Callable[[], int] = 1000,
+        chunk: Chunk | None = None,
+        start_after: tuple | None = None,
+        defer_over: int | None = None,
+    ) -> Iterator[Batch]:
+        """
+        Stream a table in batches.
+        Uses keyset pagination on the primary key when there is one, otherwise
+        a named (server-side) cursor, so only one batch is held in memory.
+        `batch_size` may be a callable, asked again before every batch.
+        With `defer_over`, values of wide columns larger than that many bytes
+        come back as placeholders and are listed in `Batch.deferred`
+        (keyed tables only).
+        """
+        where, params = chunk.predicate() if chunk else ("TRUE", ())
+        where = with_row_filter(where, schema.row_filter)
+        if schema.primary_key:
+            wide = self.wide_columns(schema) if defer_over else []
+            yield from self._stream_keyset(
+                schema, batch_size, where, params, start_after, wide, defer_over
+            )
+        else:
+            if start_after is not None:
+                raise ValueError(f"Table {schema.name} has no primary key to resume on")
+            yield from self._stream_cursor(schema, batch_size, where, params)
+
+    def _stream_keyset(
+        self,
+        schema: TableSchema,
+        batch_size: int | Callable[[], int],
+        where: str,
+        params: tuple,
+        last_key: tuple | None = None,
+        wide: List[str] | None = None,
+        defer_over: int | None = None,
+    ) -> Iterator[Batch]:
+        wide = wide or []
+        cols = self._select_list(schema, wide, defer_over)
+        if wide:
+            # One flag per wide column, set where its value was left out
+            cols += ", " + ", ".join(
+                f"{_wide_size(schema, name, defer_over)} > {defer_over}"
+                for name in wide
+            )
+        columns = [col.name for col in schema.columns]
+        key_index = [columns.index(col) for col in schema.primary_key]
+        pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
+        placeholders = ", ".join(["%s"] * len(schema.primary_key))
+
+        while True:
+            limit = batch_size() if callable(batch_size) else batch_size
+            cur = self.conn.cursor()
+            if last_key is None:
+                cur.execute(
+                    f'SELECT {cols} FROM "{schema.name}" WHERE {where} '
+                    f"ORDER BY {pk_cols} LIMIT %s;",
+                    (*params, limit),
+                )
+            else:
+                cur.execute(
+                    f'SELECT {cols} FROM "{schema.name}" WHERE {where} '
+                    f"AND ({pk_cols}) > ({placeholders}) "
+                    f"ORDER BY {pk_cols} LIMIT %s;",
+                    (*params, *last_key, limit),
+                )
+            rows = cur.fetchall()
+            cur.close()
+            deferred: Dict[str, List[tuple]] = {}
+            if wide:
+                width = len(columns)
+                for row in rows:
+                    for name, flag in zip(wide, row[width:]):
+                        if flag:
+                            key = tuple(row[i] for i in key_index)
+                            deferred.setdefault(name, []).append(key)
+                rows = [row[:width] for row in rows]
+            batch = Batch(columns, rows, schema, deferred)
+
+            if not batch:
+                return
+            yield batch
+            if len(batch) < limit:
+                return
+            last_key = batch.last_key(schema.primary_key)
+
+    def _stream_cursor(
+        self,
+        schema: TableSchema,
+        batch_size: int | Callable[[], int],
+        where: str,
+        params: tuple,
+    ) -> Iterator[Batch]:
+        # Named cursors only live inside a transaction, so leave autocommit
+        # for the duration of the scan. The source is never written to.
+        autocommit = self.conn.autocommit
+        self.conn.autocommit = False
+        cur = self.conn.cursor(name=f"dbferry_{uuid.uuid4().hex}")
+        try:
+            cols = ", ".join(f'"{col.name}"' for col in schema.columns)
+            cur.execute(f'SELECT {cols} FROM "{schema.name}" WHERE {where};', params)
+            columns = None
+            while True:
+                limit = batch_size() if callable(batch_size) else batch_size
+                batch = cur.fetchmany(limit)
+                if not batch:
+                    break
+                if columns is None:
+                    columns = [desc[0] for desc in cur.description]
+                yield Batch(columns, batch, schema)
+        finally:
+            cur.close()
+            self.conn.rollback()
+            self.conn.autocommit = autocommit
+
+    def last_key(self, schema: TableSchema, chunk: Chunk | None = None) -> tuple | None:
+        where, params = chunk.predicate() if chunk else ("TRUE", ())
+        pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
+        pk_desc = ", ".join(f'"{col}" DESC' for col in schema.primary_key)
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f'SELECT {pk_cols} FROM "{schema.name}" WHERE {where} '
+                f"ORDER BY {pk_desc} LIMIT 1;",
+                params,
+            )
+            row = cur.fetchone()
+        return tuple(row) if row else None
+
+    def truncate_table(self, table_name: str) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute(f'TRUNCATE "{table_name}";')
+        self.conn.commit()
+
+    def drop_table(self, table_name: str) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute(f'DROP TABLE IF EXISTS "{table_name}";')
+        self.conn.commit()
+
+    def avg_row_width(self, table_name: str) -> float | None:
+        """Average row size from column statistics, else from page/tuple counts."""
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT COALESCE(
+                    (SELECT SUM(avg_width) FROM pg_stats
+                     WHERE schemaname = 'public' AND tablename = %s),
+                    (SELECT relpages::float8 * current_setting('block_size')::int
+                            / reltuples
+                     FROM pg_class WHERE oid = %s::regclass AND reltuples > 0)
+                );
+                """,
+                (table_name, f'"{table_name}"'),
+            )
+            width = cur.fetchone()[0]
+        return float(width) if width else None
+
+    def table_size_bytes(self, table_name: str) -> int:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_relation_size(%s::regclass);", (f'"{table_name}"',))
+            return cur.fetchone()[0]
+
+    def key_ranges(self, schema: TableSchema, count: int) -> List[Chunk]:
+        """
+        Split on a single-column primary key using the planner's histogram
+        (or min/max for integer keys), otherwise on physical ctid block ranges.
+        """
+        if count < 2:
+            return []
+        if schema.primary_key and len(schema.primary_key) == 1:
+            pk = schema.primary_key[0]
+            bounds = self._pk_split_points(schema, pk, count)
+            if bounds:
+                return Chunk.from_bounds(pk, bounds)
+        return self._ctid_ranges(schema.name, count)
+
+    def _pk_split_points(self, schema: TableSchema, column: str, count: int) -> list:
         cur = self.conn.cursor()
-        columns = rows[0].keys()
-        values = [[row[col] for col in columns] for row in rows]
-        placeholders = ", ".join(["%s"] * len(columns))
+        try:
+            cur.execute(
+                """
+                SELECT histogram_bounds::text::text[]
+                FROM pg_stats
+                WHERE schemaname = 'public' AND tablename = %s AND attname = %s;
+                """,
+                (schema.name, column),
+            )
+            row = cur.fetchone()
+            hist = row[0] if row and row[0] else []
+            if len(hist) >= count:
+                # Each histogram bucket holds roughly the same number of rows
+                return sorted(
+                    {hist[len(hist) * i // count] for i in range(1, count)},
+                    key=hist.index,
+                )
+
+            col_type = next(c.type for c in schema.columns if c.name == column)
+            if col_type.lower() not in ("smallint", "integer", "bigint"):
+                return []
+            cur.execute(
+                f'SELECT MIN("{column}"), MAX("{column}") FROM "{schema.name}";'
+            )
+            lo, hi = cur.fetchone()
+            if lo is None or hi - lo < count:
+                return []
+            step = (hi - lo) // count
+            return [lo + step * i for i in range(1, count)]
+        finally:
+            cur.close()
+
+    def _ctid_ranges(self, table_name: str, count: int) -> List[Chunk]:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT pg_relation_size(%s::regclass) "
+                "/ current_setting('block_size')::int;",
+                (f'"{table_name}"',),
+            )
+            pages = cur.fetchone()[0]
+        if pages < count:
+            return []
+        step = -(-pages // count)
+        bounds = [f"({step * i},0)" for i in range(1, count) if step * i < pages]
+        return Chunk.from_bounds("ctid", bounds, cast="tid")
+
+    def insert_rows(self, table_name: str, batch: Batch):
+        """
+        Bulk-load a batch with COPY FROM STDIN and return the bytes sent.
+        Falls back to executemany when a batch holds values COPY text
+        format can't represent (arrays, ranges, composite types).
+        """
+        if not batch:
+            return 0
+        try:
+            payload = encode_copy_rows(batch, self._copy_converters(table_name, batch))
+        except CopyUnsupported:
+            self._insert_rows_executemany(table_name, batch)
+            return None
+        self.copy_from(table_name, batch.columns, io.StringIO(payload))
+        return len(payload.encode())
+
+    def copy_from(self, table_name: str, columns: List[str], source: Any) -> int:
+        """Run COPY ... FROM STDIN reading text-format data from a file-like object."""
+        cols = ", ".join(f'"{col}"' for col in columns)
+        with self.conn.cursor() as cur:
+            cur.copy_expert(f'COPY "{table_name}" ({cols}) FROM STDIN;', source)
+            return cur.rowcount
+
+    def copy_to(
+        self,
+        schema: TableSchema,
+        sink: Any,
+        chunk: Chunk | None = None,
+        defer_over: int | None = None,
+    ) -> int:
+        """
+        Run COPY ... TO STDOUT writing raw text-format bytes to a file-like
+        object, for the whole table or the rows of `chunk` and the table's
+        row filter. With `defer_over`, wide values larger than that many
+        bytes are sent as placeholders (see `deferred_keys`).
+        """
+        wide = self.wide_columns(schema) if defer_over else []
+        with self.conn.cursor() as cur:
+            if chunk is None and not schema.row_filter and not wide:
+                cols = ", ".join(f'"{col.name}"' for col in schema.columns)
+                sql = f'COPY "{schema.name}" ({cols}) TO STDOUT;'
+            else:
+                cols = self._select_list(schema, wide, defer_over)
+                where, params = chunk.predicate() if chunk else ("TRUE", ())
+                where = with_row_filter(where, schema.row_filter)
+                query = cur.mogrify(
+                    f'SELECT {cols} FROM "{schema.name}" WHERE {where}', params
+                ).decode()
+                sql = f"COPY ({query}) TO STDOUT;"
+            cur.copy_expert(sql, sink)
+            return cur.rowcount
+
+    @contextmanager
+    def snapshot(self, snapshot_id: str | None = None):
+        """
+        Run the statements inside in one read-only REPEATABLE READ transaction,
+        seeing the snapshot another session exported with `export_snapshot`
+        when `snapshot_id` is given.
+        """
+        autocommit = self.conn.autocommit
+        self.conn.autocommit = False
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(
+                    "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY;"
+                )
+                if snapshot_id:
+                    cur.execute("SET TRANSACTION SNAPSHOT %s;", (snapshot_id,))
+            yield
+        finally:
+            self.conn.rollback()
+            self.conn.autocommit = autocommit
+
+    def export_snapshot(self) -> str:
+        """
+        Name the open `snapshot()` so other connections can read in it; valid
+        until that transaction ends.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_export_snapshot();")
+            return cur.fetchone()[0]
+
+    def wide_columns(self, schema: TableSchema) -> List[str]:
+        """
+        Columns of a variable-length type on a table that keeps data out of
+        line. A value that doesn't fit in the row itself is TOASTed, so tables
+        with an empty TOAST relation hold no large values at all.
+        """
+        wide = [c.name for c in schema.columns if c.type.lower() in _WIDE_TYPES]
+        if not wide:
+            return []
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT pg_relation_size(NULLIF(reltoastrelid, 0)) "
+                "FROM pg_class WHERE oid = %s::regclass;",
+                (f'"{schema.name}"',),
+            )
+            toasted = cur.fetchone()[0]
+        return wide if toasted else []
+
+    @staticmethod
+    def _select_list(
+        schema: TableSchema, wide: List[str], defer_over: int | None
+    ) -> str:
+        """Column list with wide values over `defer_over` bytes swapped for placeholders."""
+        cols = []
+        for col in schema.columns:
+            if col.name in wide:
+                placeholder = _WIDE_TYPES[col.type.lower()][1]
+                cols.append(
+                    f"CASE WHEN {_wide_size(schema, col.name, defer_over)} > {defer_over} "
+                    f'THEN {placeholder} ELSE "{col.name}" END AS "{col.name}"'
+                )
+            else:
+                cols.append(f'"{col.name}"')
+        return ", ".join(cols)
+
+    def deferred_keys(
+        self, schema: TableSchema, defer_over: int, chunk: Chunk | None = None
+    ) -> Dict[str, List[tuple]]:
+        """
+        Primary keys of the rows whose wide values `copy_to` leaves out, per
+        column. Sizes are read from TOAST pointers, so no value is detoasted.
+        """
+        wide = self.wide_columns(schema)
+        if not wide or not schema.primary_key:
+            return {}
+        sizes = [
+            f"{_wide_size(schema, name, defer_over)} > {defer_over}" for name in wide
+        ]
+        pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
+        where, params = chunk.predicate() if chunk else ("TRUE", ())
+        where = with_row_filter(where, schema.row_filter)
+        deferred: Dict[str, List[tuple]] = {}
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f'SELECT {pk_cols}, {", ".join(sizes)} FROM "{schema.name}" '
+                f"WHERE {where} AND ({' OR '.join(sizes)});",
+                params,
+            )
+            width = len(schema.primary_key)
+            for row in cur:
+                for name, flag in zip(wide, row[width:]):
+                    if flag:
+                        deferred.setdefault(name, []).append(tuple(row[:width]))
+        return deferred
+
+    def stream_value(
+        self,
+        schema: TableSchema,
+        column: str,
+        key: tuple,
+        piece_bytes: int,
+        snapshot_id: str | None = None,
+    ) -> Iterator[tuple[int, bytes]]:
+        """
+        Read one value as (offset, bytes) pieces of `piece_bytes`. The value is
+        detoasted, and text types encoded as UTF-8, once into a materialized
+        CTE, then sliced by a server-side cursor that fetches one piece at a
+        time, all within one snapshot (the exported `snapshot_id`, if given).
+        """
+        col_type = next(c.type.lower() for c in schema.columns if c.name == column)
+        if col_type == "bytea":
+            # Concatenating detoasts once; a bare column would stay a TOAST
+            # pointer and be decompressed again for every slice
+            value = f"\"{column}\" || ''::bytea"
+        else:
+            value = f"convert_to(\"{column}\"::text, 'UTF8')"
+        match = " AND ".join(f'"{col}" = %s' for col in schema.primary_key)
         sql = (
-            f'INSERT INTO "{table_name}" ({", ".join(columns)}) VALUES ({placeholders})'
+            f'WITH v AS MATERIALIZED (SELECT {value} AS v FROM "{schema.name}" '
+            f"WHERE {match}) "
+            "SELECT g - 1, substring(v FROM g FOR %s) "
+            "FROM v, generate_series(1, octet_length(v), %s) AS g;"
         )
-        cur.executemany(sql, values)
-        self.conn.commit()
+        with self.snapshot(snapshot_id):
+            cur = self.conn.cursor(name=f"dbferry_{uuid.uuid4().hex}")
+            cur.itersize = 1
+            try:
+                cur.execute(sql, (*key, piece_bytes, piece_bytes))
+                for offset, piece in cur:
+                    yield offset, bytes(piece)
+            finally:
+                cur.close()
+
+    def write_value(
+        self,
+        schema: TableSchema,
+        column: str,
+        key: tuple,
+        pieces: Iterator[tuple[int, bytes]],
+    ) -> int:
+        """
+        Set one value from its pieces: they go into a temporary large object,
+        which the row then takes its value from, server-side. Runs in the
+        caller's transaction. Without any pieces (the source row is gone)
+        the placeholder stays.
+        """
+        col_type = next(c.type.lower() for c in schema.columns if c.name == column)
+        nbytes = 0
+        lob = self.conn.lobject(0, "wb")
+        try:
+            for offset, piece in pieces:
+                lob.seek(offset)
+                nbytes += lob.write(piece)
+        finally:
+            lob.close()
+
+        value = "lo_get(%s)"
+        if col_type != "bytea":
+            value = f"convert_from({value}, 'UTF8')::{col_type}"
+        match = " AND ".join(f'"{col}" = %s' for col in schema.primary_key)
+        with self.conn.cursor() as cur:
+            if nbytes:
+                cur.execute(
+                    f'UPDATE "{schema.name}" SET "{column}" = {value} WHERE {match};',
+                    (lob.oid, *key),
+                )
+            cur.execute("SELECT lo_unlink(%s);", (lob.oid,))
+        return nbytes
+
+    def large_objects(self, schemas: List[TableSchema] | None = None) -> List[int]:
+        where = ""
+        if schemas is not None:
+            # The lo extension's type is a domain over oid, reported as oid
+            refs = [
+                f'SELECT "{col.name}" FROM "{schema.name}" '
+                f'WHERE {with_row_filter("TRUE", schema.row_filter)}'
+                for schema in schemas
+                for col in schema.columns
+                if col.type.lower() == "oid"
+            ]
+            if not refs:
+                return []
+            where = f"WHERE oid IN ({' UNION '.join(refs)}) "
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f"SELECT oid FROM pg_largeobject_metadata {where}ORDER BY oid;", ()
+            )
+            return [row[0] for row in cur.fetchall()]
+
+    def read_large_object(self, oid: int, piece_bytes: int) -> Iterator[bytes]:
+        # The large object API only works inside a transaction
+        with self.snapshot():
+            lob = self.conn.lobject(oid, "rb")
+            try:
+                while piece := lob.read(piece_bytes):
+                    yield piece
+            finally:
+                lob.close()
+
+    def write_large_object(self, oid: int, pieces: Iterator[bytes]) -> int:
+        autocommit = self.conn.autocommit
+        self.conn.autocommit = False
+        try:
+            lob = self.conn.lobject(0, "wb", oid)
+            nbytes = 0
+            for piece in pieces:
+                nbytes += lob.write(piece)
+            lob.close()
+            self.conn.commit()
+            return nbytes
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.conn.autocommit = autocommit
+
+    def _insert_rows_executemany(self, table_name: str, batch: Batch):
+        cur = self.conn.cursor()
+        placeholders = ", ".join(["%s"] * len(batch.columns))
+        cols = ", ".join(f'"{col}"' for col in batch.columns)
+        sql = f'INSERT INTO "{table_name}" ({cols}) VALUES ({placeholders})'
+        cur.executemany(sql, batch.rows)
         cur.close()
 
+    def upsert_rows(self, table_name: str, batch: Batch, key_columns: List[str]):
+        """
+        INSERT ... ON CONFLICT on the key. Batches go through COPY into a
+        temporary staging table and are merged with a single statement.
+        """
+        if not batch:
+            return
+        columns = batch.columns
+        cols = ", ".join(f'"{col}"' for col in columns)
+        keys = ", ".join(f'"{col}"' for col in key_columns)
+        updates = [col for col in columns if col not in key_columns]
+        if updates:
+            action = "DO UPDATE SET " + ", ".join(
+                f'"{col}" = EXCLUDED."{col}"' for col in updates
+            )
+        else:
+            action = "DO NOTHING"
+
+        cur = self.conn.cursor()
+        try:
+            try:
+                payload = encode_copy_rows(
+                    batch, self._copy_converters(table_name, batch)
+                )
+            except CopyUnsupported:
+                placeholders = ", ".join(["%s"] * len(columns))
+                cur.executemany(
+                    f'INSERT INTO "{table_name}" ({cols}) VALUES ({placeholders}) '
+                    f"ON CONFLICT ({keys}) {action};",
+                    batch.rows,
+                )
+                return
+
+            stage = _ident(f"_dbferry_stage_{table_name}")
+            cur.execute(
+                f'CREATE TEMP TABLE IF NOT EXISTS "{stage}" (LIKE "{table_name}");'
+            )
+            self.copy_from(stage, columns, io.StringIO(payload))
+            cur.execute(
+                f'INSERT INTO "{table_name}" ({cols}) SELECT {cols} FROM "{stage}" '
+                f"ON CONFLICT ({keys}) {action};"
+            )
+            cur.execute(f'TRUNCATE "{stage}";')
+        finally:
+            cur.close()
+
+    def max_value(self, table_name: str, column: str) -> Any:
+        with self.conn.cursor() as cur:
+            cur.execute(f'SELECT MAX("{column}") FROM "{table_name}";')
+            return cur.fetchone()[0]
+
     def list_enum_types(self) -> list[EnumType]:
         cur = self.conn.cursor()
         cur.execute(
@@ -235,11 +1049,158 @@ class PostgresAdapter(BaseAdapter):
         cur.execute(f"CREATE TYPE {enum.name} AS ENUM ({values});")
         cur.close()
 
-    def count_rows(self, table_name: str) -> int:
+    def _key_range(
+        self, schema: TableSchema, lower: tuple | None, upper: tuple | None
+    ) -> tuple[str, tuple]:
+        """
+        WHERE clause for `lower <= pk < upper` using row comparison, limited
+        to the rows passing the table's row filter.
+        """
+        pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key or [])
+        placeholders = ", ".join(["%s"] * len(schema.primary_key or []))
+        clauses, params = [], []
+        if lower is not None:
+            clauses.append(f"({pk_cols}) >= ({placeholders})")
+            params.extend(lower)
+        if upper is not None:
+            clauses.append(f"({pk_cols}) < ({placeholders})")
+            params.extend(upper)
+        where = " AND ".join(clauses) or "TRUE"
+        return with_row_filter(where, schema.row_filter), tuple(params)
+
+    @staticmethod
+    def _row_text(schema: TableSchema) -> str:
+        cols = ", ".join(f'"{col.name}"' for col in schema.columns)
+        return f"ROW({cols})::text"
+
+    def range_digest(
+        self,
+        schema: TableSchema,
+        lower: tuple | None = None,
+        upper: tuple | None = None,
+    ) -> tuple[int, str]:
+        """
+        Row count and digest of a primary key range, computed server-side.
+        The digest sums the first 64 bits of each row's md5, so it needs no
+        sort and no memory beyond one accumulator.
+        """
+        where, params = self._key_range(schema, lower, upper)
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(('x' || SUBSTR(MD5("
+                f"{self._row_text(schema)}), 1, 16))::bit(64)::bigint), 0) "
+                f'FROM "{schema.name}" WHERE {where};',
+                params,
+            )
+            count, digest = cur.fetchone()
+        return count, str(digest)
+
+    def split_key(
+        self,
+        schema: TableSchema,
+        lower: tuple | None,
+        upper: tuple | None,
+        offset: int,
+    ) -> tuple | None:
+        """The primary key `offset` rows into a range, used to bisect it."""
+        where, params = self._key_range(schema, lower, upper)
+        pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f'SELECT {pk_cols} FROM "{schema.name}" WHERE {where} '
+                f"ORDER BY {pk_cols} OFFSET %s LIMIT 1;",
+                (*params, offset),
+            )
+            row = cur.fetchone()
+        return tuple(row) if row else None
+
+    def row_digests(
+        self, schema: TableSchema, lower: tuple | None, upper: tuple | None
+    ) -> Dict[tuple, str]:
+        """Per-row md5 keyed by primary key, for a (small) key range."""
+        where, params = self._key_range(schema, lower, upper)
+        pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
+        width = len(schema.primary_key)
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f"SELECT {pk_cols}, MD5({self._row_text(schema)}) "
+                f'FROM "{schema.name}" WHERE {where};',
+                params,
+            )
+            return {tuple(row[:width]): row[width] for row in cur.fetchall()}
+
+    def catalog_fingerprint(self) -> str | None:
+        """
+        Hash of the xmin of every catalog row describing the public schema.
+        Any DDL rewrites those rows; ANALYZE and VACUUM update in place and
+        leave it unchanged.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT md5(string_agg(entry, ',' ORDER BY entry))
+                FROM (
+                    SELECT 'c' || c.oid || ':' || c.xmin
+                    FROM pg_class c
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = 'public'
+                    UNION ALL
+                    SELECT 'a' || a.attrelid || ':' || a.attnum || ':' || a.xmin
+                    FROM pg_attribute a
+                    JOIN pg_class c ON c.oid = a.attrelid
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = 'public'
+                    UNION ALL
+                    SELECT 'k' || con.oid || ':' || con.xmin
+                    FROM pg_constraint con
+                    JOIN pg_namespace n ON n.oid = con.connamespace
+                    WHERE n.nspname = 'public'
+                    UNION ALL
+                    SELECT 't' || t.oid || ':' || t.xmin
+                    FROM pg_type t
+                    JOIN pg_namespace n ON n.oid = t.typnamespace
+                    WHERE n.nspname = 'public'
+                    UNION ALL
+                    SELECT 'e' || e.oid || ':' || e.xmin
+                    FROM pg_enum e
+                ) AS catalog(entry);
+                """
+            )
+            return cur.fetchone()[0]
+
+    def estimate_rows(self, table_names: List[str]) -> Dict[str, int | None]:
+        """
+        Planner/statistics row estimates for many tables in one query.
+        Prefers the live tuple count from pg_stat_user_tables, then
+        pg_class.reltuples; None when the table was never analyzed.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT c.relname,
+                       COALESCE(
+                           NULLIF(s.n_live_tup, 0),
+                           CASE WHEN c.reltuples >= 0 THEN c.reltuples::bigint END
+                       )
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+                WHERE n.nspname = 'public' AND c.relname = ANY(%s)
+                AND c.relkind IN ('r', 'p');
+                """,
+                (list(table_names),),
+            )
+            return dict(cur.fetchall())
+
+    def count_rows(self, table_name: str, where: str | None = None) -> int:
         """Return row count from the specified table."""
         with self.conn.cursor() as cur:
             try:
-                cur.execute(f'SELECT COUNT(*) FROM "{table_name}";')
+                cur.execute(
+                    f'SELECT COUNT(*) FROM "{table_name}" '
+                    f'WHERE {with_row_filter("TRUE", where)};',
+                    (),
+                )
                 return cur.fetchone()[0]
             except Exception as e:
                 raise RuntimeError(f"Failed to count rows in {table_name}: {e}")
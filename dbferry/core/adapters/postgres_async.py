@@ -0,0 +1,155 @@
+from typing import AsyncIterator, Callable, List
+
+import psycopg
+from psycopg.types.string import TextLoader
+
+from dbferry.core.adapters.base import with_row_filter
+from dbferry.core.batch import Batch
+from dbferry.core.chunking import Chunk
+from dbferry.core.config import DBConfig
+from dbferry.core.schema import TableSchema
+
+
+class AsyncPostgresAdapter:
+    """
+    Data-path adapter on psycopg 3's AsyncConnection, used by the asyncio
+    engine. Only moves rows; schema discovery and DDL stay on PostgresAdapter.
+    """
+
+    def __init__(self, config: DBConfig):
+        self.config = config
+        self.conn: psycopg.AsyncConnection | None = None
+
+    async def connect(self):
+        self.conn = await psycopg.AsyncConnection.connect(
+            host=self.config.host,
+            port=self.config.port,
+            dbname=self.config.database,
+            user=self.config.user,
+            password=self.config.password,
+            sslmode=self.config.sslmode,
+            # psycopg 3 hands back bytes for SQL_ASCII databases otherwise
+            client_encoding="utf8",
+            autocommit=True,
+        )
+        # Keep JSON as text so rows can be written back without re-encoding
+        for name in ("json", "jsonb"):
+            self.conn.adapters.register_loader(name, TextLoader)
+
+    async def close(self):
+        if self.conn:
+            await self.conn.close()
+
+    async def reset(self):
+        """End any open transaction, before the connection is reused."""
+        if self.conn.closed:
+            raise psycopg.InterfaceError("connection is closed")
+        await self.conn.rollback()
+
+    async def copy_out(
+        self,
+        table_name: str,
+        columns: List[str],
+        chunk: Chunk | None = None,
+        row_filter: str | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield raw text-format COPY data for a table or one chunk of it."""
+        cols = ", ".join(f'"{col}"' for col in columns)
+        where, params = chunk.predicate() if chunk else ("TRUE", ())
+        # psycopg 3 only substitutes placeholders (and un-doubles %%) when
+        # there are parameters, so a filter's % stays as-is without them
+        where = with_row_filter(
+            where, row_filter, paramstyle="pyformat" if params else "literal"
+        )
+        cur = self.conn.cursor()
+        async with cur.copy(
+            f'COPY (SELECT {cols} FROM "{table_name}" WHERE {where}) TO STDOUT',
+            params,
+        ) as copy:
+            async for data in copy:
+                yield data
+
+    async def copy_in(
+        self, table_name: str, columns: List[str], source: AsyncIterator[bytes]
+    ) -> tuple[int, int]:
+        """COPY data from an async iterator inside the current transaction."""
+        cols = ", ".join(f'"{col}"' for col in columns)
+        nbytes = 0
+        cur = self.conn.cursor()
+        async with cur.copy(f'COPY "{table_name}" ({cols}) FROM STDIN') as copy:
+            async for data in source:
+                await copy.write(data)
+                nbytes += len(data)
+        return cur.rowcount, nbytes
+
+    async def stream_rows(
+        self,
+        schema: TableSchema,
+        batch_size: int | Callable[[], int],
+        chunk: Chunk | None = None,
+        start_after: tuple | None = None,
+    ) -> AsyncIterator[Batch]:
+        """Keyset pagination on the primary key, as in PostgresAdapter."""
+        where, params = chunk.predicate() if chunk else ("TRUE", ())
+        where = with_row_filter(where, schema.row_filter)
+        cols = ", ".join(f'"{col.name}"' for col in schema.columns)
+        pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
+        placeholders = ", ".join(["%s"] * len(schema.primary_key))
+        last_key = start_after
+
+        while True:
+            limit = batch_size() if callable(batch_size) else batch_size
+            async with self.conn.cursor() as cur:
+                if last_key is None:
+                    await cur.execute(
+                        f'SELECT {cols} FROM "{schema.name}" WHERE {where} '
+                        f"ORDER BY {pk_cols} LIMIT %s",
+                        (*params, limit),
+                    )
+                else:
+                    await cur.execute(
+                        f'SELECT {cols} FROM "{schema.name}" WHERE {where} '
+                        f"AND ({pk_cols}) > ({placeholders}) "
+                        f"ORDER BY {pk_cols} LIMIT %s",
+                        (*params, *last_key, limit),
+                    )
+                columns = [desc.name for desc in cur.description]
+                batch = Batch(columns, await cur.fetchall(), schema)
+
+            if not batch:
+                return
+            yield batch
+            if len(batch) < limit:
+                return
+            last_key = batch.last_key(schema.primary_key)
+
+    async def insert_rows(self, table_name: str, batch: Batch):
+        """
+        Send every INSERT of a batch in pipeline mode: one network round trip
+        per batch instead of one per row.
+        """
+        if not batch:
+            return
+        cols = ", ".join(f'"{col}"' for col in batch.columns)
+        placeholders = ", ".join(["%s"] * len(batch.columns))
+        async with self.conn.pipeline():
+            async with self.conn.cursor() as cur:
+                await cur.executemany(
+                    f'INSERT INTO "{table_name}" ({cols}) VALUES ({placeholders})',
+                    batch.rows,
+                )
+
+    async def last_key(
+        self, schema: TableSchema, chunk: Chunk | None = None
+    ) -> tuple | None:
+        where, params = chunk.predicate() if chunk else ("TRUE", ())
+        pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
+        pk_desc = ", ".join(f'"{col}" DESC' for col in schema.primary_key)
+        async with self.conn.cursor() as cur:
+            await cur.execute(
+                f'SELECT {pk_cols} FROM "{schema.name}" WHERE {where} '
+                f"ORDER BY {pk_desc} LIMIT 1",
+                params,
+            )
+            row = await cur.fetchone()
+        return tuple(row) if row else None
@@ -0,0 +1,436 @@
+import datetime
+import decimal
+import json
+import sqlite3
+import uuid
+from typing import Any, Callable, Iterator, List
+
+from dbferry.core.adapters.base import BaseAdapter, literal_default, with_row_filter
+from dbferry.core.batch import Batch, Converter, Converters
+from dbferry.core.chunking import Chunk
+from dbferry.core.schema import (
+    ColumnSchema,
+    EnumType,
+    ForeignKeySchema,
+    IndexSchema,
+    TableSchema,
+    UniqueKeySchema,
+)
+
+# Postgres/ANSI type → SQLite storage class. Anything else is stored as TEXT,
+# which keeps values exact (numeric, timestamps, enums, uuid, json, ...).
+_SQLITE_TYPES = {
+    "smallint": "INTEGER",
+    "integer": "INTEGER",
+    "bigint": "INTEGER",
+    "boolean": "INTEGER",
+    "real": "REAL",
+    "double precision": "REAL",
+    "bytea": "BLOB",
+}
+
+# Declared types SQLite would give NUMERIC affinity that other engines know
+# by name; their values are stored as 0/1 or as text (ISO-8601, JSON, ...)
+_REPORTED_TYPES = {
+    "BOOLEAN": "boolean",
+    "BOOL": "boolean",
+    "DATE": "date",
+    "DATETIME": "timestamp",
+    "TIMESTAMP": "timestamp",
+    "TIME": "time",
+    "JSON": "json",
+    "UUID": "uuid",
+}
+
+
+# Settings used while a load transaction is open. The rollback journal stays
+# in memory rather than off, so a failed batch can still be rolled back.
+_BULK_PRAGMAS = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+}
+
+
+# Source types whose driver values sqlite3 binds as they are
+_NATIVE_TYPES = {
+    "smallint",
+    "integer",
+    "bigint",
+    "boolean",
+    "real",
+    "double precision",
+    "text",
+    "character varying",
+    "character",
+    "bytea",
+}
+
+_INTEGER_TYPES = {"smallint", "integer", "bigint"}
+
+
+def sqlite_type(pg_type: str) -> str:
+    return _SQLITE_TYPES.get(pg_type.lower(), "TEXT")
+
+
+def reported_type(decl: str) -> str:
+    """
+    Type reported to other engines for a SQLite declared type, following
+    SQLite's column affinity rules (https://sqlite.org/datatype3.html).
+    """
+    decl = decl.upper()
+    name = decl.split("(")[0].strip()
+    if name in _REPORTED_TYPES:
+        return _REPORTED_TYPES[name]
+    if "INT" in decl:
+        return "bigint"
+    if any(word in decl for word in ("CHAR", "CLOB", "TEXT")):
+        return "text"
+    if "BLOB" in decl or not decl.strip():
+        return "bytea"
+    if any(word in decl for word in ("REAL", "FLOA", "DOUB")):
+        return "double precision"
+    return "numeric"
+
+
+def sqlite_converter(column_type: str) -> Converter | None:
+    """None for columns sqlite3 takes as is, else sqlite_value."""
+    return None if column_type.lower() in _NATIVE_TYPES else sqlite_value
+
+
+def sqlite_value(value: Any) -> Any:
+    """Coerce a value from another engine into something sqlite3 can bind."""
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return value
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return (
+            f"{value.days} days {value.seconds} seconds "
+            f"{value.microseconds} microseconds"
+        )
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+class SQLiteAdapter(BaseAdapter):
+    """
+    SQLite file as a source or target. `database` is the file path.
+
+    Loads run in large transactions with the journal in memory and
+    synchronous writes off; indexes are created after the data is in.
+    Reads page through rowid ranges, so only one batch is in memory.
+    """
+
+    # SQLite allows one writer at a time
+    parallel_writes = False
+
+    def __init__(self, config):
+        super().__init__(config)
+        self._converters = Converters(sqlite_converter)
+
+    def connect(self):
+        self.conn = sqlite3.connect(
+            self.config.database, autocommit=True, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA busy_timeout = 60000;")
+        self.conn.execute("PRAGMA temp_store = MEMORY;")
+        self.conn.execute("PRAGMA cache_size = -262144;")  # 256 MB
+        self._pragmas = {
+            name: self.conn.execute(f"PRAGMA {name};").fetchone()[0]
+            for name in _BULK_PRAGMAS
+        }
+        return self.conn
+
+    def test_connection(self) -> bool:
+        conn = self.connect()
+        conn.execute("SELECT 1;").fetchone()
+        self.close()
+        return True
+
+    def close(self):
+        if getattr(self, "conn", None):
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+
+    def set_autocommit(self, enabled: bool):
+        """Entering a transaction switches to bulk-load settings; leaving restores them."""
+        if not enabled:
+            for name, value in _BULK_PRAGMAS.items():
+                self.conn.execute(f"PRAGMA {name} = {value};")
+            self.conn.autocommit = False
+        else:
+            self.conn.autocommit = True
+            for name, value in self._pragmas.items():
+                self.conn.execute(f"PRAGMA {name} = {value};")
+
+    # Schema ----------------------------------------------------------------
+
+    def list_tables(self) -> List[str]:
+        rows = self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%' ORDER BY name;"
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def get_table_schema(self, table_name: str) -> TableSchema:
+        columns, pk = [], []
+        for _, name, decl, notnull, default, pk_pos in self.conn.execute(
+            f'PRAGMA table_info("{table_name}");'
+        ):
+            reported = reported_type(decl or "")
+            columns.append(
+                ColumnSchema(
+                    name=name, type=reported, nullable=not notnull, default=default
+                )
+            )
+            if pk_pos:
+                pk.append((pk_pos, name))
+
+        unique_keys, indexes = [], []
+        for _, index, unique, origin, _ in self.conn.execute(
+            f'PRAGMA index_list("{table_name}");'
+        ):
+            if origin == "pk":
+                continue
+            cols = [r[2] for r in self.conn.execute(f'PRAGMA index_info("{index}");')]
+            if unique:
+                unique_keys.append(UniqueKeySchema(columns=cols))
+            elif origin == "c" and all(cols):
+                col_list = ", ".join(f'"{c}"' for c in cols)
+                indexes.append(
+                    IndexSchema(
+                        name=index,
+                        definition=f'CREATE INDEX "{index}" ON "{table_name}" ({col_list})',
+                    )
+                )
+
+        # One row per column: (id, seq, table, from, to, ...); a NULL `to`
+        # means the parent's primary key, which isn't carried over
+        fks: dict[int, ForeignKeySchema] = {}
+        for fk_id, _, ref_table, column, ref_column, *_ in self.conn.execute(
+            f'PRAGMA foreign_key_list("{table_name}");'
+        ):
+            fk = fks.setdefault(fk_id, ForeignKeySchema([], ref_table, []))
+            fk.columns.append(column)
+            fk.ref_columns.append(ref_column)
+        foreign_keys = [fk for fk in fks.values() if None not in fk.ref_columns]
+
+        return TableSchema(
+            name=table_name,
+            columns=columns,
+            primary_key=[name for _, name in sorted(pk)] or None,
+            unique_keys=unique_keys,
+            foreign_keys=foreign_keys,
+            indexes=indexes,
+        )
+
+    def create_table(
+        self,
+        schema: TableSchema,
+        constraints: bool = True,
+        enums: List[EnumType] | None = None,
+    ):
+        """
+        SQLite can't add keys to an existing table, so the primary key and
+        foreign keys are always declared here (foreign keys aren't enforced
+        unless the application turns them on). Unique and secondary indexes
+        wait for `build_indexes` unless `constraints` is set.
+        """
+        cols_sql = []
+        for col in schema.columns:
+            col_sql = f'"{col.name}" {sqlite_type(col.type)}'
+            if not col.nullable:
+                col_sql += " NOT NULL"
+            default = literal_default(col.default)
+            if default is not None:
+                col_sql += f" DEFAULT {default}"
+            cols_sql.append(col_sql)
+        if schema.primary_key:
+            pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
+            cols_sql.append(f"PRIMARY KEY ({pk_cols})")
+        for fk in schema.foreign_keys or []:
+            cols = ", ".join(f'"{c}"' for c in fk.columns)
+            ref_cols = ", ".join(f'"{c}"' for c in fk.ref_columns)
+            cols_sql.append(
+                f'FOREIGN KEY ({cols}) REFERENCES "{fk.ref_table}" ({ref_cols})'
+            )
+
+        try:
+            self.conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{schema.name}" ({", ".join(cols_sql)});'
+            )
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to create table {schema.name}: {e}")
+        if constraints:
+            self.build_indexes(schema)
+
+    def build_indexes(self, schema: TableSchema):
+        for uk in schema.unique_keys or []:
+            cols = ", ".join(f'"{c}"' for c in uk.columns)
+            name = f"{schema.name}_{'_'.join(uk.columns)}_key"
+            self.conn.execute(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS "{name}" ON "{schema.name}" ({cols});'
+            )
+        for index in schema.indexes or []:
+            # Only plain column lists translate across engines
+            columns = index.plain_columns()
+            if not columns:
+                continue
+            cols = ", ".join(f'"{c}"' for c in columns)
+            self.conn.execute(
+                f'CREATE INDEX IF NOT EXISTS "{index.name}" ON "{schema.name}" ({cols});'
+            )
+
+    def catalog_fingerprint(self) -> str | None:
+        return str(self.conn.execute("PRAGMA schema_version;").fetchone()[0])
+
+    # Rows ------------------------------------------------------------------
+
+    def fetch_rows(self, table_name: str, limit: int = 1000) -> Batch:
+        cur = self.conn.execute(f'SELECT * FROM "{table_name}" LIMIT ?;', (limit,))
+        columns = [desc[0] for desc in cur.description]
+        return Batch(columns, cur.fetchall())
+
+    def stream_rows(
+        self,
+        schema: TableSchema,
+        batch_size: int | Callable[[], int] = 1000,
+        chunk: Chunk | None = None,
+        start_after: tuple | None = None,
+    ) -> Iterator[Batch]:
+        """
+        Page through rowid ranges, in rowid order. Tables keyed on a single
+        integer column (usually the rowid itself), resumed loads and WITHOUT
+        ROWID tables page on the primary key instead.
+        """
+        where, params = self._predicate(chunk)
+        where = with_row_filter(where, schema.row_filter, paramstyle="qmark")
+        pk = schema.primary_key
+        types = {c.name: c.type.lower() for c in schema.columns}
+        on_pk = bool(pk) and (
+            start_after is not None
+            or (len(pk) == 1 and types[pk[0]] in _INTEGER_TYPES)
+            or not self._has_rowid(schema.name)
+        )
+        if start_after is not None and not pk:
+            raise ValueError(f"Table {schema.name} has no primary key to resume on")
+
+        names = [c.name for c in schema.columns]
+        keys = pk if on_pk else ["rowid"]
+        key_cols = ", ".join(f'"{k}"' for k in keys)
+        placeholders = ", ".join(["?"] * len(keys))
+        # The rowid rides along as a trailing column and is cut off again
+        columns = ", ".join([f'"{n}"' for n in names] + ([] if on_pk else ["rowid"]))
+        last_key = start_after
+        while True:
+            limit = batch_size() if callable(batch_size) else batch_size
+            if last_key is None:
+                sql = (
+                    f'SELECT {columns} FROM "{schema.name}" '
+                    f"WHERE {where} ORDER BY {key_cols} LIMIT ?;"
+                )
+                args = (*params, limit)
+            else:
+                sql = (
+                    f'SELECT {columns} FROM "{schema.name}" '
+                    f"WHERE {where} AND ({key_cols}) > ({placeholders}) "
+                    f"ORDER BY {key_cols} LIMIT ?;"
+                )
+                args = (*params, *last_key, limit)
+            fetched = self.conn.execute(sql, args).fetchall()
+            if not fetched:
+                return
+            if on_pk:
+                batch = Batch(names, fetched, schema)
+                yield batch
+                last_key = batch.last_key(pk)
+            else:
+                yield Batch(names, [row[:-1] for row in fetched], schema)
+                last_key = (fetched[-1][-1],)
+            if len(fetched) < limit:
+                return
+
+    def insert_rows(self, table_name: str, batch: Batch):
+        if not batch:
+            return 0
+        cols = ", ".join(f'"{col}"' for col in batch.columns)
+        placeholders = ", ".join(["?"] * len(batch.columns))
+        self.conn.executemany(
+            f'INSERT INTO "{table_name}" ({cols}) VALUES ({placeholders});',
+            batch.converted(self._converters(table_name, batch)),
+        )
+        return None
+
+    def upsert_rows(self, table_name: str, batch: Batch, key_columns):
+        if not batch:
+            return
+        columns = batch.columns
+        cols = ", ".join(f'"{col}"' for col in columns)
+        keys = ", ".join(f'"{col}"' for col in key_columns)
+        placeholders = ", ".join(["?"] * len(columns))
+        updates = [col for col in columns if col not in key_columns]
+        action = (
+            "DO UPDATE SET "
+            + ", ".join(f'"{col}" = excluded."{col}"' for col in updates)
+            if updates
+            else "DO NOTHING"
+        )
+        self.conn.executemany(
+            f'INSERT INTO "{table_name}" ({cols}) VALUES ({placeholders}) '
+            f"ON CONFLICT ({keys}) {action};",
+            batch.converted(self._converters(table_name, batch)),
+        )
+
+    def count_rows(self, table_name: str, where: str | None = None) -> int:
+        where = with_row_filter("TRUE", where, paramstyle="qmark")
+        try:
+            return self.conn.execute(
+                f'SELECT COUNT(*) FROM "{table_name}" WHERE {where};'
+            ).fetchone()[0]
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to count rows in {table_name}: {e}")
+
+    def last_key(self, schema: TableSchema, chunk: Chunk | None = None) -> tuple | None:
+        where, params = self._predicate(chunk)
+        pk_cols = ", ".join(f'"{col}"' for col in schema.primary_key)
+        pk_desc = ", ".join(f'"{col}" DESC' for col in schema.primary_key)
+        row = self.conn.execute(
+            f'SELECT {pk_cols} FROM "{schema.name}" WHERE {where} '
+            f"ORDER BY {pk_desc} LIMIT 1;",
+            params,
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def truncate_table(self, table_name: str) -> None:
+        # SQLite has no TRUNCATE; an unqualified DELETE is optimized into one
+        self.conn.execute(f'DELETE FROM "{table_name}";')
+
+    def drop_table(self, table_name: str) -> None:
+        self.conn.execute(f'DROP TABLE IF EXISTS "{table_name}";')
+        self.conn.commit()
+
+    def max_value(self, table_name: str, column: str) -> Any:
+        return self.conn.execute(
+            f'SELECT MAX("{column}") FROM "{table_name}";'
+        ).fetchone()[0]
+
+    def _has_rowid(self, table_name: str) -> bool:
+        try:
+            self.conn.execute(f'SELECT rowid FROM "{table_name}" LIMIT 0;')
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    @staticmethod
+    def _predicate(chunk: Chunk | None) -> tuple[str, tuple]:
+        if chunk is None:
+            return "TRUE", ()
+        where, params = Chunk(chunk.column, chunk.lower, chunk.upper).predicate()
+        return where.replace("%s", "?"), params
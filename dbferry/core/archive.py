@@ -0,0 +1,424 @@
+import base64
+import datetime
+import decimal
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+from dbferry.core.batch import Batch, Converters
+from dbferry.core.batching import BatchSizer
+from dbferry.core.checkpoint import IMPORT_JOURNAL_FILE, CheckpointJournal
+from dbferry.core.console import Printer as p
+from dbferry.core.config import MigrationConfig
+from dbferry.core.connection import ConnectionManager
+from dbferry.core.constraints import ConstraintBuilder
+from dbferry.core.migrate import resolve_table_order
+from dbferry.core.pipe import prefetch
+from dbferry.core.schema import ColumnSchema, EnumType, SchemaCache, TableSchema
+from dbferry.core.snapshot import SchemaSnapshot, table_schema_from_dict
+from dbferry.core.subset import apply_subsets
+
+MANIFEST_FILE = "manifest.json"
+
+# Bumped whenever the chunk or manifest format changes
+ARCHIVE_VERSION = 2
+
+# Marks a JSON object that stands for a non-JSON value
+_TAG = "$dbferry"
+
+# Target table recording loaded chunks, written in each chunk's own
+# transaction; dropped once an import finishes
+IMPORT_MARKERS = TableSchema(
+    name="dbferry_import_chunks",
+    columns=[ColumnSchema("file", "text", False)],
+    primary_key=["file"],
+)
+
+
+def encode_value(value: Any) -> Dict[str, Any]:
+    """json.dumps `default=` hook: tag values JSON has no type for."""
+    if isinstance(value, decimal.Decimal):
+        return {_TAG: "decimal", "v": str(value)}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {_TAG: "bytes", "v": base64.b64encode(value).decode()}
+    if isinstance(value, datetime.datetime):
+        return {_TAG: "datetime", "v": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {_TAG: "date", "v": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {_TAG: "time", "v": value.isoformat()}
+    if isinstance(value, datetime.timedelta):
+        return {_TAG: "interval", "v": [value.days, value.seconds, value.microseconds]}
+    if isinstance(value, uuid.UUID):
+        return {_TAG: "uuid", "v": str(value)}
+    raise TypeError(f"cannot export value of type {type(value).__name__}")
+
+
+_DECODERS = {
+    "decimal": decimal.Decimal,
+    "bytes": base64.b64decode,
+    "datetime": datetime.datetime.fromisoformat,
+    "date": datetime.date.fromisoformat,
+    "time": datetime.time.fromisoformat,
+    "interval": lambda v: datetime.timedelta(*v),
+    "uuid": uuid.UUID,
+}
+
+
+def decode_value(obj: Dict[str, Any]) -> Any:
+    """json.loads `object_hook=`: undo encode_value."""
+    if _TAG in obj:
+        return _DECODERS[obj[_TAG]](obj["v"])
+    return obj
+
+
+def write_chunk(path: str, rows: List[tuple], level: int) -> Dict[str, Any]:
+    """
+    Encode rows as gzip-compressed JSON lines and write them to `path`.
+    Runs in a worker process; returns the file's size and SHA-256.
+    """
+    lines = "\n".join(
+        json.dumps(row, default=encode_value, separators=(",", ":")) for row in rows
+    )
+    data = gzip.compress(lines.encode(), compresslevel=level, mtime=0)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return {"bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def read_chunk(path: Path, sha256: str) -> List[tuple]:
+    data = path.read_bytes()
+    if hashlib.sha256(data).hexdigest() != sha256:
+        raise ValueError(f"Checksum mismatch for {path}; the file is damaged")
+    lines = gzip.decompress(data).splitlines()
+    rows = json.loads(b"[" + b",".join(lines) + b"]", object_hook=decode_value)
+    return [tuple(row) for row in rows]
+
+
+def _picklable(column_type: str):
+    # psycopg2 hands out bytea as memoryview, which can't cross processes
+    if column_type.lower() == "bytea":
+        return lambda v: bytes(v) if type(v) is memoryview else v
+    return None
+
+
+def _file_name(table: str) -> str:
+    return re.sub(r"[^\w.-]", "_", table)
+
+
+def _write_manifest(path: Path, manifest: Dict[str, Any]):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, path)
+
+
+class ExportManager:
+    """
+    Stage the selected tables in a directory for an offline import.
+
+    Each table is streamed from the source and cut into chunks of
+    `chunk_rows` rows. Worker processes encode and gzip the chunks, one file
+    each. manifest.json, written last, lists the table schemas, enum types and
+    every chunk's row count and SHA-256.
+    """
+
+    def __init__(
+        self,
+        config: MigrationConfig,
+        out_dir: str | Path,
+        chunk_rows: int = 100_000,
+        workers: int | None = None,
+        level: int = 6,
+    ):
+        self.config = config
+        self.out_dir = Path(out_dir)
+        self.chunk_rows = chunk_rows
+        self.workers = workers or config.options.workers
+        self.level = level
+        self.conn_mgr = ConnectionManager()
+        self.source = self.conn_mgr.get_adapter(config.source)
+        self.schemas = SchemaCache(self.source)
+
+    def run(self) -> bool:
+        p.panel(title="Export", message=f"Exporting to {self.out_dir}...")
+        try:
+            self.conn_mgr.attach(self.source)
+            snapshot = None
+            if self.config.options.schema_snapshot:
+                snapshot = SchemaSnapshot(self.config.source)
+                snapshot.restore(self.schemas)
+
+            tables = self.schemas.select(self.config.options.tables)
+            if not tables:
+                p.warn("No tables found or specified. Nothing to export.")
+                return False
+            self.schemas.load(tables)
+            if snapshot:
+                snapshot.save(self.schemas)
+            schemas = apply_subsets(self.schemas, tables, self.config.options.subset)
+
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            manifest = {
+                "version": ARCHIVE_VERSION,
+                "created": time.time(),
+                "source": {
+                    "type": self.config.source.type,
+                    "database": self.config.source.database,
+                },
+                "enums": [asdict(e) for e in self.schemas.list_enum_types()],
+                "tables": {},
+            }
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                for name in resolve_table_order(schemas):
+                    if name in tables:
+                        manifest["tables"][name] = self.export_table(
+                            self.schemas.get(name), pool
+                        )
+            _write_manifest(self.out_dir / MANIFEST_FILE, manifest)
+        finally:
+            self.conn_mgr.close()
+
+        p.table(
+            title="Export Summary",
+            columns=["Table", "Rows", "Chunks", "Compressed bytes"],
+            rows=[
+                [
+                    name,
+                    str(entry["rows"]),
+                    str(len(entry["chunks"])),
+                    str(sum(c["bytes"] for c in entry["chunks"])),
+                ]
+                for name, entry in manifest["tables"].items()
+            ],
+        )
+        return True
+
+    def export_table(
+        self, schema: TableSchema, pool: ProcessPoolExecutor
+    ) -> Dict[str, Any]:
+        table_dir = self.out_dir / "tables" / _file_name(schema.name)
+        table_dir.mkdir(parents=True, exist_ok=True)
+        converters = Converters(_picklable)
+        columns = [c.name for c in schema.columns]
+        chunks: List[Dict[str, Any]] = []
+        pending: List[Future] = []
+
+        def submit(rows: List[tuple]):
+            name = f"{len(chunks):06d}.jsonl.gz"
+            chunks.append(
+                {"file": f"tables/{_file_name(schema.name)}/{name}", "rows": len(rows)}
+            )
+            pending.append(
+                pool.submit(write_chunk, str(table_dir / name), rows, self.level)
+            )
+            # Keep a bounded number of chunks in flight
+            while len([f for f in pending if not f.done()]) > self.workers * 2:
+                next(f for f in pending if not f.done()).result()
+
+        opts = self.config.options
+        sizer = BatchSizer.for_table(opts, self.source, schema.name)
+        batches = self.source.stream_rows(schema, batch_size=sizer or opts.batch_size)
+        buffer: List[tuple] = []
+        for batch in prefetch(batches, opts.queue_depth):
+            columns = batch.columns
+            buffer.extend(batch.converted(converters(schema.name, batch)))
+            while len(buffer) >= self.chunk_rows:
+                submit(buffer[: self.chunk_rows])
+                buffer = buffer[self.chunk_rows :]
+        if buffer:
+            submit(buffer)
+
+        for chunk, future in zip(chunks, pending):
+            chunk.update(future.result())
+        rows = sum(c["rows"] for c in chunks)
+        p.success(f"Exported {rows} rows of {schema.name} in {len(chunks)} chunk(s).")
+        return {
+            "schema": asdict(schema),
+            "columns": columns,
+            "rows": rows,
+            "chunks": chunks,
+        }
+
+
+class ImportManager:
+    """
+    Load a directory written by ExportManager into the configured target.
+
+    Chunks are verified against their checksum and loaded in parallel, each
+    in its own transaction through the target's bulk insert path. That
+    transaction also adds the chunk to IMPORT_MARKERS on the target, so a
+    crash can't leave a chunk loaded but unrecorded; `--resume` copies the
+    markers into the import's checkpoint journal and only loads what is left.
+    Keys, indexes and foreign keys are built at the end.
+    """
+
+    def __init__(
+        self,
+        config: MigrationConfig,
+        in_dir: str | Path,
+        resume: bool = False,
+        workers: int | None = None,
+    ):
+        self.config = config
+        self.in_dir = Path(in_dir)
+        self.resume = resume
+        self.workers = workers or config.options.workers
+        self.journal: CheckpointJournal | None = None
+        self.conn_mgr = ConnectionManager()
+
+    def run(self) -> bool:
+        manifest_path = self.in_dir / MANIFEST_FILE
+        if not manifest_path.exists():
+            raise FileNotFoundError(
+                f"No {MANIFEST_FILE} in {self.in_dir}; was the export completed?"
+            )
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("version") != ARCHIVE_VERSION:
+            raise ValueError(
+                f"Unsupported export format version {manifest.get('version')}"
+            )
+        tables = manifest["tables"]
+        schemas = {
+            name: table_schema_from_dict(entry["schema"])
+            for name, entry in tables.items()
+        }
+
+        p.panel(title="Import", message=f"Importing from {self.in_dir}...")
+        target = self.conn_mgr.acquire(self.config.target)
+        if not target.parallel_writes:
+            self.workers = 1
+        failed: set[str] = set()
+        try:
+            self.journal = CheckpointJournal.open(
+                self.config, resume=self.resume, path=IMPORT_JOURNAL_FILE
+            )
+            if self.resume:
+                p.info(f"Resuming from checkpoint journal {self.journal.path}")
+
+            enums = [EnumType(**e) for e in manifest["enums"]]
+            for enum in enums:
+                try:
+                    target.create_enum(enum)
+                    target.conn.commit()
+                except Exception as e:
+                    target.conn.rollback()
+                    p.warn(f"Skipping {enum.name} (maybe exists or invalid): {e}")
+
+            for name, schema in schemas.items():
+                if self.journal.table_status(name) == "done":
+                    continue
+                target.create_table(
+                    schema,
+                    constraints=not self.config.options.defer_constraints,
+                    enums=enums,
+                )
+                self.journal.mark_table(name, "running")
+            self._sync_markers(target, tables)
+            self.conn_mgr.release(target)
+
+            units = [
+                (name, chunk)
+                for name, entry in tables.items()
+                if self.journal.table_status(name) != "done"
+                for chunk in entry["chunks"]
+                if not self.journal.chunk_state(name, chunk["file"])[1]
+            ]
+            p.info(f"Loading {len(units)} chunk(s) on {self.workers} worker(s)...")
+            with ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="dbferry-import"
+            ) as pool:
+                futures = {
+                    pool.submit(
+                        self.load_chunk, schemas[name], tables[name]["columns"], chunk
+                    ): name
+                    for name, chunk in units
+                }
+                for future, name in futures.items():
+                    try:
+                        future.result()
+                    except Exception as e:
+                        failed.add(name)
+                        p.error(f"Failed to load a chunk of {name}: {e}")
+
+            for name in tables:
+                if name not in failed:
+                    self.journal.mark_table(name, "done")
+
+            builder = ConstraintBuilder(
+                connect=lambda: self.conn_mgr.acquire(self.config.target),
+                workers=self.workers,
+                maintenance_memory=self.config.options.maintenance_work_mem,
+                release=self.conn_mgr.release,
+            )
+            builder.run([s for n, s in schemas.items() if n not in failed])
+            failed.update(builder.failed)
+            if not failed:
+                target = self.conn_mgr.acquire(self.config.target)
+                target.drop_table(IMPORT_MARKERS.name)
+                self.conn_mgr.release(target)
+        finally:
+            self.conn_mgr.close()
+            if self.journal:
+                self.journal.close()
+
+        p.table(
+            title="Import Summary",
+            columns=["Table", "Rows", "Chunks", "Status"],
+            rows=[
+                [
+                    name,
+                    str(entry["rows"]),
+                    str(len(entry["chunks"])),
+                    "failed" if name in failed else "done",
+                ]
+                for name, entry in tables.items()
+            ],
+        )
+        return not failed
+
+    def _sync_markers(self, target, tables: Dict[str, Any]):
+        """
+        Create the marker table, or on resume mark the chunks it lists as
+        done in the journal: they committed even if the journal missed them.
+        """
+        if not self.resume:
+            target.drop_table(IMPORT_MARKERS.name)
+        target.create_table(IMPORT_MARKERS)
+        loaded = {
+            row[0] for batch in target.stream_rows(IMPORT_MARKERS) for row in batch.rows
+        }
+        for name, entry in tables.items():
+            for chunk in entry["chunks"]:
+                if chunk["file"] in loaded:
+                    self.journal.save_progress(
+                        name, chunk["file"], rows=chunk["rows"], done=True
+                    )
+
+    def load_chunk(self, schema: TableSchema, columns: List[str], chunk: Dict):
+        rows = read_chunk(self.in_dir / chunk["file"], chunk["sha256"])
+        target = self.conn_mgr.acquire(self.config.target)
+        batch_size = self.config.options.batch_size
+        target.set_autocommit(False)
+        try:
+            for start in range(0, len(rows), batch_size):
+                batch = Batch(columns, rows[start : start + batch_size], schema)
+                target.insert_rows(schema.name, batch)
+            marker = Batch(["file"], [(chunk["file"],)], IMPORT_MARKERS)
+            target.insert_rows(IMPORT_MARKERS.name, marker)
+            target.conn.commit()
+        finally:
+            # Releasing rolls back whatever wasn't committed
+            self.conn_mgr.release(target)
+        self.journal.save_progress(
+            schema.name, chunk["file"], rows=len(rows), done=True
+        )
@@ -0,0 +1,241 @@
+import asyncio
+from contextlib import aclosing, contextmanager
+from functools import partial
+
+from dbferry.core.adapters.postgres_async import AsyncPostgresAdapter
+from dbferry.core.batching import BatchSizer
+from dbferry.core.checkpoint import WHOLE_TABLE
+from dbferry.core.chunking import Chunk
+from dbferry.core.connection import AsyncConnectionPool
+from dbferry.core.console import Printer as p
+from dbferry.core.migrate import MigrationManager
+from dbferry.core.scheduler import AsyncTableScheduler, TableRun
+from dbferry.core.schema import TableSchema
+
+
+class AsyncMigrationManager(MigrationManager):
+    """
+    MigrationManager whose data phase runs on a single asyncio event loop
+    (`options.engine: asyncio`, Postgres → Postgres only).
+
+    Tables and chunks borrow psycopg 3 async connections from one bounded
+    pool per database (`pool_max_size`, or workers × chunk_workers), so
+    their network waits overlap without a thread per connection. Units with no committed rows are piped with async COPY in one
+    transaction; units resumed mid-way continue with keyset batches sent in
+    pipeline mode, one commit and checkpoint per batch, sized by BatchSizer
+    when `options.adaptive_batching` is on. Tables with values above
+    `options.wide_value_mb` go through the threaded engine, which streams
+    those values piece by piece.
+    Catalog queries and DDL still go through the blocking adapters, on pooled
+    connections in worker threads so they don't stall the loop.
+    """
+
+    def _run_tables(self, graph) -> dict[str, TableRun]:
+        if self.dry_run:
+            p.warn("Dry runs copy no data; the asyncio engine isn't used.")
+            return super()._run_tables(graph)
+        if not self.pipe_mode:
+            if self.config.options.pipe_mode:
+                p.warn("The asyncio engine needs Postgres on both ends; using threads.")
+            else:
+                p.warn(
+                    "The asyncio engine copies with COPY, which pipe_mode: false "
+                    "turns off; using threads."
+                )
+            return super()._run_tables(graph)
+
+        workers = self.config.options.workers
+        p.info(
+            f"Scheduling {len(graph)} tables on an event loop, {workers} at a time..."
+        )
+        scheduler = AsyncTableScheduler(
+            graph=graph, workers=workers, run_table=self.migrate_table_async
+        )
+        results = asyncio.run(self._run_scheduler(scheduler))
+        scheduler.report()
+        return results
+
+    async def _run_scheduler(self, scheduler: AsyncTableScheduler):
+        """Run the tables with async pools that live as long as the loop."""
+        options = self.config.options
+        self._apools = {}
+        for side, db_cfg in (
+            ("source", self.config.source),
+            ("target", self.config.target),
+        ):
+            size = db_cfg.pool_max_size or options.workers * options.chunk_workers
+            self._apools[side] = AsyncConnectionPool(
+                partial(AsyncPostgresAdapter, db_cfg), max_size=size
+            )
+        try:
+            return await scheduler.run_async()
+        finally:
+            for pool in self._apools.values():
+                await pool.close()
+
+    async def migrate_table_async(self, table: str) -> bool:
+        p.info(f"Migrating table [bold]{table}[/bold]...")
+
+        if self.journal.table_status(table) == "done":
+            p.info(f"Skipping {table}: already migrated in a previous run.")
+            return True
+
+        try:
+            schema = self.schemas.get(table)
+            # Catalog queries and DDL block, so they run on a thread
+            if await asyncio.to_thread(self._has_wide_values, schema):
+                p.warn(
+                    f"The asyncio engine copies values whole; migrating {table}, "
+                    "which has large values, on a thread instead."
+                )
+                return await asyncio.to_thread(self._migrate_table_threaded, table)
+            chunks = await asyncio.to_thread(self._prepare_table, schema)
+            if chunks:
+                p.info(f"Splitting {table} into {len(chunks)} ranges.")
+            limit = asyncio.Semaphore(self.config.options.chunk_workers)
+            with self.metrics.timer(table, "copy"):
+                async with asyncio.TaskGroup() as group:
+                    tasks = [
+                        group.create_task(self._copy_unit_async(schema, chunk, limit))
+                        for chunk in chunks or [None]
+                    ]
+            total = sum(task.result() for task in tasks)
+
+            if not total:
+                p.warn(f"No rows found in {table}. Skipping.")
+            else:
+                p.success(f"Migrated {total} rows for table {table}.")
+            self.journal.mark_table(table, "done")
+            return True
+
+        except Exception as e:
+            if isinstance(e, ExceptionGroup):
+                e = e.exceptions[0]
+            p.error(f"Failed to migrate table {table}: {e}")
+            return False
+
+    @contextmanager
+    def _pooled_adapters(self):
+        """Blocking source/target adapters from the pool, for use off the loop."""
+        source = self._connect(self.config.source)
+        target = self._connect(self.config.target)
+        try:
+            yield source, target
+        finally:
+            self.conn_mgr.release(source)
+            self.conn_mgr.release(target)
+
+    def _has_wide_values(self, schema: TableSchema) -> bool:
+        """Whether the threaded engine would stream some of the table's values."""
+        with self._pooled_adapters() as (source, target):
+            return bool(
+                self._defer_over(schema, source, target) and source.wide_columns(schema)
+            )
+
+    def _prepare_table(self, schema: TableSchema) -> list[Chunk]:
+        """Create the target table, seed its watermark and plan its chunks."""
+        with self._pooled_adapters() as (source, target):
+            with self.metrics.timer(schema.name, "ddl"):
+                target.create_table(
+                    schema,
+                    constraints=not self.config.options.defer_constraints,
+                    enums=self.schemas.list_enum_types(),
+                )
+            p.success(f"Created table {schema.name} on target (if not exists).")
+            self._seed_watermark(schema, source)
+            chunks = self._plan_chunks(schema, source)
+            if chunks:
+                self._restart_unkeyed_chunks(schema, chunks, target)
+            return chunks
+
+    def _migrate_table_threaded(self, table: str) -> bool:
+        """Run one table through the threaded engine, on pooled connections."""
+        with self._pooled_adapters() as (source, target):
+            return self.migrate_table(table, source, target)
+
+    def _batch_sizer(self, schema: TableSchema) -> BatchSizer | None:
+        with self._pooled_adapters() as (source, _):
+            return BatchSizer.for_table(self.config.options, source, schema.name)
+
+    async def _copy_unit_async(
+        self, schema: TableSchema, chunk: Chunk | None, limit: asyncio.Semaphore
+    ) -> int:
+        """Async counterpart of `_copy_unit`, with the same journal bookkeeping."""
+        unit = chunk.id if chunk else WHOLE_TABLE
+        started, done, rows = self.journal.chunk_state(schema.name, unit)
+        if done:
+            return rows
+
+        async with limit:
+            async with (
+                self._apools["source"].connection() as source,
+                self._apools["target"].connection() as target,
+            ):
+                start_after = None
+                if started and schema.primary_key and self._keyed(schema, chunk):
+                    start_after = await target.last_key(schema, chunk)
+                    if start_after is not None:
+                        p.info(f"Resuming {schema.name} after key {start_after}.")
+                else:
+                    rows = 0
+                    self.journal.save_progress(schema.name, unit, rows=0)
+
+                if start_after is None:
+                    rows += await self._pipe_unit(schema, source, target, chunk)
+                else:
+                    rows += await self._stream_unit(
+                        schema, source, target, chunk, start_after, rows
+                    )
+
+        self.journal.save_progress(schema.name, unit, rows=rows, done=True)
+        return rows
+
+    async def _pipe_unit(
+        self, schema: TableSchema, source, target, chunk: Chunk | None
+    ) -> int:
+        columns = [col.name for col in schema.columns]
+        async with target.conn.transaction():
+            rowcount, nbytes = await target.copy_in(
+                schema.name,
+                columns,
+                source.copy_out(schema.name, columns, chunk, schema.row_filter),
+            )
+        self.metrics.record(schema.name, rows=rowcount, bytes=nbytes)
+        p.info(f"Piped {nbytes} bytes for table {schema.name}.")
+        return rowcount
+
+    async def _stream_unit(
+        self,
+        schema: TableSchema,
+        source,
+        target,
+        chunk: Chunk | None,
+        start_after: tuple,
+        done_rows: int,
+    ) -> int:
+        unit = chunk.id if chunk else WHOLE_TABLE
+        total = 0
+        sizer = await asyncio.to_thread(self._batch_sizer, schema)
+        batches = source.stream_rows(
+            schema, sizer or self.config.options.batch_size, chunk, start_after
+        )
+        async with aclosing(batches):
+            while True:
+                with self.metrics.timer(schema.name, "fetch") as lap:
+                    batch = await anext(batches, None)
+                if batch is None:
+                    break
+                if sizer:
+                    sizer.observe("fetch", len(batch), lap.seconds)
+                with self.metrics.timer(schema.name, "write") as lap:
+                    async with target.conn.transaction():
+                        await target.insert_rows(schema.name, batch)
+                if sizer:
+                    sizer.observe("write", len(batch), lap.seconds)
+                self.metrics.record(schema.name, rows=len(batch), batches=1)
+                total += len(batch)
+                last_key = list(batch.last_key(schema.primary_key))
+                self.journal.save_progress(
+                    schema.name, unit, rows=done_rows + total, last_key=last_key
+                )
+        return total
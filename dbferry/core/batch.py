@@ -0,0 +1,84 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+from dbferry.core.schema import TableSchema
+
+Converter = Callable[[Any], Any]
+
+
+@dataclass(slots=True)
+class Batch:
+    """
+    Rows moving from one adapter to another: column names once, then every
+    row as the tuple the source driver returned, in that column order.
+    `schema` is the source table, which targets compile converters from.
+    `deferred` lists, per column, the primary keys of rows whose value was
+    too large to fetch inline and holds a placeholder until it is streamed.
+    """
+
+    columns: List[str]
+    rows: List[tuple]
+    schema: TableSchema | None = None
+    deferred: Dict[str, List[tuple]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self.rows)
+
+    def types(self) -> List[str]:
+        """Source type of each column; "" when unknown."""
+        types = {c.name: c.type for c in self.schema.columns} if self.schema else {}
+        return [types.get(name, "") for name in self.columns]
+
+    def last_key(self, key_columns: Sequence[str]) -> tuple:
+        """Values of `key_columns` in the last row, e.g. the key to resume after."""
+        last = self.rows[-1]
+        return tuple(last[self.columns.index(col)] for col in key_columns)
+
+    def converted(self, converters: Sequence[Converter | None]) -> List[tuple]:
+        """Rows with each value passed through its column's converter, if any."""
+        if not any(converters):
+            return self.rows
+        return [
+            tuple(c(v) if c else v for c, v in zip(converters, row))
+            for row in self.rows
+        ]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [dict(zip(self.columns, row)) for row in self.rows]
+
+
+class Converters:
+    """
+    Per-column converters for one adapter, compiled from the source column
+    types the first time a table's batches arrive, then reused.
+    `compile(type)` returns a converter, or None to pass values through.
+    """
+
+    def __init__(self, compile: Callable[[str], Converter | None]):
+        self.compile = compile
+        self._compiled: Dict[tuple, List[Converter | None]] = {}
+
+    def __call__(self, table_name: str, batch: Batch) -> List[Converter | None]:
+        key = (table_name, tuple(batch.columns))
+        converters = self._compiled.get(key)
+        if converters is None:
+            converters = [self.compile(t) for t in batch.types()]
+            self._compiled[key] = converters
+        return converters
+
+
+def typed(types: tuple[type, ...], fast: Converter, fallback: Converter) -> Converter:
+    """
+    Converter taking `fast` for values of exactly the expected Python types
+    and `fallback` for anything else (None, or an unusual driver type).
+    """
+
+    def convert(value: Any) -> Any:
+        if type(value) in types:
+            return fast(value)
+        return fallback(value)
+
+    return convert
@@ -0,0 +1,86 @@
+import threading
+from typing import Any
+
+from dbferry.core.config import OptionsConfig
+
+
+class BatchSizer:
+    """
+    Rows per batch for one streamed copy, re-tuned after every batch.
+
+    Starts from the table's average row width, sized so the first batch
+    holds about START_BYTES. Fetch and write times per row are then tracked
+    separately as moving averages. Each batch is sized to take
+    `target_seconds` on the slower of the two sides, since reads and writes
+    overlap. A batch never holds more than `max_bytes`, and the size changes
+    by at most MAX_STEP per batch so one outlier can't swing it wildly.
+
+    Instances are callable and return the current size, which is what
+    adapters' `stream_rows` accept in place of a fixed `batch_size`.
+    """
+
+    MIN_ROWS = 1
+    MAX_ROWS = 100_000
+    START_BYTES = 4 * 1024**2
+    MAX_STEP = 2.0
+    SMOOTHING = 0.3  # weight of the newest observation
+
+    def __init__(
+        self,
+        target_seconds: float,
+        max_bytes: int,
+        initial: int = 1000,
+        row_bytes: float | None = None,
+    ):
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self.row_bytes = row_bytes
+        self.row_seconds: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        if row_bytes:
+            initial = min(self.START_BYTES, max_bytes) / row_bytes
+        self.size = self._clamp(initial)
+
+    @classmethod
+    def for_table(
+        cls, options: OptionsConfig, source: Any, table: str
+    ) -> "BatchSizer | None":
+        """Sizer configured from `options`, or None to use the fixed batch_size."""
+        if not options.adaptive_batching:
+            return None
+        return cls(
+            target_seconds=options.batch_target_ms / 1000,
+            max_bytes=options.batch_max_mb * 1024**2,
+            initial=options.batch_size,
+            row_bytes=source.avg_row_width(table),
+        )
+
+    def __call__(self) -> int:
+        return self.size
+
+    def observe(self, kind: str, rows: int, seconds: float, nbytes: int | None = None):
+        """Feed back one batch: `kind` is "fetch" or "write"."""
+        if rows <= 0:
+            return
+        with self._lock:
+            self.row_seconds[kind] = self._smooth(
+                self.row_seconds.get(kind), seconds / rows
+            )
+            if nbytes:
+                self.row_bytes = self._smooth(self.row_bytes, nbytes / rows)
+
+            slowest = max(self.row_seconds.values())
+            want = self.target_seconds / slowest if slowest > 0 else self.MAX_ROWS
+            if self.row_bytes:
+                want = min(want, self.max_bytes / self.row_bytes)
+            want = min(max(want, self.size / self.MAX_STEP), self.size * self.MAX_STEP)
+            self.size = self._clamp(want)
+
+    def _smooth(self, previous: float | None, value: float) -> float:
+        if previous is None:
+            return value
+        return self.SMOOTHING * value + (1 - self.SMOOTHING) * previous
+
+    def _clamp(self, rows: float) -> int:
+        return int(min(max(rows, self.MIN_ROWS), self.MAX_ROWS))
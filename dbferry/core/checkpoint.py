@@ -0,0 +1,251 @@
+import json
+import sqlite3
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, List
+
+from dbferry.core.chunking import Chunk
+from dbferry.core.config import MigrationConfig
+from dbferry.core.logger import LOG_FILE
+
+JOURNAL_FILE = LOG_FILE.with_name("dbferry.checkpoint.db")
+# `dbferry import` keeps its own, so it never touches migrate's progress or
+# the sync watermarks
+IMPORT_JOURNAL_FILE = LOG_FILE.with_name("dbferry.import.checkpoint.db")
+
+# Chunk id used for tables that are copied as a single unit
+WHOLE_TABLE = "*"
+
+
+class CheckpointJournal:
+    """
+    Durable record of migration progress, stored in SQLite next to dbferry.log.
+    Tracks per table whether it finished, the chunk plan used to split it, and
+    per chunk the last committed key and row count. Also holds the watermarks
+    used by `dbferry sync`.
+    """
+
+    def __init__(self, path: str | Path = JOURNAL_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL;")
+        self._db.execute("PRAGMA synchronous=FULL;")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS tables (
+                name TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                plan TEXT
+            );
+            CREATE TABLE IF NOT EXISTS watermarks (
+                table_name TEXT PRIMARY KEY,
+                column_name TEXT NOT NULL,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                table_name TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                last_key TEXT,
+                rows INTEGER NOT NULL DEFAULT 0,
+                done INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (table_name, chunk_id)
+            );
+            """
+        )
+
+    @staticmethod
+    def run_key(config: MigrationConfig) -> str:
+        """Identifies which source/target pair a journal belongs to."""
+        return json.dumps(
+            [
+                [db.type, db.host, db.port, db.database]
+                for db in (config.source, config.target)
+            ]
+        )
+
+    @classmethod
+    def open(
+        cls,
+        config: MigrationConfig,
+        resume: bool,
+        start_over: str = "rerun without --resume",
+        path: str | Path = JOURNAL_FILE,
+    ) -> "CheckpointJournal":
+        """
+        Open the journal, starting afresh unless resuming the same run.
+        `start_over` tells the user how to leave a journal of another
+        source/target pair behind.
+        """
+        journal = cls(path)
+        key = cls.run_key(config)
+        recorded = journal._get_meta("run_key")
+        if resume and recorded and recorded != key:
+            raise ValueError(
+                f"Checkpoint journal {journal.path} belongs to a different "
+                f"source/target pair; {start_over} to start over."
+            )
+        if not resume:
+            journal.reset(watermarks=bool(recorded) and recorded != key)
+        journal._set_meta("run_key", key)
+        return journal
+
+    def reset(self, watermarks: bool = False):
+        """
+        Forget table and chunk progress. Sync watermarks are kept unless
+        `watermarks` is set, e.g. because they belong to another source/target
+        pair; a run clears those of the tables it copies again.
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM tables;")
+            self._db.execute("DELETE FROM chunks;")
+            if watermarks:
+                self._db.execute("DELETE FROM watermarks;")
+
+    def close(self):
+        self._db.close()
+
+    # Tables --------------------------------------------------------------
+
+    def table_status(self, table: str) -> str | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status FROM tables WHERE name = ?;", (table,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def mark_table(self, table: str, status: str):
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO tables (name, status) VALUES (?, ?)
+                ON CONFLICT (name) DO UPDATE SET status = excluded.status;
+                """,
+                (table, status),
+            )
+
+    def save_plan(self, table: str, chunks: List[Chunk]):
+        plan = json.dumps([asdict(c) for c in chunks], default=str)
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO tables (name, status, plan) VALUES (?, 'started', ?)
+                ON CONFLICT (name) DO UPDATE SET plan = excluded.plan;
+                """,
+                (table, plan),
+            )
+
+    def load_plan(self, table: str) -> List[Chunk] | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT plan FROM tables WHERE name = ?;", (table,)
+            ).fetchone()
+        if not row or row[0] is None:
+            return None
+        return [Chunk(**c) for c in json.loads(row[0])]
+
+    # Chunks --------------------------------------------------------------
+
+    def chunk_state(self, table: str, chunk_id: str) -> tuple[bool, bool, int]:
+        """Return (started, done, rows) for a chunk."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT done, rows FROM chunks WHERE table_name = ? AND chunk_id = ?;",
+                (table, chunk_id),
+            ).fetchone()
+        if not row:
+            return False, False, 0
+        return True, bool(row[0]), row[1]
+
+    def clear_chunks(self, table: str):
+        """Forget a table's chunk progress, keeping its plan."""
+        with self._lock:
+            self._db.execute("DELETE FROM chunks WHERE table_name = ?;", (table,))
+
+    def save_progress(
+        self,
+        table: str,
+        chunk_id: str,
+        rows: int,
+        last_key: Any = None,
+        done: bool = False,
+    ):
+        """Record a committed high-water mark for a chunk."""
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO chunks (table_name, chunk_id, last_key, rows, done)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (table_name, chunk_id) DO UPDATE SET
+                    last_key = COALESCE(excluded.last_key, chunks.last_key),
+                    rows = excluded.rows,
+                    done = excluded.done;
+                """,
+                (
+                    table,
+                    chunk_id,
+                    json.dumps(last_key, default=str) if last_key else None,
+                    rows,
+                    int(done),
+                ),
+            )
+
+    # Sync watermarks ----------------------------------------------------
+
+    def get_watermark(self, table: str, column: str) -> Any:
+        """Last synced watermark for a table, or None if it never synced on `column`."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT column_name, value FROM watermarks WHERE table_name = ?;",
+                (table,),
+            ).fetchone()
+        if not row or row[0] != column:
+            return None
+        return json.loads(row[1])
+
+    def clear_watermarks(self, tables: List[str]):
+        """Forget the watermarks of tables that are about to be copied afresh."""
+        with self._lock:
+            self._db.executemany(
+                "DELETE FROM watermarks WHERE table_name = ?;",
+                [(table,) for table in tables],
+            )
+
+    def save_watermark(self, table: str, column: str, value: Any):
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO watermarks (table_name, column_name, value)
+                VALUES (?, ?, ?)
+                ON CONFLICT (table_name) DO UPDATE SET
+                    column_name = excluded.column_name,
+                    value = excluded.value;
+                """,
+                (table, column, json.dumps(value, default=str)),
+            )
+
+    # Meta ----------------------------------------------------------------
+
+    def _get_meta(self, key: str) -> str | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM meta WHERE key = ?;", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO meta (key, value) VALUES (?, ?)
+                ON CONFLICT (key) DO UPDATE SET value = excluded.value;
+                """,
+                (key, value),
+            )
@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from typing import Any, List
+
+
+@dataclass
+class Chunk:
+    """
+    A disjoint slice of a table: `lower <= column < upper`.
+    A bound of None means the range is open on that side.
+    """
+
+    column: str
+    lower: Any = None
+    upper: Any = None
+    cast: str | None = None
+
+    @property
+    def id(self) -> str:
+        return f"{self.column}:{self.lower}:{self.upper}"
+
+    def predicate(self) -> tuple[str, tuple]:
+        """SQL condition selecting this chunk, with its parameters."""
+        col = f'"{self.column}"'
+        placeholder = f"%s::{self.cast}" if self.cast else "%s"
+        clauses, params = [], []
+        if self.lower is not None:
+            clauses.append(f"{col} >= {placeholder}")
+            params.append(self.lower)
+        if self.upper is not None:
+            clauses.append(f"{col} < {placeholder}")
+            params.append(self.upper)
+        return " AND ".join(clauses) or "TRUE", tuple(params)
+
+    @staticmethod
+    def from_bounds(
+        column: str, bounds: List[Any], cast: str | None = None
+    ) -> List["Chunk"]:
+        """Turn sorted split points into contiguous chunks covering the whole key space."""
+        edges = [None, *bounds, None]
+        return [
+            Chunk(column=column, lower=lo, upper=hi, cast=cast)
+            for lo, hi in zip(edges, edges[1:])
+        ]
@@ -1,6 +1,5 @@
 from dataclasses import dataclass, field
 from pathlib import Path
-import yaml
 from typing import List, Optional, Dict, Any
 
 from dbferry.core.console import Printer as p
@@ -20,6 +19,9 @@ class DBConfig:
     user: str
     password: str
     sslmode: str
+    # Connections opened up front / at most (None: as many as needed)
+    pool_min_size: int = 1
+    pool_max_size: Optional[int] = None
 
     def normalized(self):
         """default ports depending on DB type."""
@@ -33,10 +35,42 @@ class DBConfig:
         return self
 
 
+@dataclass
+class TableSubset:
+    """
+    Part of a source table to copy (options.subset): rows matching `where`,
+    and either only `columns` or every column but `exclude_columns`.
+    """
+
+    where: Optional[str] = None
+    columns: Optional[List[str]] = None
+    exclude_columns: List[str] = field(default_factory=list)
+
+
 @dataclass
 class OptionsConfig:
     tables: List[str] = field(default_factory=lambda: ["*"])
     verify_after_migration: bool = True
+    batch_size: int = 1000
+    adaptive_batching: bool = True
+    batch_target_ms: int = 500
+    batch_max_mb: int = 64
+    pipe_mode: bool = True
+    pipe_buffer_mb: int = 8
+    # Values larger than this are streamed in pieces of this size (0: never)
+    wide_value_mb: int = 16
+    large_objects: bool = True
+    queue_depth: int = 4
+    workers: int = 1
+    chunk_workers: int = 4
+    split_threshold_mb: int = 1024
+    schema_snapshot: bool = True
+    defer_constraints: bool = True
+    maintenance_work_mem: str = "512MB"
+    watermarks: Dict[str, str] = field(default_factory=dict)
+    subset: Dict[str, TableSubset] = field(default_factory=dict)
+    engine: str = "threads"  # or "asyncio"
+    prometheus_file: Optional[str] = None
 
 
 @dataclass
@@ -62,6 +96,8 @@ class ConfigLoader:
             raise FileNotFoundError(path)
 
         try:
+            import yaml
+
             data = yaml.safe_load(path.read_text())
         except Exception as e:
             p.error(f"Failed to parse YAML: {e}")
@@ -76,6 +112,25 @@ class ConfigLoader:
             opts = OptionsConfig(
                 tables=options.get("tables", ["*"]),
                 verify_after_migration=options.get("verify_after_migration", True),
+                batch_size=options.get("batch_size", 1000),
+                adaptive_batching=options.get("adaptive_batching", True),
+                batch_target_ms=options.get("batch_target_ms", 500),
+                batch_max_mb=options.get("batch_max_mb", 64),
+                pipe_mode=options.get("pipe_mode", True),
+                pipe_buffer_mb=options.get("pipe_buffer_mb", 8),
+                wide_value_mb=options.get("wide_value_mb", 16),
+                large_objects=options.get("large_objects", True),
+                queue_depth=options.get("queue_depth", 4),
+                workers=options.get("workers", 1),
+                chunk_workers=options.get("chunk_workers", 4),
+                split_threshold_mb=options.get("split_threshold_mb", 1024),
+                schema_snapshot=options.get("schema_snapshot", True),
+                defer_constraints=options.get("defer_constraints", True),
+                maintenance_work_mem=options.get("maintenance_work_mem", "512MB"),
+                watermarks=options.get("watermarks") or {},
+                subset=ConfigLoader._parse_subsets(options.get("subset") or {}),
+                engine=options.get("engine", "threads"),
+                prometheus_file=options.get("prometheus_file"),
             )
 
             return MigrationConfig(
@@ -88,22 +143,49 @@ class ConfigLoader:
             p.error(f"Invalid configuration: {e}")
             raise
 
+    @staticmethod
+    def _parse_subsets(block: Dict[str, Any]) -> Dict[str, TableSubset]:
+        subsets = {}
+        for table, spec in block.items():
+            spec = spec or {}
+            unknown = set(spec) - {"where", "columns", "exclude_columns"}
+            if unknown:
+                raise ValueError(
+                    f"Unknown keys in subset.{table}: {', '.join(sorted(unknown))}"
+                )
+            if spec.get("columns") and spec.get("exclude_columns"):
+                raise ValueError(
+                    f"subset.{table}: use either columns or exclude_columns, not both"
+                )
+            subsets[table] = TableSubset(
+                where=spec.get("where"),
+                columns=spec.get("columns"),
+                exclude_columns=spec.get("exclude_columns") or [],
+            )
+        return subsets
+
     @staticmethod
     def _validate_db_block(block: Dict[str, Any], label: str) -> DBConfig:
         if not block:
             raise ValueError(f"Missing '{label}' section in config")
 
         required = ["type", "host", "database", "user", "password"]
+        sqlite = str(block.get("type", "")).lower() == "sqlite"
+        if sqlite:
+            # A file path is all SQLite needs
+            required = ["type", "database"]
         missing = [k for k in required if k not in block]
         if missing:
             raise ValueError(f"Missing keys in {label}: {', '.join(missing)}")
 
         return DBConfig(
             type=block["type"],
-            host=block["host"],
+            host=block.get("host", ""),
             port=block.get("port"),
             database=block["database"],
-            user=block["user"],
-            password=block["password"],
-            sslmode=block["sslmode"],
+            user=block.get("user", ""),
+            password=block.get("password", ""),
+            sslmode=(block.get("sslmode", "disable") if sqlite else block["sslmode"]),
+            pool_min_size=block.get("pool_min_size", 1),
+            pool_max_size=block.get("pool_max_size"),
         )
@@ -1,21 +1,309 @@
 # Registry of adapters
+import asyncio
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from importlib.metadata import entry_points
+from typing import Callable
+
 from dbferry.core.console import Printer as p
-from dbferry.core.adapters.postgres import PostgresAdapter
 from dbferry.core.config import DBConfig, MigrationConfig
 
+# Entry point group third-party packages register adapters under, e.g.
+#   [project.entry-points."dbferry.adapters"]
+#   clickhouse = "dbferry_clickhouse:ClickHouseAdapter"
+ADAPTER_GROUP = "dbferry.adapters"
+
+# Built-in adapters, also registered under ADAPTER_GROUP in pyproject.toml.
+# Listed here so they resolve without scanning installed package metadata.
+BUILTIN_ADAPTERS = {
+    "postgres": "dbferry.core.adapters.postgres:PostgresAdapter",
+    "mysql": "dbferry.core.adapters.mysql:MySQLAdapter",
+    "sqlite": "dbferry.core.adapters.sqlite:SQLiteAdapter",
+}
+
+_loaded: dict[str, type] = {}
+_registry_lock = threading.Lock()
+
+
+def adapter_class(db_type: str) -> type:
+    """
+    The adapter class for a database type, imported on first use so a run
+    only loads the drivers its config needs.
+    """
+    db_type = db_type.lower()
+    with _registry_lock:
+        if db_type not in _loaded:
+            spec = BUILTIN_ADAPTERS.get(db_type)
+            if spec is None:
+                found = entry_points(group=ADAPTER_GROUP, name=db_type)
+                if not found:
+                    raise ValueError(
+                        f"Unsupported database type: {db_type} "
+                        f"(available: {', '.join(available_adapters())})"
+                    )
+                spec = next(iter(found)).value
+            module, _, attr = spec.partition(":")
+            _loaded[db_type] = getattr(importlib.import_module(module), attr)
+        return _loaded[db_type]
+
+
+def available_adapters() -> list[str]:
+    """Database types that have an adapter, built in or from a plugin."""
+    names = set(BUILTIN_ADAPTERS)
+    names.update(ep.name for ep in entry_points(group=ADAPTER_GROUP))
+    return sorted(names)
+
+
+# Idle connections older than this are pinged before being handed out again
+HEALTH_CHECK_AFTER_S = 30.0
+
+# How long `acquire` waits for a free connection once a pool is at max size
+ACQUIRE_TIMEOUT_S = 300.0
+
+
+class ConnectionPool:
+    """
+    Connected adapters for one database, reused across a run's phases.
+
+    `acquire` hands out an idle adapter, pinging it first if it sat idle for
+    a while, or opens a new one while the pool is below `max_size` (None
+    means no limit). `release` ends any open transaction and keeps the
+    adapter for the next caller. An adapter's session setup runs in its
+    `connect()`, so it happens once per connection.
+    """
+
+    def __init__(self, db_cfg: DBConfig):
+        self.db_cfg = db_cfg
+        self.min_size = max(1, db_cfg.pool_min_size)
+        self.max_size = db_cfg.pool_max_size
+        self._idle: list[tuple] = []  # (adapter, released at)
+        self._all: list = []
+        self._warmed = False
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        deadline = time.monotonic() + ACQUIRE_TIMEOUT_S
+        with self._cond:
+            warm = 0
+            if not self._warmed:
+                self._warmed = True
+                warm = self._reserve_warm()
+        if warm:
+            self._warm(warm)
+
+        while True:
+            with self._cond:
+                while not self._idle and not self._has_room():
+                    if not self._cond.wait(deadline - time.monotonic()):
+                        raise RuntimeError(
+                            f"No free {self.db_cfg.type} connection after "
+                            f"{ACQUIRE_TIMEOUT_S:.0f}s (pool_max_size={self.max_size})"
+                        )
+                if self._idle:
+                    adapter, since = self._idle.pop()
+                else:
+                    self._all.append(None)  # reserve the slot while connecting
+                    adapter = since = None
+
+            if adapter is None:
+                return self._open_reserved()
+            if time.monotonic() - since < HEALTH_CHECK_AFTER_S or adapter.ping():
+                return adapter
+            p.warn(f"Dropping a dead {self.db_cfg.type} connection from the pool.")
+            self._discard(adapter)
+
+    def attach(self, adapter):
+        """Connect an adapter made by `get_adapter` and count it as handed out."""
+        adapter.connect()
+        with self._cond:
+            self._all.append(adapter)
+        return adapter
+
+    def release(self, adapter):
+        try:
+            adapter.reset()
+        except Exception:
+            self._discard(adapter)
+            return
+        with self._cond:
+            self._idle.append((adapter, time.monotonic()))
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            adapters = [a for a in self._all if a is not None]
+            self._idle.clear()
+            self._all.clear()
+        for adapter in adapters:
+            adapter.close()
 
-ADAPTERS = {"postgres": PostgresAdapter}
+    def _has_room(self) -> bool:
+        return self.max_size is None or len(self._all) < self.max_size
+
+    def _open_reserved(self):
+        try:
+            adapter = ConnectionManager.get_adapter(self.db_cfg)
+            adapter.connect()
+        except Exception:
+            with self._cond:
+                self._all.remove(None)
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._all[self._all.index(None)] = adapter
+        return adapter
+
+    def _reserve_warm(self) -> int:
+        """Reserve slots for the connections `_warm` opens; call under the lock."""
+        count = self.min_size - len(self._all)
+        if self.max_size is not None:
+            count = min(count, self.max_size - len(self._all))
+        if count <= 1:
+            return 0
+        self._all.extend([None] * count)
+        return count
+
+    def _warm(self, count: int):
+        """
+        Open `count` reserved connections at once, so their handshakes
+        overlap. Runs outside the lock; callers wait for the idle ones.
+        """
+
+        def open_one():
+            adapter = ConnectionManager.get_adapter(self.db_cfg)
+            adapter.connect()
+            return adapter
+
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            futures = [pool.submit(open_one) for _ in range(count)]
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        now = time.monotonic()
+        with self._cond:
+            for future in futures:
+                if future.exception() is None:
+                    self._all[self._all.index(None)] = future.result()
+                    self._idle.append((future.result(), now))
+                else:
+                    self._all.remove(None)
+            self._cond.notify_all()
+        if len(errors) == count:
+            raise errors[0]
+        if errors:
+            p.warn(
+                f"Opened {count - len(errors)} of {count} {self.db_cfg.type} "
+                f"connections up front: {errors[0]}"
+            )
+
+    def _discard(self, adapter):
+        adapter.close()
+        with self._cond:
+            if adapter in self._all:
+                self._all.remove(adapter)
+            self._cond.notify()
+
+
+class AsyncConnectionPool:
+    """
+    ConnectionPool's counterpart for the asyncio engine: at most `max_size`
+    async adapters made by `make`, opened on demand. `connection()` waits
+    while all of them are busy and hands the adapter back afterwards; one
+    that can't be reset is closed and its slot freed.
+    """
+
+    def __init__(self, make: Callable, max_size: int):
+        self.make = make
+        self.max_size = max_size
+        self._idle: list = []
+        self._size = 0
+        self._cond = asyncio.Condition()
+
+    @asynccontextmanager
+    async def connection(self):
+        adapter = await self.acquire()
+        try:
+            yield adapter
+        finally:
+            await self.release(adapter)
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._idle or self._size < self.max_size)
+            if self._idle:
+                return self._idle.pop()
+            self._size += 1  # reserve the slot while connecting
+        try:
+            adapter = self.make()
+            await adapter.connect()
+            return adapter
+        except BaseException:
+            await self._free_slot()
+            raise
+
+    async def release(self, adapter):
+        try:
+            await adapter.reset()
+        except Exception:
+            await adapter.close()
+            await self._free_slot()
+            return
+        async with self._cond:
+            self._idle.append(adapter)
+            self._cond.notify()
+
+    async def close(self):
+        async with self._cond:
+            adapters, self._idle = self._idle, []
+            self._size -= len(adapters)
+        for adapter in adapters:
+            await adapter.close()
+
+    async def _free_slot(self):
+        async with self._cond:
+            self._size -= 1
+            self._cond.notify()
 
 
 class ConnectionManager:
+    """
+    Adapter factory. Instances also keep a connection pool per database
+    (see ConnectionPool), so every phase of a run reuses the same
+    connections; `close()` shuts them all at the end.
+    """
+
+    def __init__(self):
+        self._pools: dict[tuple, ConnectionPool] = {}
+        self._lock = threading.Lock()
 
     @staticmethod
     def get_adapter(db_cfg: DBConfig):
-        db_type = db_cfg.type.lower()
-        adapter_cls = ADAPTERS.get(db_type)
-        if not adapter_cls:
-            raise ValueError(f"Unsupported database type: {db_type}")
-        return adapter_cls(db_cfg)
+        return adapter_class(db_cfg.type)(db_cfg)
+
+    def pool(self, db_cfg: DBConfig) -> ConnectionPool:
+        key = (db_cfg.type, db_cfg.host, db_cfg.port, db_cfg.database, db_cfg.user)
+        with self._lock:
+            if key not in self._pools:
+                self._pools[key] = ConnectionPool(db_cfg)
+            return self._pools[key]
+
+    def acquire(self, db_cfg: DBConfig):
+        """A connected adapter from the database's pool; hand it back with `release`."""
+        return self.pool(db_cfg).acquire()
+
+    def attach(self, adapter):
+        """Connect an existing adapter and let the pool close it at the end."""
+        return self.pool(adapter.config).attach(adapter)
+
+    def release(self, adapter):
+        self.pool(adapter.config).release(adapter)
+
+    def close(self):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
 
     @staticmethod
     def test_all(cfg: MigrationConfig):
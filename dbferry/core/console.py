@@ -1,9 +1,14 @@
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
+from functools import lru_cache
+
 from dbferry.core.logger import logger
 
-console = Console()
+
+@lru_cache(maxsize=None)
+def get_console():
+    """The shared rich Console, created (and rich imported) on first output."""
+    from rich.console import Console
+
+    return Console()
 
 
 class Printer:
@@ -11,34 +16,38 @@ class Printer:
 
     @staticmethod
     def info(message: str):
-        console.print(f"[cyan]{message}[/cyan]")
+        get_console().print(f"[cyan]{message}[/cyan]")
         logger.info(message)
 
     @staticmethod
     def success(message: str):
-        console.print(f"[green]{message}[/green]")
+        get_console().print(f"[green]{message}[/green]")
         logger.info(message)
 
     @staticmethod
     def warn(message: str):
-        console.print(f"[yellow]{message}[/yellow]")
+        get_console().print(f"[yellow]{message}[/yellow]")
         logger.warning(message)
 
     @staticmethod
     def error(message: str):
-        console.print(f"[red]{message}[/red]")
+        get_console().print(f"[red]{message}[/red]")
         logger.error(message)
 
     @staticmethod
     def panel(message: str, title: str = "", style: str = "blue"):
-        console.print(Panel.fit(message, title=title, border_style=style))
+        from rich.panel import Panel
+
+        get_console().print(Panel.fit(message, title=title, border_style=style))
         logger.info(message)
 
     @staticmethod
     def table(title: str, columns: list[str], rows: list[list[str]]):
+        from rich.table import Table
+
         table = Table(title=title)
         for col in columns:
             table.add_column(col)
         for row in rows:
             table.add_row(*row)
-        console.print(table)
+        get_console().print(table)
@@ -0,0 +1,96 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+from dbferry.core.console import Printer as p
+from dbferry.core.metrics import RunMetrics
+from dbferry.core.schema import TableSchema
+
+
+class ConstraintBuilder:
+    """
+    Post-load phase: builds keys, indexes and foreign keys once the data is in.
+
+    1. Primary keys, unique keys and secondary indexes, in parallel per table.
+    2. Foreign keys added NOT VALID, one after another since they are
+       catalog-only changes that lock both ends of the relationship.
+    3. VALIDATE of those foreign keys, in parallel per table.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        workers: int = 1,
+        maintenance_memory: str | None = None,
+        metrics: RunMetrics | None = None,
+        release: Callable[[Any], None] | None = None,
+    ):
+        self.connect = connect
+        self.release = release or (lambda adapter: adapter.close())
+        self.metrics = metrics or RunMetrics()
+        self.workers = max(1, workers)
+        self.maintenance_memory = maintenance_memory
+        self.failed: List[str] = []
+        self._local = threading.local()
+        self._adapters: List[Any] = []
+        self._lock = threading.Lock()
+
+    def run(self, tables: List[TableSchema]) -> bool:
+        """Run all three phases; returns False if any step failed."""
+        try:
+            p.info(f"Building indexes and keys for {len(tables)} tables...")
+            self._parallel(tables, self._build_indexes)
+
+            p.info("Adding foreign keys (NOT VALID)...")
+            for table in tables:
+                self._guard(table, self._add_foreign_keys)
+
+            p.info("Validating foreign keys...")
+            self._parallel(tables, self._validate_foreign_keys)
+        finally:
+            for adapter in self._adapters:
+                self.release(adapter)
+
+        if self.failed:
+            p.warn(f"Constraint build failed for: {', '.join(self.failed)}")
+        return not self.failed
+
+    def _adapter(self):
+        if not hasattr(self._local, "adapter"):
+            adapter = self.connect()
+            if self.maintenance_memory:
+                adapter.set_maintenance_memory(self.maintenance_memory)
+            self._local.adapter = adapter
+            with self._lock:
+                self._adapters.append(adapter)
+        return self._local.adapter
+
+    def _parallel(self, tables: List[TableSchema], step: Callable):
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="dbferry-ddl"
+        ) as pool:
+            list(pool.map(lambda t: self._guard(t, step), tables))
+
+    def _guard(self, table: TableSchema, step: Callable):
+        if table.name in self.failed:
+            return
+        try:
+            with self.metrics.timer(table.name, "ddl"):
+                step(self._adapter(), table)
+        except Exception as e:
+            with self._lock:
+                self.failed.append(table.name)
+            p.error(f"Constraint build failed for {table.name}: {e}")
+
+    def _build_indexes(self, adapter, table: TableSchema):
+        adapter.build_indexes(table)
+        p.success(f"Built keys and indexes for {table.name}.")
+
+    def _add_foreign_keys(self, adapter, table: TableSchema):
+        for name in adapter.add_foreign_keys(table):
+            p.info(f"Added foreign key {name} (NOT VALID).")
+
+    def _validate_foreign_keys(self, adapter, table: TableSchema):
+        if table.foreign_keys:
+            adapter.validate_foreign_keys(table)
+            p.success(f"Validated foreign keys for {table.name}.")
@@ -8,8 +8,8 @@ def setup_logger():
     logger = logging.getLogger("dbferry")
     logger.setLevel(logging.INFO)
 
-    # File handler
-    fh = logging.FileHandler(LOG_FILE, encoding="utf-8")
+    # File handler, opened on the first record rather than at import
+    fh = logging.FileHandler(LOG_FILE, encoding="utf-8", delay=True)
     fh.setLevel(logging.INFO)
     formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
     fh.setFormatter(formatter)
@@ -0,0 +1,276 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from dbferry.core.logger import LOG_FILE
+
+REPORT_FILE = LOG_FILE.with_name("dbferry.report.json")
+
+# Latency bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+@dataclass
+class Histogram:
+    """Cumulative-bucket latency histogram, Prometheus style."""
+
+    counts: List[int] = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+    count: int = 0
+    sum: float = 0.0
+
+    def observe(self, seconds: float):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                break
+        else:
+            i = len(BUCKETS)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile (inf past the last)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, n in zip((*BUCKETS, float("inf")), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip([*map(str, BUCKETS), "+Inf"], self.counts)),
+        }
+
+
+@dataclass
+class Lap:
+    """Elapsed time of a `RunMetrics.timer` block, set when the block exits."""
+
+    seconds: float = 0.0
+
+
+@dataclass
+class TableMetrics:
+    table: str
+    status: str = "pending"
+    rows: int = 0
+    bytes: int = 0  # bytes sent to the target (COPY data)
+    batches: int = 0
+    ddl_seconds: float = 0.0
+    copy_seconds: float = 0.0
+    fetch: Histogram = field(default_factory=Histogram)
+    write: Histogram = field(default_factory=Histogram)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "batches": self.batches,
+            "rows_per_second": (
+                round(self.rows / self.copy_seconds, 1) if self.copy_seconds else None
+            ),
+            "ddl_seconds": round(self.ddl_seconds, 6),
+            "copy_seconds": round(self.copy_seconds, 6),
+            "fetch_seconds": self.fetch.to_dict(),
+            "write_seconds": self.write.to_dict(),
+        }
+
+
+class RunMetrics:
+    """
+    Counters and timers for one run, shared by all worker threads.
+
+    Per table: rows, bytes, batches, fetch and write latency histograms, DDL
+    time and copy wall time. Per run: time spent in each phase.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.finished: float | None = None
+        self.tables: Dict[str, TableMetrics] = {}
+        self.phases: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def table(self, name: str) -> TableMetrics:
+        with self._lock:
+            if name not in self.tables:
+                self.tables[name] = TableMetrics(table=name)
+            return self.tables[name]
+
+    def record(self, table: str, rows: int = 0, bytes: int = 0, batches: int = 0):
+        metrics = self.table(table)
+        with self._lock:
+            metrics.rows += rows
+            metrics.bytes += bytes
+            metrics.batches += batches
+
+    def set_status(self, table: str, status: str):
+        self.table(table).status = status
+
+    @contextmanager
+    def timer(self, table: str, kind: str):
+        """Time a block as a `fetch`/`write` sample or `ddl`/`copy` seconds."""
+        metrics = self.table(table)
+        lap = Lap()
+        started = time.perf_counter()
+        try:
+            yield lap
+        finally:
+            elapsed = lap.seconds = time.perf_counter() - started
+            with self._lock:
+                if kind in ("fetch", "write"):
+                    getattr(metrics, kind).observe(elapsed)
+                else:
+                    setattr(
+                        metrics,
+                        f"{kind}_seconds",
+                        getattr(metrics, f"{kind}_seconds") + elapsed,
+                    )
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def timed_fetch(
+        self,
+        table: str,
+        batches: Iterable[Any],
+        observe: Callable[[Any, float], None] | None = None,
+    ) -> Iterator[Any]:
+        """
+        Yield from `batches`, timing how long each one takes to arrive.
+        `observe(batch, seconds)` is also told about every batch.
+        """
+        it = iter(batches)
+        try:
+            while True:
+                with self.timer(table, "fetch") as lap:
+                    batch = next(it, None)
+                if batch is None:
+                    return
+                if observe:
+                    observe(batch, lap.seconds)
+                yield batch
+        finally:
+            close = getattr(it, "close", None)
+            if close:
+                close()
+
+    # Reports ---------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        finished = self.finished or time.time()
+        with self._lock:
+            tables = {name: m.to_dict() for name, m in sorted(self.tables.items())}
+            phases = {name: round(s, 6) for name, s in self.phases.items()}
+        return {
+            "started": self.started,
+            "finished": finished,
+            "duration_seconds": round(finished - self.started, 6),
+            "phases": phases,
+            "totals": {
+                key: sum(t[key] for t in tables.values())
+                for key in ("rows", "bytes", "batches")
+            },
+            "tables": tables,
+        }
+
+    def write_json(self, path: str | Path = REPORT_FILE):
+        _write_atomic(Path(path), json.dumps(self.to_dict(), indent=2))
+
+    def write_prometheus(self, path: str | Path):
+        """Text exposition format, e.g. for node_exporter's textfile collector."""
+        report = self.to_dict()
+        lines: List[str] = []
+
+        def gauge(name: str, help: str, samples: List[tuple[str, Any]]):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+
+        def per_table(key: str) -> List[tuple[str, Any]]:
+            return [
+                (f'{{table="{name}"}}', t[key]) for name, t in report["tables"].items()
+            ]
+
+        gauge(
+            "dbferry_run_duration_seconds",
+            "Wall time of the last run.",
+            [("", report["duration_seconds"])],
+        )
+        gauge(
+            "dbferry_run_finished_timestamp_seconds",
+            "When the last run finished.",
+            [("", report["finished"])],
+        )
+        gauge(
+            "dbferry_phase_seconds",
+            "Time spent in each phase of the last run.",
+            [(f'{{phase="{k}"}}', v) for k, v in report["phases"].items()],
+        )
+        gauge("dbferry_table_rows", "Rows copied per table.", per_table("rows"))
+        gauge("dbferry_table_bytes", "Bytes sent per table.", per_table("bytes"))
+        gauge(
+            "dbferry_table_batches", "Batches written per table.", per_table("batches")
+        )
+        gauge(
+            "dbferry_table_ddl_seconds",
+            "Time spent on DDL per table.",
+            per_table("ddl_seconds"),
+        )
+        gauge(
+            "dbferry_table_copy_seconds",
+            "Wall time of the data copy per table.",
+            per_table("copy_seconds"),
+        )
+        gauge(
+            "dbferry_table_failed",
+            "1 if the table did not finish.",
+            [
+                (f'{{table="{name}"}}', int(t["status"] not in ("done", "pending")))
+                for name, t in report["tables"].items()
+            ],
+        )
+
+        for kind in ("fetch", "write"):
+            name = f"dbferry_{kind}_seconds"
+            lines.append(f"# HELP {name} Per-batch {kind} latency.")
+            lines.append(f"# TYPE {name} histogram")
+            for table, t in report["tables"].items():
+                hist = t[f"{kind}_seconds"]
+                cumulative = 0
+                for le, n in hist["buckets"].items():
+                    cumulative += n
+                    lines.append(
+                        f'{name}_bucket{{table="{table}",le="{le}"}} {cumulative}'
+                    )
+                lines.append(f'{name}_sum{{table="{table}"}} {hist["sum"]}')
+                lines.append(f'{name}_count{{table="{table}"}} {hist["count"]}')
+
+        _write_atomic(Path(path), "\n".join(lines) + "\n")
+
+
+def _write_atomic(path: Path, text: str):
+    # Scrapers and readers never see a half-written file
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
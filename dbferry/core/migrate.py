@@ -1,28 +1,80 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
+from dbferry.core.batching import BatchSizer
+from dbferry.core.checkpoint import WHOLE_TABLE, CheckpointJournal
+from dbferry.core.chunking import Chunk
 from dbferry.core.console import Printer as p
+from dbferry.core.constraints import ConstraintBuilder
 from dbferry.core.config import MigrationConfig
 from dbferry.core.connection import ConnectionManager
-from dbferry.core.schema import TableSchema
+from dbferry.core.metrics import REPORT_FILE, RunMetrics
+from dbferry.core.pipe import prefetch, run_pipe
+from dbferry.core.scheduler import TableRun, TableScheduler
+from dbferry.core.snapshot import SchemaSnapshot
+from dbferry.core.subset import apply_subsets
+from dbferry.core.schema import SchemaCache, TableSchema
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+# Large objects are copied in pieces of this size
+LARGE_OBJECT_PIECE_BYTES = 8 * 1024**2
 
 
 class MigrationManager:
 
-    def __init__(self, config: MigrationConfig, dry_run: bool):
+    def __init__(self, config: MigrationConfig, dry_run: bool, resume: bool = False):
         self.config = config
         self.conn_mgr = ConnectionManager()
         self.dry_run = dry_run
+        self.resume = resume
+        self.journal: CheckpointJournal | None = None
+        self.metrics = RunMetrics()
 
         self.source = self.conn_mgr.get_adapter(self.config.source)
         self.target = self.conn_mgr.get_adapter(self.config.target)
+        self.schemas = SchemaCache(self.source)
+
+        # Worker threads each get their own source/target connection pair
+        self._main_thread = threading.current_thread()
+        self._local = threading.local()
+        self._worker_adapters = []
+        self._worker_lock = threading.Lock()
+
+    @property
+    def pipe_mode(self) -> bool:
+        """Postgres → Postgres runs can hand raw COPY bytes straight across."""
+        return (
+            self.config.options.pipe_mode
+            and self.config.source.type.lower() == "postgres"
+            and self.config.target.type.lower() == "postgres"
+        )
 
     def run(self):
         p.panel(title="Migration", message="Starting migration process...")
 
         try:
-            self.source.connect()
-            self.target.connect()
+            self.conn_mgr.attach(self.source)
+            self.conn_mgr.attach(self.target)
             p.success("DB Connections success")
+            self._limit_writers()
+
+            if not self.dry_run:
+                self.journal = CheckpointJournal.open(self.config, resume=self.resume)
+                if self.resume:
+                    p.info(f"Resuming from checkpoint journal {self.journal.path}")
 
-            enums = self.source.list_enum_types()
+            snapshot = None
+            if self.config.options.schema_snapshot:
+                snapshot = SchemaSnapshot(self.config.source)
+                if snapshot.restore(self.schemas):
+                    p.info("Source catalog unchanged; reusing schema snapshot.")
+
+            enums = self.schemas.list_enum_types()
             if enums:
                 p.info("Recreating ENUM types on target...")
                 if self.dry_run:
@@ -48,89 +100,554 @@ class MigrationManager:
                             )
 
             # Determine which tables to migrate
+            tables = self.schemas.select(self.config.options.tables)
             if self.config.options.tables == ["*"]:
-                tables = self.source.list_tables()
                 p.info(f"Discovered {len(tables)} tables from source database.")
             else:
-                tables = self.config.options.tables or []
                 p.info(f"Using specified tables from config: {', '.join(tables)}")
 
+            if self.journal and not self.resume:
+                # Their old watermarks predate the copy; _seed_watermark sets new ones
+                self.journal.clear_watermarks(tables)
+
             if not tables:
                 p.warn("No tables found or specified. Exiting migration.")
                 return
 
-            tables = [self.source.get_table_schema(name) for name in tables]
-            order = resolve_table_order(tables=tables)
+            with self.metrics.phase("schema"):
+                self.schemas.load(tables)
+                if snapshot:
+                    snapshot.save(self.schemas)
+                # Snapshots keep whole tables; subsets only apply to this run
+                tables = apply_subsets(self.schemas, tables, self.config.options.subset)
+            graph = build_dependency_graph(tables=tables)
 
-            for table in order:
-                self.migrate_table(table)
+            workers = self.config.options.workers
+            with self.metrics.phase("data"):
+                results = self._run_tables(graph)
+            # Hand the workers' connections to the constraint phase
+            self._release_workers()
+            for run in results.values():
+                self.metrics.set_status(run.name, run.status)
 
-            p.panel(
-                title="Migration",
-                message="Migration completed succesfully!",
-                style="green",
-            )
+            if not self.dry_run and self.config.options.large_objects:
+                narrowed = (
+                    self.config.options.tables != ["*"] or self.config.options.subset
+                )
+                with self.metrics.phase("large_objects"):
+                    self._copy_large_objects(tables if narrowed else None)
+
+            failed = [r.name for r in results.values() if r.status != "done"]
+            if not self.dry_run:
+                # 3️⃣ Keys, indexes and foreign keys once the data is in
+                builder = ConstraintBuilder(
+                    connect=lambda: self._connect(self.config.target),
+                    release=self.conn_mgr.release,
+                    workers=workers,
+                    maintenance_memory=self.config.options.maintenance_work_mem,
+                    metrics=self.metrics,
+                )
+                with self.metrics.phase("constraints"):
+                    builder.run(
+                        [self.schemas.get(n) for n in results if n not in failed]
+                    )
+                for name in builder.failed:
+                    self.metrics.set_status(name, "failed")
+                failed += builder.failed
+            if failed:
+                p.panel(
+                    title="Migration",
+                    message=f"Migration finished with {len(failed)} failed or "
+                    f"skipped table(s): {', '.join(failed)}",
+                    style="yellow",
+                )
+            else:
+                p.panel(
+                    title="Migration",
+                    message="Migration completed succesfully!",
+                    style="green",
+                )
         except Exception as e:
             p.error(f"Migration failed: {e}")
         finally:
-            self.source.close()
-            self.target.close()
+            self.conn_mgr.close()
+            if self.journal:
+                self.journal.close()
+            if not self.dry_run:
+                self._write_reports()
+
+    def _limit_writers(self):
+        """Targets that take one writer at a time get a single worker."""
+        opts = self.config.options
+        if self.target.parallel_writes or (opts.workers, opts.chunk_workers) == (1, 1):
+            return
+        p.info(
+            f"{self.config.target.type} target accepts one writer at a time; "
+            "using a single worker."
+        )
+        opts.workers = opts.chunk_workers = 1
+
+    def _write_reports(self):
+        """JSON run report next to dbferry.log, plus Prometheus text if configured."""
+        self.metrics.finished = time.time()
+        tables = self.metrics.tables.values()
+        p.info(
+            f"Time in source fetches {sum(t.fetch.sum for t in tables):.2f}s, "
+            f"target writes {sum(t.write.sum for t in tables):.2f}s, "
+            f"DDL {sum(t.ddl_seconds for t in tables):.2f}s."
+        )
+        try:
+            self.metrics.write_json()
+            p.info(f"Run report written to {REPORT_FILE}")
+            if self.config.options.prometheus_file:
+                self.metrics.write_prometheus(self.config.options.prometheus_file)
+        except OSError as e:
+            p.warn(f"Could not write run report: {e}")
+
+    def _run_tables(self, graph) -> dict[str, TableRun]:
+        """Migrate every table's data, parents before children."""
+        workers = self.config.options.workers
+        p.info(f"Scheduling {len(graph)} tables on {workers} worker(s)...")
+        scheduler = TableScheduler(
+            graph=graph,
+            workers=workers,
+            run_table=lambda name: self.migrate_table(name, *self._adapters()),
+        )
+        results = scheduler.run()
+        scheduler.report()
+        return results
+
+    def _connect(self, db_cfg):
+        return self.conn_mgr.acquire(db_cfg)
+
+    def _release_workers(self):
+        with self._worker_lock:
+            for source, target in self._worker_adapters:
+                self.conn_mgr.release(source)
+                self.conn_mgr.release(target)
+            self._worker_adapters.clear()
+        self._local = threading.local()
 
-    def migrate_table(self, table: str):
+    def _adapters(self):
+        """Return the source/target adapters owned by the current thread."""
+        if threading.current_thread() is self._main_thread:
+            return self.source, self.target
+
+        if not hasattr(self._local, "source"):
+            source = self._connect(self.config.source)
+            target = self._connect(self.config.target)
+            self._local.source, self._local.target = source, target
+            with self._worker_lock:
+                self._worker_adapters.append((source, target))
+        return self._local.source, self._local.target
+
+    def migrate_table(self, table: str, source=None, target=None) -> bool:
         """
         Migrates a single table from the source to the target.
         Handles per-table transaction safety (commit on success, rollback on failure).
+        Returns True when the table was committed.
         """
+        source = source or self.source
+        target = target or self.target
         p.info(f"Migrating table [bold]{table}[/bold]...")
 
         if self.dry_run:
             p.info("Dry-run: skipping actual data writes.")
-            return
+            return True
 
-        try:
-            # Begin transaction (some drivers auto-start; this makes it explicit)
-            cur = self.target.conn.cursor()
+        if self.journal.table_status(table) == "done":
+            p.info(f"Skipping {table}: already migrated in a previous run.")
+            return True
 
+        try:
             # 1️⃣ Get schema from source
-            schema = self.source.get_table_schema(table)
-            self.target.create_table(schema)
+            schema = self.schemas.get(table)
+            # Keys are built after the load unless configured otherwise
+            with self.metrics.timer(table, "ddl"):
+                target.create_table(
+                    schema,
+                    constraints=not self.config.options.defer_constraints,
+                    enums=self.schemas.list_enum_types(),
+                )
             p.success(f"Created table {table} on target (if not exists).")
+            self._seed_watermark(schema, source)
 
-            # 2️⃣ Fetch data
-            rows = self.source.fetch_rows(table_name=table, limit=1000)
-            if not rows:
-                p.warn(f"No rows found in {table}. Skipping.")
-                self.target.conn.commit()
-                cur.close()
-                return
-
-            p.info(f"Fetched {len(rows)} rows from table {table}.")
-
-            # 3️⃣ Insert into target
-            self.target.insert_rows(table_name=table, rows=rows)
-            p.success(f"Migrated {len(rows)} rows for table {table}.")
+            # 2️⃣ Move data from source into target
+            with self.metrics.timer(table, "copy"):
+                chunks = self._plan_chunks(schema, source)
+                if chunks:
+                    p.info(f"Splitting {table} into {len(chunks)} ranges.")
+                    self._restart_unkeyed_chunks(schema, chunks, target)
+                    total = self._copy_chunks(schema, chunks)
+                else:
+                    total = self._copy_unit(schema, source, target)
 
-            # ✅ Commit transaction for this table
-            self.target.conn.commit()
-            cur.close()
+            if not total:
+                p.warn(f"No rows found in {table}. Skipping.")
+            else:
+                p.success(f"Migrated {total} rows for table {table}.")
+            self.journal.mark_table(table, "done")
+            return True
 
         except Exception as e:
             # 🔁 Rollback failed transaction
             try:
-                self.target.conn.rollback()
+                target.conn.rollback()
             except Exception as rollback_err:
                 p.error(f"Rollback failed for table {table}: {rollback_err}")
 
             p.error(f"Failed to migrate table {table}: {e}")
+            return False
+
+    def _seed_watermark(self, schema: TableSchema, source):
+        """
+        Remember where the source stood before the copy began, so the first
+        `dbferry sync` only picks up rows changed since. Kept from the first
+        attempt when resuming.
+        """
+        column = schema.watermark_column(
+            self.config.options.watermarks.get(schema.name)
+        )
+        if not column or self.journal.get_watermark(schema.name, column) is not None:
+            return
+        try:
+            mark = source.max_value(schema.name, column)
+        except NotImplementedError:
+            return
+        if mark is not None:
+            self.journal.save_watermark(schema.name, column, mark)
 
+    def _copy_unit(
+        self, schema: TableSchema, source, target, chunk: Chunk | None = None
+    ) -> int:
+        """
+        Copy a whole table or one chunk of it inside a transaction, skipping
+        work the journal says was already committed.
+        """
+        unit = chunk.id if chunk else WHOLE_TABLE
+        started, done, rows = self.journal.chunk_state(schema.name, unit)
+        if done:
+            return rows
+
+        # Tables with a primary key commit batch by batch, so a previous
+        # attempt may have left rows behind; continue after the last one.
+        # Other chunks were restarted by _restart_unkeyed_chunks.
+        start_after = None
+        if started and schema.primary_key and self._keyed(schema, chunk):
+            start_after = target.last_key(schema, chunk)
+            if start_after is not None:
+                p.info(f"Resuming {schema.name} after key {start_after}.")
+        else:
+            rows = 0
+            self.journal.save_progress(schema.name, unit, rows=0)
+
+        target.set_autocommit(False)
+        try:
+            rows += self._copy_data(schema, source, target, chunk, start_after)
+            target.conn.commit()
+        except Exception:
+            target.conn.rollback()
+            raise
+        finally:
+            target.set_autocommit(True)
 
-import networkx as nx
+        self.journal.save_progress(schema.name, unit, rows=rows, done=True)
+        return rows
+
+    def _copy_data(
+        self,
+        schema: TableSchema,
+        source,
+        target,
+        chunk: Chunk | None = None,
+        start_after: tuple | None = None,
+    ) -> int:
+        """Copy a table, or one chunk of it, and return the number of rows moved."""
+        if self.pipe_mode and start_after is None:
+            return self._pipe_table(schema, source, target, chunk)
+
+        unit = chunk.id if chunk else WHOLE_TABLE
+        _, _, done_rows = self.journal.chunk_state(schema.name, unit)
+        total = 0
+        sizer = BatchSizer.for_table(self.config.options, source, schema.name)
+        defer_over = self._defer_over(schema, source, target)
+        # The source is read ahead on its own thread while batches are written
+        batches = source.stream_rows(
+            schema,
+            batch_size=sizer or self.config.options.batch_size,
+            chunk=chunk,
+            start_after=start_after,
+            **({"defer_over": defer_over} if defer_over else {}),
+        )
+        batches = self.metrics.timed_fetch(
+            schema.name,
+            batches,
+            observe=(
+                (lambda batch, secs: sizer.observe("fetch", len(batch), secs))
+                if sizer
+                else None
+            ),
+        )
+        for batch in prefetch(batches, self.config.options.queue_depth):
+            with self.metrics.timer(schema.name, "write") as lap:
+                nbytes = target.insert_rows(schema.name, batch)
+                # Values left out of the batch go in before it is committed
+                wide_bytes = self._fill_deferred(schema, target, batch.deferred)
+                if schema.primary_key:
+                    target.conn.commit()
+            if sizer:
+                sizer.observe("write", len(batch), lap.seconds, nbytes)
+            self.metrics.record(
+                schema.name,
+                rows=len(batch),
+                bytes=(nbytes or 0) + wide_bytes,
+                batches=1,
+            )
+            total += len(batch)
+            if schema.primary_key:
+                # Batches are committed one by one; record the high-water mark
+                last_key = list(batch.last_key(schema.primary_key))
+                self.journal.save_progress(
+                    schema.name, unit, rows=done_rows + total, last_key=last_key
+                )
+        return total
+
+    def _plan_chunks(self, schema: TableSchema, source) -> list[Chunk]:
+        """
+        Split tables above the size threshold into key ranges. A resumed table
+        reuses the plan recorded in the journal so chunk ids stay stable.
+        """
+        planned = self.journal.load_plan(schema.name)
+        if planned is not None:
+            return planned
 
+        opts = self.config.options
+        chunks = []
+        if (
+            opts.chunk_workers > 1
+            and source.table_size_bytes(schema.name)
+            >= opts.split_threshold_mb * 1024**2
+        ):
+            chunks = source.key_ranges(schema, opts.chunk_workers)
+        self.journal.save_plan(schema.name, chunks)
+        return chunks
+
+    def _restart_unkeyed_chunks(self, schema: TableSchema, chunks: list[Chunk], target):
+        """
+        Resuming finds where a chunk stopped by looking up its key range on
+        the target. Chunks that aren't key ranges (source ctid ranges) can't
+        be matched there, so a table with such a chunk left half-done is
+        emptied and copied again from the start.
+        """
+        if all(self._keyed(schema, chunk) for chunk in chunks):
+            return
+        partial = [
+            chunk
+            for chunk in chunks
+            if self.journal.chunk_state(schema.name, chunk.id)[0]
+            and not self.journal.chunk_state(schema.name, chunk.id)[1]
+        ]
+        if not partial:
+            return
+        p.warn(
+            f"{schema.name} was split on physical row ranges, which can't be "
+            "matched on the target; copying it again from the start."
+        )
+        target.truncate_table(schema.name)
+        self.journal.clear_chunks(schema.name)
+
+    @staticmethod
+    def _keyed(schema: TableSchema, chunk: Chunk | None) -> bool:
+        """Whether a unit is the whole table or a range of its primary key."""
+        return chunk is None or chunk.column in (schema.primary_key or [])
+
+    def _copy_chunks(self, schema: TableSchema, chunks: list[Chunk]) -> int:
+        """Copy key ranges in parallel, each on its own connections and transaction."""
+        with ThreadPoolExecutor(
+            max_workers=self.config.options.chunk_workers,
+            thread_name_prefix="dbferry-chunk",
+        ) as pool:
+            futures = [pool.submit(self._copy_chunk, schema, c) for c in chunks]
+            return sum(f.result() for f in futures)
+
+    def _copy_chunk(self, schema: TableSchema, chunk: Chunk) -> int:
+        source = self._connect(self.config.source)
+        target = self._connect(self.config.target)
+        try:
+            return self._copy_unit(schema, source, target, chunk)
+        finally:
+            self.conn_mgr.release(source)
+            self.conn_mgr.release(target)
+
+    def _pipe_table(
+        self, schema: TableSchema, source, target, chunk: Chunk | None = None
+    ) -> int:
+        """
+        Pipe the source's COPY TO output into the target's COPY FROM without
+        decoding rows, through a bounded in-memory buffer. Values too large
+        to pipe whole are looked up first, in the same snapshot as the COPY,
+        and streamed into the target's rows afterwards by a reader that joins
+        that snapshot, which stays open until they are done.
+        """
+        columns = [col.name for col in schema.columns]
+        defer_over = self._defer_over(schema, source, target)
+        deferred = {}
+        with source.snapshot() if defer_over else nullcontext():
+            if defer_over:
+                deferred = source.deferred_keys(schema, defer_over, chunk)
+            snapshot_id = source.export_snapshot() if deferred else None
+            rowcount, nbytes = run_pipe(
+                produce=lambda pipe: source.copy_to(
+                    schema, pipe, chunk, defer_over if deferred else None
+                ),
+                consume=lambda pipe: target.copy_from(schema.name, columns, pipe),
+                max_bytes=self.config.options.pipe_buffer_mb * 1024 * 1024,
+            )
+            p.info(f"Piped {nbytes} bytes for table {schema.name}.")
+            nbytes += self._fill_deferred(schema, target, deferred, snapshot_id)
+        self.metrics.record(schema.name, rows=rowcount, bytes=nbytes)
+        return rowcount
+
+    def _defer_over(self, schema: TableSchema, source, target) -> int | None:
+        """
+        Size in bytes above which a table's values are streamed piece by
+        piece instead of fetched with their row, or None to fetch them whole.
+        Filling them in afterwards needs a key to find the row by.
+        """
+        limit = self.config.options.wide_value_mb * 1024**2
+        if not (limit and source.streams_large_values and target.streams_large_values):
+            return None
+        if not schema.primary_key:
+            if source.wide_columns(schema):
+                p.warn(
+                    f"{schema.name} has no primary key; its large values are "
+                    "copied whole."
+                )
+            return None
+        return limit
+
+    def _fill_deferred(
+        self,
+        schema: TableSchema,
+        target,
+        deferred: dict[str, list[tuple]],
+        snapshot_id: str | None = None,
+    ) -> int:
+        """
+        Stream the values a row copy left out into the target rows, one piece
+        at a time, from a source connection of their own; in the exported
+        snapshot `snapshot_id`, if given. Returns the bytes written.
+        """
+        if not deferred:
+            return 0
+        piece_bytes = self.config.options.wide_value_mb * 1024**2
+        reader = self._connect(self.config.source)
+        count = nbytes = 0
+        try:
+            for column, keys in deferred.items():
+                for key in keys:
+                    pieces = reader.stream_value(
+                        schema, column, key, piece_bytes, snapshot_id
+                    )
+                    nbytes += target.write_value(schema, column, key, pieces)
+                    count += 1
+        finally:
+            self.conn_mgr.release(reader)
+        p.info(f"Streamed {count} large value(s), {nbytes} bytes, into {schema.name}.")
+        return nbytes
+
+    def _copy_large_objects(self, tables: list[TableSchema] | None = None):
+        """
+        Copy the source's large objects under their own OIDs, so oid columns
+        keep pointing at them. Runs narrowed by options.tables or
+        options.subset pass their `tables`, and only the objects their rows
+        reference are copied. Objects already on the target, e.g. from an
+        interrupted run, are left alone.
+        """
+        try:
+            oids = self.source.large_objects(tables)
+        except Exception as e:
+            p.error(f"Could not list large objects: {e}")
+            return
+        if not oids:
+            return
+        if not self.target.streams_large_values:
+            p.warn(
+                f"Skipping {len(oids)} large object(s): "
+                f"{self.config.target.type} targets have no large objects."
+            )
+            return
+
+        try:
+            existing = set(self.target.large_objects())
+        except Exception as e:
+            p.error(f"Could not list large objects on the target: {e}")
+            return
+        pending = [oid for oid in oids if oid not in existing]
+        if len(pending) < len(oids) and not self.resume:
+            p.warn(
+                f"{len(oids) - len(pending)} large object(s) already exist on the "
+                "target and were left unchanged."
+            )
+        if not pending:
+            return
+        p.info(f"Copying {len(pending)} large object(s)...")
+
+        name = "pg_largeobject"
+        with self.metrics.timer(name, "copy"):
+            with ThreadPoolExecutor(
+                max_workers=self.config.options.workers,
+                thread_name_prefix="dbferry-lo",
+            ) as pool:
+                sizes = list(pool.map(self._copy_large_object, pending))
+        failed = sizes.count(None)
+        self.metrics.record(
+            name, rows=len(pending) - failed, bytes=sum(filter(None, sizes))
+        )
+        self.metrics.set_status(name, "failed" if failed else "done")
+        if failed:
+            p.warn(f"{failed} large object(s) failed to copy.")
+        else:
+            p.success(f"Copied {len(pending)} large object(s).")
+
+    def _copy_large_object(self, oid: int) -> int | None:
+        source = self._connect(self.config.source)
+        target = self._connect(self.config.target)
+        try:
+            pieces = source.read_large_object(oid, LARGE_OBJECT_PIECE_BYTES)
+            return target.write_large_object(oid, pieces)
+        except Exception as e:
+            p.error(f"Failed to copy large object {oid}: {e}")
+            return None
+        finally:
+            self.conn_mgr.release(source)
+            self.conn_mgr.release(target)
+
+
+def build_dependency_graph(tables: list[TableSchema]) -> "nx.DiGraph":
+    """
+    FK dependency graph: an edge parent → child for every foreign key.
+    Tables that reference each other form cycles.
+    """
+    import networkx as nx
 
-def resolve_table_order(tables: list[TableSchema]):
     g = nx.DiGraph()
     for t in tables:
         g.add_node(t.name)
         for fk in t.foreign_keys or []:
-            g.add_edge(fk.ref_table, t.name)
-    return list(nx.topological_sort(g))
+            # Self-referencing FKs don't constrain ordering between tables
+            if fk.ref_table != t.name:
+                g.add_edge(fk.ref_table, t.name)
+    return g
+
+
+def resolve_table_order(tables: list[TableSchema]) -> list[str]:
+    """Parents before children; tables in an FK cycle come together, by name."""
+    import networkx as nx
+
+    units = nx.condensation(build_dependency_graph(tables))
+    return [
+        name
+        for unit in nx.topological_sort(units)
+        for name in sorted(units.nodes[unit]["members"])
+    ]
@@ -0,0 +1,166 @@
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator
+
+
+class PipeAborted(Exception):
+    """Raised on one end of a pipe when the other end has failed."""
+
+
+class BoundedPipe:
+    """
+    In-memory byte pipe between a COPY TO producer and a COPY FROM consumer.
+    Writers block once `max_bytes` are buffered, so memory stays bounded no
+    matter how fast the source is compared to the target.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes_transferred = 0
+        self.error: BaseException | None = None
+        self._buf = bytearray()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._aborted = False
+
+    # Producer side -------------------------------------------------------
+
+    def write(self, data: bytes) -> int:
+        with self._cond:
+            while len(self._buf) >= self.max_bytes and not self._aborted:
+                self._cond.wait()
+            if self._aborted:
+                raise PipeAborted("Pipe consumer stopped reading")
+            self._buf += data
+            self.bytes_transferred += len(data)
+            self._cond.notify_all()
+        return len(data)
+
+    def close(self):
+        """Signal end of data."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def fail(self, error: BaseException):
+        """Signal that the producer failed; the consumer's next read raises."""
+        with self._cond:
+            self.error = error
+            self._closed = True
+            self._cond.notify_all()
+
+    # Consumer side -------------------------------------------------------
+
+    def read(self, size: int = -1) -> bytes:
+        with self._cond:
+            while not self._buf and not self._closed:
+                self._cond.wait()
+            if self.error is not None:
+                raise PipeAborted(f"Pipe producer failed: {self.error}")
+            if size is None or size < 0:
+                size = len(self._buf)
+            chunk = bytes(self._buf[:size])
+            del self._buf[:size]
+            self._cond.notify_all()
+            return chunk
+
+    def abort(self):
+        """Stop the producer, e.g. because the consumer failed."""
+        with self._cond:
+            self._aborted = True
+            self._buf.clear()
+            self._cond.notify_all()
+
+
+def run_pipe(
+    produce: Callable[[BoundedPipe], Any],
+    consume: Callable[[BoundedPipe], Any],
+    max_bytes: int,
+) -> tuple[Any, int]:
+    """
+    Run `produce` on a background thread writing into a bounded pipe while
+    `consume` reads from it on the calling thread.
+    Returns the consumer's result and the number of bytes moved. If the
+    producer fails, its exception is raised here.
+    """
+    pipe = BoundedPipe(max_bytes)
+
+    def _producer():
+        try:
+            produce(pipe)
+        except BaseException as e:
+            pipe.fail(e)
+        else:
+            pipe.close()
+
+    thread = threading.Thread(target=_producer, name="dbferry-pipe", daemon=True)
+    thread.start()
+    try:
+        result = consume(pipe)
+    except BaseException as e:
+        pipe.abort()
+        thread.join()
+        if pipe.error is not None and not isinstance(pipe.error, PipeAborted):
+            # The consumer stopped because the producer failed: report the
+            # producer's error rather than the PipeAborted it caused
+            raise pipe.error from e
+        raise
+    thread.join()
+
+    if pipe.error is not None:
+        raise pipe.error
+    return result, pipe.bytes_transferred
+
+
+_END = object()
+
+
+def prefetch(batches: Iterable[Any], depth: int) -> Iterator[Any]:
+    """
+    Pull `batches` on a reader thread into a queue of at most `depth` items
+    and yield them on the calling thread, so the source is read while the
+    caller writes. A full queue pauses the reader (backpressure). Errors on
+    the reader are re-raised here; stopping early stops the reader.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+    error: list[BaseException] = []
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _reader():
+        # The iterator is created and closed here, on the thread that uses
+        # its connection
+        it = iter(batches)
+        try:
+            for batch in it:
+                if not _put(batch):
+                    break
+        except BaseException as e:
+            error.append(e)
+        finally:
+            close = getattr(it, "close", None)
+            if close:
+                close()
+            _put(_END)
+
+    thread = threading.Thread(target=_reader, name="dbferry-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                break
+            yield item
+        if error:
+            raise error[0]
+    finally:
+        stop.set()
+        thread.join()
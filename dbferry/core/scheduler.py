@@ -0,0 +1,249 @@
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List
+
+from dbferry.core.console import Printer as p
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+@dataclass
+class TableRun:
+    name: str
+    status: str  # "done", "failed" or "skipped"
+    started: float = 0.0
+    finished: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+class _InlineExecutor:
+    """Executor stand-in that runs work on the calling thread (workers=1)."""
+
+    def submit(self, fn, *args) -> Future:
+        fut: Future = Future()
+        try:
+            fut.set_result(fn(*args))
+        except BaseException as e:
+            fut.set_exception(e)
+        return fut
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class TableScheduler:
+    """
+    Runs table migrations over a pool of workers following the FK DAG.
+    A table is started as soon as all of its parents have committed;
+    children of a failed table are skipped. Tables that reference each other
+    in a cycle have no parent-first order, so each cycle runs as one unit,
+    its tables one after another; their foreign keys are only added in the
+    constraint phase.
+    """
+
+    def __init__(
+        self, graph: "nx.DiGraph", workers: int, run_table: Callable[[str], bool]
+    ):
+        self.graph = graph
+        self.workers = max(1, workers)
+        self.run_table = run_table
+        self.results: Dict[str, TableRun] = {}
+
+    def run(self) -> Dict[str, TableRun]:
+        import networkx as nx
+
+        units = self._units()
+        pending = {unit: units.in_degree(unit) for unit in units}
+        ready = [unit for unit, deps in pending.items() if deps == 0]
+        blocked: set[int] = set()
+        running: Dict[Future, int] = {}
+
+        executor = (
+            _InlineExecutor()
+            if self.workers == 1
+            else ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="dbferry-worker"
+            )
+        )
+        with executor as pool:
+            while ready or running:
+                while ready:
+                    unit = ready.pop(0)
+                    members = self._members(units, unit)
+                    running[pool.submit(self._run_unit, members)] = unit
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    unit = running.pop(fut)
+                    if self._record(fut.result()):
+                        blocked |= nx.descendants(units, unit)
+                    ready.extend(self._release(units, unit, pending, blocked))
+
+        return self.results
+
+    def _units(self) -> "nx.DiGraph":
+        """The table graph with every FK cycle collapsed into a single node."""
+        import networkx as nx
+
+        return nx.condensation(self.graph)
+
+    @staticmethod
+    def _members(units: "nx.DiGraph", unit: int) -> List[str]:
+        return sorted(units.nodes[unit]["members"])
+
+    def _run_unit(self, names: List[str]) -> List[TableRun]:
+        if len(names) > 1:
+            p.warn(
+                f"Tables {', '.join(names)} reference each other; "
+                "migrating them one after another."
+            )
+        return [self._run_one(name) for name in names]
+
+    def _record(self, runs: List[TableRun]) -> bool:
+        """Store a unit's runs; True when one of them did not finish."""
+        for run in runs:
+            self.results[run.name] = run
+        return any(run.status != "done" for run in runs)
+
+    def _run_one(self, name: str) -> TableRun:
+        started = time.monotonic()
+        try:
+            ok = self.run_table(name)
+        except Exception as e:
+            p.error(f"Worker crashed on table {name}: {e}")
+            ok = False
+        return TableRun(
+            name=name,
+            status="done" if ok else "failed",
+            started=started,
+            finished=time.monotonic(),
+        )
+
+    def _release(
+        self,
+        units: "nx.DiGraph",
+        unit: int,
+        pending: Dict[int, int],
+        blocked: set[int],
+    ) -> List[int]:
+        """Mark `unit` finished and return child units that became runnable."""
+        runnable = []
+        stack = [unit]
+        while stack:
+            for child in units.successors(stack.pop()):
+                pending[child] -= 1
+                if pending[child]:
+                    continue
+                if child in blocked:
+                    for name in self._members(units, child):
+                        p.warn(f"Skipping {name}: a parent table failed.")
+                        self.results[name] = TableRun(name=name, status="skipped")
+                    stack.append(child)
+                else:
+                    runnable.append(child)
+        return runnable
+
+    def critical_path(self) -> tuple[List[str], float]:
+        """
+        Longest chain of dependent tables weighted by their run time.
+        No amount of extra workers can finish the run faster than this.
+        """
+        import networkx as nx
+
+        units = self._units()
+        finish: Dict[int, float] = {}
+        via: Dict[int, int | None] = {}
+        for unit in nx.topological_sort(units):
+            own = sum(
+                self.results[name].duration
+                for name in self._members(units, unit)
+                if name in self.results
+            )
+            parents = list(units.predecessors(unit))
+            best = max(parents, key=lambda n: finish[n], default=None)
+            finish[unit] = own + (finish[best] if best is not None else 0.0)
+            via[unit] = best
+
+        if not finish:
+            return [], 0.0
+
+        node: int | None = max(finish, key=finish.get)
+        total = finish[node]
+        path = []
+        while node is not None:
+            path.append(" + ".join(self._members(units, node)))
+            node = via[node]
+        return list(reversed(path)), total
+
+    def report(self):
+        rows = [
+            [run.name, run.status, f"{run.duration:.2f}s"]
+            for run in sorted(self.results.values(), key=lambda r: r.started)
+        ]
+        p.table(title="Table Runs", columns=["Table", "Status", "Duration"], rows=rows)
+
+        path, total = self.critical_path()
+        if path:
+            p.info(f"Critical path ({total:.2f}s): {' → '.join(path)}")
+
+
+class AsyncTableScheduler(TableScheduler):
+    """
+    TableScheduler for coroutine `run_table`s: tables run as tasks on one
+    event loop, at most `workers` at a time, released along the same DAG.
+    """
+
+    async def run_async(self) -> Dict[str, TableRun]:
+        import networkx as nx
+
+        units = self._units()
+        pending = {unit: units.in_degree(unit) for unit in units}
+        ready = [unit for unit, deps in pending.items() if deps == 0]
+        blocked: set[int] = set()
+        running: Dict[asyncio.Task, int] = {}
+
+        while ready or running:
+            while ready and len(running) < self.workers:
+                unit = ready.pop(0)
+                members = self._members(units, unit)
+                running[asyncio.create_task(self._run_unit_async(members))] = unit
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                unit = running.pop(task)
+                if self._record(task.result()):
+                    blocked |= nx.descendants(units, unit)
+                ready.extend(self._release(units, unit, pending, blocked))
+
+        return self.results
+
+    async def _run_unit_async(self, names: List[str]) -> List[TableRun]:
+        if len(names) > 1:
+            p.warn(
+                f"Tables {', '.join(names)} reference each other; "
+                "migrating them one after another."
+            )
+        return [await self._run_one_async(name) for name in names]
+
+    async def _run_one_async(self, name: str) -> TableRun:
+        started = time.monotonic()
+        try:
+            ok = await self.run_table(name)
+        except Exception as e:
+            p.error(f"Worker crashed on table {name}: {e}")
+            ok = False
+        return TableRun(
+            name=name,
+            status="done" if ok else "failed",
+            started=started,
+            finished=time.monotonic(),
+        )
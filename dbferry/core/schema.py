@@ -1,5 +1,7 @@
+import re
+import threading
 from dataclasses import dataclass
-from typing import List
+from typing import Any, List
 
 
 @dataclass
@@ -17,13 +19,36 @@ class TableSchema:
     primary_key: list[str] | None = None
     unique_keys: list["UniqueKeySchema"] | None = None
     foreign_keys: list["ForeignKeySchema"] | None = None
+    indexes: list["IndexSchema"] | None = None
+    # SQL condition limiting which source rows are read (options.subset)
+    row_filter: str | None = None
+
+    def watermark_column(self, configured: str | None = None) -> str | None:
+        """
+        Column `dbferry sync` tracks: the configured one, else a single-column
+        integer primary key (assumed to only ever grow).
+        """
+        if configured:
+            return configured
+        if self.primary_key and len(self.primary_key) == 1:
+            column = next(c for c in self.columns if c.name == self.primary_key[0])
+            if column.type in ("smallint", "integer", "bigint"):
+                return column.name
+        return None
 
 
 @dataclass
 class ForeignKeySchema:
-    column: str
+    """A foreign key; `columns` pair up with `ref_columns` in order."""
+
+    columns: list[str]
     ref_table: str
-    ref_column: str
+    ref_columns: list[str]
+    name: str | None = None
+
+    def constraint_name(self, table: str) -> str:
+        """The source's name for the constraint, or the one Postgres would pick."""
+        return self.name or f"{table}_{'_'.join(self.columns)}_fkey"
 
 
 @dataclass
@@ -31,7 +56,91 @@ class UniqueKeySchema:
     columns: list[str]
 
 
+@dataclass
+class IndexSchema:
+    """A secondary (non-unique, non-PK) index, kept as its full definition."""
+
+    name: str
+    definition: str
+
+    def plain_columns(self) -> List[str] | None:
+        """
+        Column names of an index over plain columns, for engines that can't
+        run the definition as is. None for expression, partial or other
+        indexes that don't reduce to a column list.
+        """
+        match = re.search(r"\((.*)\)\s*$", self.definition)
+        if not match:
+            return None
+        columns = []
+        for item in match.group(1).split(","):
+            name = re.fullmatch(r'\s*("[^"]+"|\w+)(\s+(ASC|DESC))?\s*', item, re.I)
+            if not name:
+                return None
+            columns.append(name.group(1).strip('"'))
+        return columns
+
+
 @dataclass
 class EnumType:
     name: str
     values: list[str]
+
+
+class SchemaCache:
+    """
+    Run-wide cache of introspected table schemas, shared by all workers.
+    Misses are loaded in bulk through the adapter's `get_table_schemas`.
+    """
+
+    def __init__(self, adapter: Any):
+        self.adapter = adapter
+        self.tables: list[str] | None = None
+        self.enums: list[EnumType] | None = None
+        self.schemas: dict[str, TableSchema] = {}
+        self._lock = threading.Lock()
+
+    def seed(
+        self,
+        tables: list[str] | None,
+        enums: list[EnumType] | None,
+        schemas: dict[str, TableSchema],
+    ):
+        """Pre-populate the cache, e.g. from an on-disk snapshot."""
+        with self._lock:
+            self.tables = tables
+            self.enums = enums
+            self.schemas.update(schemas)
+
+    def list_tables(self) -> list[str]:
+        with self._lock:
+            if self.tables is None:
+                self.tables = self.adapter.list_tables()
+            return list(self.tables)
+
+    def list_enum_types(self) -> list[EnumType]:
+        with self._lock:
+            if self.enums is None:
+                self.enums = self.adapter.list_enum_types()
+            return list(self.enums)
+
+    def select(self, patterns: List[str]) -> list[str]:
+        """Resolve `options.tables`: ["*"] means every table in the database."""
+        if patterns == ["*"]:
+            return self.list_tables()
+        return list(patterns or [])
+
+    def load(self, table_names: List[str]) -> List[TableSchema]:
+        with self._lock:
+            missing = [n for n in table_names if n not in self.schemas]
+            if missing:
+                self.schemas.update(self.adapter.get_table_schemas(missing))
+            return [self.schemas[n] for n in table_names]
+
+    def override(self, schemas: list[TableSchema]):
+        """Replace cached schemas for the rest of the run, e.g. with subsets."""
+        with self._lock:
+            self.schemas.update({s.name: s for s in schemas})
+
+    def get(self, table_name: str) -> TableSchema:
+        return self.load([table_name])[0]
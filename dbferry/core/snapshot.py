@@ -0,0 +1,102 @@
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict
+
+from dbferry.core.config import DBConfig
+from dbferry.core.logger import LOG_FILE
+from dbferry.core.schema import (
+    ColumnSchema,
+    EnumType,
+    ForeignKeySchema,
+    IndexSchema,
+    SchemaCache,
+    TableSchema,
+    UniqueKeySchema,
+)
+
+SNAPSHOT_FILE = LOG_FILE.with_name("dbferry.schema.json")
+
+# Bumped whenever the shape of TableSchema changes
+SNAPSHOT_VERSION = 3
+
+
+def table_schema_from_dict(data: Dict[str, Any]) -> TableSchema:
+    return TableSchema(
+        name=data["name"],
+        columns=[ColumnSchema(**c) for c in data["columns"]],
+        primary_key=data.get("primary_key"),
+        unique_keys=[UniqueKeySchema(**u) for u in data.get("unique_keys") or []],
+        foreign_keys=[ForeignKeySchema(**f) for f in data.get("foreign_keys") or []],
+        indexes=[IndexSchema(**i) for i in data.get("indexes") or []],
+    )
+
+
+class SchemaSnapshot:
+    """
+    On-disk copy of a database's tables, enums and table schemas.
+    An entry is reused only while the database's catalog fingerprint is
+    unchanged, so a snapshot never serves a stale schema.
+    """
+
+    def __init__(self, db_cfg: DBConfig, path: str | Path = SNAPSHOT_FILE):
+        self.path = Path(path)
+        self.key = f"{db_cfg.type}://{db_cfg.host}:{db_cfg.port}/{db_cfg.database}"
+        self.fingerprint: str | None = None
+
+    def restore(self, cache: SchemaCache) -> bool:
+        """Seed `cache` from the snapshot; returns True on a fingerprint match."""
+        self.fingerprint = cache.adapter.catalog_fingerprint()
+        if self.fingerprint is None:
+            return False
+
+        entry = self._read().get(self.key)
+        if (
+            not entry
+            or entry.get("version") != SNAPSHOT_VERSION
+            or entry.get("fingerprint") != self.fingerprint
+        ):
+            return False
+
+        cache.seed(
+            tables=entry["tables"],
+            enums=(
+                [EnumType(**e) for e in entry["enums"]]
+                if entry["enums"] is not None
+                else None
+            ),
+            schemas={
+                name: table_schema_from_dict(s) for name, s in entry["schemas"].items()
+            },
+        )
+        return True
+
+    def save(self, cache: SchemaCache):
+        """Write everything the cache has discovered so far."""
+        if self.fingerprint is None:
+            return
+
+        data = self._read()
+        data[self.key] = {
+            "version": SNAPSHOT_VERSION,
+            "fingerprint": self.fingerprint,
+            "tables": cache.tables,
+            "enums": (
+                [asdict(e) for e in cache.enums] if cache.enums is not None else None
+            ),
+            "schemas": {name: asdict(s) for name, s in cache.schemas.items()},
+        }
+
+        # Write-then-rename so a crash never leaves a half-written snapshot
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2))
+        os.replace(tmp, self.path)
+
+    def _read(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
@@ -0,0 +1,131 @@
+import re
+from dataclasses import replace
+from typing import Dict, List
+
+from dbferry.core.config import TableSubset
+from dbferry.core.console import Printer as p
+from dbferry.core.schema import (
+    ForeignKeySchema,
+    IndexSchema,
+    SchemaCache,
+    TableSchema,
+)
+
+
+def apply_subsets(
+    cache: SchemaCache, tables: List[str], subsets: Dict[str, TableSubset]
+) -> List[TableSchema]:
+    """
+    Narrow the schemas of `tables` to their configured subset and put them
+    back in the cache for the rest of the run; returns them in `tables` order.
+
+    Excluded columns disappear from the schema, together with the keys,
+    indexes and foreign keys that use them, so they are never selected or
+    created. Each table's `row_filter` is its own `where` plus, for every
+    foreign key into a filtered table, a condition keeping only rows whose
+    parent row is copied. That follows the same parent → child edges as
+    `build_dependency_graph`, so filters cascade down FK chains.
+    """
+    schemas = {s.name: s for s in cache.load(tables)}
+    if not subsets:
+        return list(schemas.values())
+    for name in subsets:
+        if name not in schemas:
+            p.warn(f"options.subset: {name} is not among the selected tables.")
+
+    filters: Dict[str, str | None] = {}
+
+    def row_filter(name: str, visiting: frozenset) -> str | None:
+        if name not in filters:
+            schema = schemas[name]
+            subset = subsets.get(name)
+            clauses = [f"({subset.where})"] if subset and subset.where else []
+            for fk in schema.foreign_keys or []:
+                parent = fk.ref_table
+                # Cycles and self-references have no parent-first order to follow
+                if parent == name or parent not in schemas or parent in visiting:
+                    continue
+                parent_filter = row_filter(parent, visiting | {name})
+                if parent_filter:
+                    clauses.append(_references(fk, parent_filter))
+            filters[name] = " AND ".join(clauses) or None
+        return filters[name]
+
+    narrowed = {
+        name: _project(schema, subsets.get(name)) for name, schema in schemas.items()
+    }
+    for name, schema in narrowed.items():
+        if any(fk.ref_table == name for fk in schema.foreign_keys or []) and (
+            subsets.get(name) and subsets[name].where
+        ):
+            p.warn(
+                f"{name} references itself; rows whose parent is filtered out "
+                "will fail foreign key validation."
+            )
+        foreign_keys = []
+        for fk in schema.foreign_keys or []:
+            parent = narrowed.get(fk.ref_table)
+            if parent and not set(fk.ref_columns) <= {c.name for c in parent.columns}:
+                p.warn(
+                    f"Dropping foreign key {name}({', '.join(fk.columns)}): "
+                    f"{fk.ref_table}({', '.join(fk.ref_columns)}) is excluded."
+                )
+                continue
+            foreign_keys.append(fk)
+        narrowed[name] = replace(
+            schema,
+            foreign_keys=foreign_keys,
+            row_filter=row_filter(name, frozenset()),
+        )
+
+    cache.override(list(narrowed.values()))
+    return [narrowed[name] for name in schemas]
+
+
+def _project(schema: TableSchema, subset: TableSubset | None) -> TableSchema:
+    """Drop excluded columns and every key or index that needs one of them."""
+    if not subset or not (subset.columns or subset.exclude_columns):
+        return schema
+    names = [c.name for c in schema.columns]
+    unknown = set(subset.columns or subset.exclude_columns) - set(names)
+    if unknown:
+        raise ValueError(
+            f"subset.{schema.name}: no column(s) {', '.join(sorted(unknown))}"
+        )
+    if subset.columns:
+        keep = set(subset.columns)
+    else:
+        keep = set(names) - set(subset.exclude_columns)
+    dropped = set(names) - keep
+    if dropped & set(schema.primary_key or []):
+        raise ValueError(f"subset.{schema.name}: primary key columns can't be excluded")
+
+    return replace(
+        schema,
+        columns=[c for c in schema.columns if c.name in keep],
+        unique_keys=[uk for uk in schema.unique_keys or [] if set(uk.columns) <= keep],
+        foreign_keys=[
+            fk for fk in schema.foreign_keys or [] if set(fk.columns) <= keep
+        ],
+        indexes=[ix for ix in schema.indexes or [] if _index_kept(ix, dropped)],
+    )
+
+
+def _references(fk: ForeignKeySchema, parent_filter: str) -> str:
+    """Keep rows whose key is NULL or points at a parent row that is kept."""
+    cols = ", ".join(f'"{c}"' for c in fk.columns)
+    ref_cols = ", ".join(f'"{c}"' for c in fk.ref_columns)
+    nulls = " OR ".join(f'"{c}" IS NULL' for c in fk.columns)
+    key = cols if len(fk.columns) == 1 else f"({cols})"
+    return (
+        f"({nulls} OR {key} IN "
+        f'(SELECT {ref_cols} FROM "{fk.ref_table}" WHERE {parent_filter}))'
+    )
+
+
+def _index_kept(index: IndexSchema, dropped: set[str]) -> bool:
+    columns = index.plain_columns()
+    if columns is not None:
+        return not dropped & set(columns)
+    # Expression or partial index: keep it unless it names a dropped column
+    return not any(re.search(rf"\b{re.escape(n)}\b", index.definition) for n in dropped)
@@ -0,0 +1,130 @@
+import time
+
+from dbferry.core.batching import BatchSizer
+from dbferry.core.checkpoint import CheckpointJournal
+from dbferry.core.chunking import Chunk
+from dbferry.core.console import Printer as p
+from dbferry.core.config import MigrationConfig
+from dbferry.core.connection import ConnectionManager
+from dbferry.core.migrate import resolve_table_order
+from dbferry.core.pipe import prefetch
+from dbferry.core.schema import SchemaCache, TableSchema
+from dbferry.core.snapshot import SchemaSnapshot
+from dbferry.core.subset import apply_subsets
+
+
+class SyncManager:
+    """
+    Incremental passes after an initial migration.
+
+    Each table is tracked by a watermark column (see
+    `TableSchema.watermark_column`). A pass reads the source's current maximum
+    first, copies every row at or past the stored watermark and upserts it on
+    the primary key, then stores that maximum once the target has committed.
+    Rows sitting exactly on the watermark are copied again, which is harmless
+    for an upsert. Deletes are not propagated.
+    """
+
+    def __init__(self, config: MigrationConfig):
+        self.config = config
+        self.conn_mgr = ConnectionManager()
+        self.source = self.conn_mgr.get_adapter(self.config.source)
+        self.target = self.conn_mgr.get_adapter(self.config.target)
+        self.schemas = SchemaCache(self.source)
+        self.journal: CheckpointJournal | None = None
+
+    def run(self) -> bool:
+        p.panel(title="Sync", message="Starting incremental sync...")
+        results = []
+        try:
+            self.conn_mgr.attach(self.source)
+            self.conn_mgr.attach(self.target)
+            self.journal = CheckpointJournal.open(
+                self.config,
+                resume=True,
+                start_over="run `dbferry migrate` for this pair",
+            )
+
+            snapshot = None
+            if self.config.options.schema_snapshot:
+                snapshot = SchemaSnapshot(self.config.source)
+                snapshot.restore(self.schemas)
+
+            tables = self.schemas.select(self.config.options.tables)
+            self.schemas.load(tables)
+            if snapshot:
+                snapshot.save(self.schemas)
+            schemas = apply_subsets(self.schemas, tables, self.config.options.subset)
+
+            # Parents first, so upserted children always find their rows
+            for table in resolve_table_order(schemas):
+                if table not in tables:
+                    continue
+                results.append(self.sync_table(self.schemas.get(table)))
+        finally:
+            self.conn_mgr.close()
+            if self.journal:
+                self.journal.close()
+
+        p.table(
+            title="Sync Summary",
+            columns=["Table", "Rows upserted", "Watermark"],
+            rows=[[name, str(rows), str(mark)] for name, rows, mark, _ in results],
+        )
+        return all(ok for *_, ok in results)
+
+    def sync_table(self, schema: TableSchema) -> tuple[str, int, object, bool]:
+        """Run one pass over a table; returns (name, rows, watermark, ok)."""
+        table = schema.name
+        column = schema.watermark_column(self.config.options.watermarks.get(table))
+        if not schema.primary_key or not column:
+            p.warn(
+                f"Skipping {table}: sync needs a primary key and a watermark column "
+                "(set options.watermarks)."
+            )
+            return table, 0, None, True
+        if self.journal.table_status(table) not in (None, "done"):
+            p.warn(
+                f"Skipping {table}: finish it with `dbferry migrate --resume` first."
+            )
+            return table, 0, None, False
+
+        since = self.journal.get_watermark(table, column)
+        try:
+            if since is None:
+                # Never migrated or synced: this pass copies the whole table
+                self.target.create_table(schema, enums=self.schemas.list_enum_types())
+            mark = self.source.max_value(table, column)
+            chunk = Chunk(column=column, lower=since) if since is not None else None
+
+            rows = 0
+            self.target.set_autocommit(False)
+            try:
+                sizer = BatchSizer.for_table(self.config.options, self.source, table)
+                batches = self.source.stream_rows(
+                    schema,
+                    batch_size=sizer or self.config.options.batch_size,
+                    chunk=chunk,
+                )
+                for batch in prefetch(batches, self.config.options.queue_depth):
+                    started = time.perf_counter()
+                    self.target.upsert_rows(table, batch, schema.primary_key)
+                    if sizer:
+                        elapsed = time.perf_counter() - started
+                        sizer.observe("write", len(batch), elapsed)
+                    rows += len(batch)
+                self.target.conn.commit()
+            except Exception:
+                self.target.conn.rollback()
+                raise
+            finally:
+                self.target.set_autocommit(True)
+        except Exception as e:
+            p.error(f"Failed to sync table {table}: {e}")
+            return table, 0, since, False
+
+        if mark is not None:
+            self.journal.save_watermark(table, column, mark)
+        scope = f"{column} ≥ {since}" if since is not None else "full pass"
+        p.success(f"Synced {rows} rows for {table} ({scope}).")
+        return table, rows, mark if mark is not None else since, True
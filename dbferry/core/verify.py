@@ -0,0 +1,267 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List
+
+from dbferry.core.schema import TableSchema
+
+
+@dataclass
+class TableDiff:
+    """Outcome of checksumming one table on both sides."""
+
+    table: str
+    matched: bool = True
+    source_rows: int = 0
+    target_rows: int = 0
+    missing: List[tuple] = field(default_factory=list)  # in source only
+    extra: List[tuple] = field(default_factory=list)  # in target only
+    changed: List[tuple] = field(default_factory=list)  # same key, other values
+    ranges_checked: int = 0
+    note: str = ""
+
+
+class ChecksumVerifier:
+    """
+    Compares table contents by digest instead of by row count.
+
+    Each primary key range is summarised server-side as (count, digest) on
+    both databases. Ranges that differ are bisected on their median key until
+    they hold at most `leaf_rows` rows, then per-row digests pinpoint the
+    exact keys that are missing, extra or changed. Only digests and keys
+    ever cross the network.
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        target: Any,
+        chunks: int = 16,
+        leaf_rows: int = 1000,
+        max_diffs: int = 100,
+    ):
+        self.source = source
+        self.target = target
+        self.chunks = chunks
+        self.leaf_rows = leaf_rows
+        self.max_diffs = max_diffs
+
+    def verify_table(self, schema: TableSchema) -> TableDiff:
+        diff = TableDiff(table=schema.name)
+
+        if not schema.primary_key:
+            # Without a key there is nothing to bisect on; compare whole tables
+            src = self.source.range_digest(schema)
+            tgt = self.target.range_digest(_unfiltered(schema))
+            diff.source_rows, diff.target_rows = src[0], tgt[0]
+            diff.ranges_checked = 1
+            diff.matched = src == tgt
+            diff.note = "no primary key; compared whole-table digest only"
+            return diff
+
+        for lower, upper in self._initial_ranges(schema):
+            self._compare(schema, lower, upper, diff, top=True)
+        return diff
+
+    def _initial_ranges(self, schema: TableSchema) -> List[tuple]:
+        """Start from the source's key ranges so large tables don't rescan."""
+        ranges = [
+            c
+            for c in self.source.key_ranges(schema, self.chunks)
+            if c.column == schema.primary_key[0] and len(schema.primary_key) == 1
+        ]
+        if not ranges:
+            return [(None, None)]
+        return [
+            (
+                (c.lower,) if c.lower is not None else None,
+                (c.upper,) if c.upper is not None else None,
+            )
+            for c in ranges
+        ]
+
+    def _compare(
+        self,
+        schema: TableSchema,
+        lower: tuple | None,
+        upper: tuple | None,
+        diff: TableDiff,
+        top: bool = False,
+    ):
+        src_count, src_digest = self.source.range_digest(schema, lower, upper)
+        tgt_count, tgt_digest = self.target.range_digest(
+            _unfiltered(schema), lower, upper
+        )
+        diff.ranges_checked += 1
+        if top:
+            diff.source_rows += src_count
+            diff.target_rows += tgt_count
+
+        if (src_count, src_digest) == (tgt_count, tgt_digest):
+            return
+        diff.matched = False
+        if self._full(diff):
+            return
+
+        if max(src_count, tgt_count) <= self.leaf_rows:
+            self._diff_rows(schema, lower, upper, diff)
+            return
+
+        # Bisect on the median key of whichever side holds more rows
+        side, count = (
+            (self.source, src_count)
+            if src_count >= tgt_count
+            else (self.target, tgt_count)
+        )
+        split_schema = _unfiltered(schema) if side is self.target else schema
+        mid = side.split_key(split_schema, lower, upper, count // 2)
+        if mid is None:
+            self._diff_rows(schema, lower, upper, diff)
+            return
+        self._compare(schema, lower, mid, diff)
+        self._compare(schema, mid, upper, diff)
+
+    def _diff_rows(
+        self,
+        schema: TableSchema,
+        lower: tuple | None,
+        upper: tuple | None,
+        diff: TableDiff,
+    ):
+        src = self.source.row_digests(schema, lower, upper)
+        tgt = self.target.row_digests(_unfiltered(schema), lower, upper)
+
+        for key in sorted(src.keys() - tgt.keys()):
+            self._record(diff.missing, key)
+        for key in sorted(tgt.keys() - src.keys()):
+            self._record(diff.extra, key)
+        for key in sorted(src.keys() & tgt.keys()):
+            if src[key] != tgt[key]:
+                self._record(diff.changed, key)
+
+    def _record(self, bucket: List[tuple], key: tuple):
+        if len(bucket) < self.max_diffs:
+            bucket.append(key)
+
+    def _full(self, diff: TableDiff) -> bool:
+        """Stop drilling down once enough differing rows have been found."""
+        found = len(diff.missing) + len(diff.extra) + len(diff.changed)
+        return found >= self.max_diffs
+
+
+def _unfiltered(schema: TableSchema) -> TableSchema:
+    """The target only holds the subset, so its side compares every row."""
+    return replace(schema, row_filter=None) if schema.row_filter else schema
+
+
+@dataclass
+class RowCount:
+    table: str
+    source: int | None = None
+    target: int | None = None
+    exact: bool = True
+    error: str | None = None
+
+    @property
+    def matched(self) -> bool:
+        # Estimates are only kept when they agree within the tolerance
+        if self.error is not None:
+            return False
+        return not self.exact or self.source == self.target
+
+
+class RowCounter:
+    """
+    Counts rows on both databases at once, across tables and across sides,
+    each worker thread holding its own connection per database.
+
+    In fast mode, statistics estimates are compared first and exact
+    `COUNT(*)`s only run for tables whose estimates differ by more than
+    `tolerance` (a fraction of the larger estimate).
+    `filters` are the row filters of subset tables, applied to the source
+    count; those tables are always counted exactly.
+    """
+
+    def __init__(
+        self,
+        connect_source: Callable[[], Any],
+        connect_target: Callable[[], Any],
+        workers: int = 8,
+        fast: bool = False,
+        tolerance: float = 0.01,
+        filters: Dict[str, str] | None = None,
+        release: Callable[[Any], None] | None = None,
+    ):
+        self.connect = {"source": connect_source, "target": connect_target}
+        self.release = release or (lambda adapter: adapter.close())
+        self.filters = filters or {}
+        self.workers = max(1, workers)
+        self.fast = fast
+        self.tolerance = tolerance
+        self._local = threading.local()
+        self._adapters: List[Any] = []
+        self._lock = threading.Lock()
+
+    def count(self, tables: List[str]) -> List[RowCount]:
+        results = {t: RowCount(table=t) for t in tables}
+        try:
+            pending = list(tables)
+            if self.fast:
+                pending = self._apply_estimates(results)
+
+            with ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="dbferry-count"
+            ) as pool:
+                jobs = [
+                    (results[t], side, pool.submit(self._count, side, t))
+                    for t in pending
+                    for side in ("source", "target")
+                ]
+                for result, side, job in jobs:
+                    try:
+                        setattr(result, side, job.result())
+                        result.exact = True
+                    except Exception as e:
+                        result.error = str(e)
+        finally:
+            for adapter in self._adapters:
+                self.release(adapter)
+
+        return [results[t] for t in tables]
+
+    def _apply_estimates(self, results: Dict[str, RowCount]) -> List[str]:
+        """Fill in agreeing estimates; return the tables that need exact counts."""
+        tables = list(results)
+        estimates = {
+            side: self._adapter(side).estimate_rows(tables)
+            for side in ("source", "target")
+        }
+
+        pending = []
+        for t in tables:
+            src, tgt = estimates["source"].get(t), estimates["target"].get(t)
+            if (
+                t in self.filters
+                or src is None
+                or tgt is None
+                or abs(src - tgt) > self.tolerance * max(src, tgt)
+            ):
+                pending.append(t)
+            else:
+                results[t].source, results[t].target = src, tgt
+                results[t].exact = False
+        return pending
+
+    def _count(self, side: str, table: str) -> int:
+        where = self.filters.get(table) if side == "source" else None
+        return self._adapter(side).count_rows(table, where)
+
+    def _adapter(self, side: str):
+        adapters = getattr(self._local, "adapters", None)
+        if adapters is None:
+            adapters = self._local.adapters = {}
+        if side not in adapters:
+            adapters[side] = self.connect[side]()
+            with self._lock:
+                self._adapters.append(adapters[side])
+        return adapters[side]
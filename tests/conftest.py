@@ -0,0 +1,32 @@
+import pytest
+
+from dbferry.core.config import DBConfig, MigrationConfig, OptionsConfig
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Run every test in its own directory, where dbferry writes its run files."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def sqlite_db(path) -> DBConfig:
+    return DBConfig(
+        type="sqlite",
+        host="",
+        port=None,
+        database=str(path),
+        user="",
+        password="",
+        sslmode="",
+    )
+
+
+@pytest.fixture
+def sqlite_config(workdir) -> MigrationConfig:
+    """SQLite → SQLite config with files in the test's directory."""
+    return MigrationConfig(
+        source=sqlite_db(workdir / "source.db"),
+        target=sqlite_db(workdir / "target.db"),
+        options=OptionsConfig(schema_snapshot=False),
+    )
@@ -0,0 +1,37 @@
+import pytest
+
+from dbferry.core.adapters.base import literal_default, with_row_filter
+
+
+@pytest.mark.parametrize(
+    "default, literal",
+    [
+        (None, None),
+        ("true", "1"),
+        ("false::boolean", "0"),
+        ("42", "42"),
+        ("'-1.5'::numeric", "'-1.5'"),
+        ("0.25", "0.25"),
+        ("'draft'::character varying", "'draft'"),
+        ("nextval('t_id_seq'::regclass)", None),
+        ("now()", None),
+        ("CURRENT_TIMESTAMP", None),
+    ],
+)
+def test_literal_default(default, literal):
+    assert literal_default(default) == literal
+
+
+def test_with_row_filter_without_filter():
+    assert with_row_filter('"id" >= %s', None) == '"id" >= %s'
+
+
+def test_with_row_filter_ands_filter():
+    assert with_row_filter("TRUE", "active") == "(active) AND TRUE"
+
+
+def test_with_row_filter_escapes_percent_for_pyformat():
+    where = with_row_filter("TRUE", "name LIKE 'a%'")
+    assert where == "(name LIKE 'a%%') AND TRUE"
+    where = with_row_filter("TRUE", "name LIKE 'a%'", paramstyle="qmark")
+    assert where == "(name LIKE 'a%') AND TRUE"
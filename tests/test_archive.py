@@ -0,0 +1,106 @@
+import sqlite3
+
+from dbferry.core.archive import (
+    IMPORT_MARKERS,
+    MANIFEST_FILE,
+    ExportManager,
+    ImportManager,
+)
+from dbferry.core.checkpoint import IMPORT_JOURNAL_FILE, CheckpointJournal
+
+
+def _seed(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE parent (
+            id INTEGER PRIMARY KEY,
+            name VARCHAR(20) NOT NULL,
+            data BLOB,
+            flag BOOLEAN
+        );
+        CREATE TABLE child (
+            id INTEGER PRIMARY KEY,
+            parent_id INTEGER REFERENCES parent (id),
+            note TEXT
+        );
+        CREATE INDEX child_note ON child (note);
+        """
+    )
+    conn.executemany(
+        "INSERT INTO parent VALUES (?, ?, ?, ?)",
+        [(i, f"p{i}", bytes([i % 256]) * 3, i % 2) for i in range(1, 251)],
+    )
+    conn.executemany(
+        "INSERT INTO child VALUES (?, ?, ?)",
+        [(i, i % 250 + 1, None if i % 3 else f"c{i}") for i in range(1, 501)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _rows(path, table):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT * FROM {table} ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def test_export_import_round_trip(sqlite_config, workdir):
+    source, target = sqlite_config.source.database, sqlite_config.target.database
+    _seed(source)
+
+    export = ExportManager(sqlite_config, workdir / "export", chunk_rows=100, workers=2)
+    assert export.run()
+    assert (workdir / "export" / MANIFEST_FILE).exists()
+
+    assert ImportManager(sqlite_config, workdir / "export").run()
+    for table in ("parent", "child"):
+        assert _rows(target, table) == _rows(source, table)
+
+    conn = sqlite3.connect(target)
+    indexes = [r[1] for r in conn.execute("PRAGMA index_list(child)")]
+    conn.close()
+    assert "child_note" in indexes
+
+    # Progress went to import's own journal; resuming loads nothing twice
+    assert (workdir / IMPORT_JOURNAL_FILE).exists()
+    assert ImportManager(sqlite_config, workdir / "export", resume=True).run()
+    assert len(_rows(target, "child")) == 500
+
+
+def test_import_rejects_corrupt_chunk(sqlite_config, workdir):
+    _seed(sqlite_config.source.database)
+    ExportManager(sqlite_config, workdir / "export", chunk_rows=100, workers=1).run()
+    chunk = next((workdir / "export" / "tables").rglob("*.jsonl.gz"))
+    chunk.write_bytes(chunk.read_bytes()[:-4] + b"\0\0\0\0")
+
+    assert not ImportManager(sqlite_config, workdir / "export").run()
+
+
+def test_resume_after_crash_between_commit_and_journal(
+    sqlite_config, workdir, monkeypatch
+):
+    source, target = sqlite_config.source.database, sqlite_config.target.database
+    _seed(source)
+    ExportManager(sqlite_config, workdir / "export", chunk_rows=100, workers=1).run()
+
+    save_progress = CheckpointJournal.save_progress
+
+    def crash_once(self, table, chunk_id, rows, last_key=None, done=False):
+        if table == "child" and done:
+            monkeypatch.setattr(CheckpointJournal, "save_progress", save_progress)
+            raise RuntimeError("killed")
+        return save_progress(self, table, chunk_id, rows, last_key, done)
+
+    monkeypatch.setattr(CheckpointJournal, "save_progress", crash_once)
+    assert not ImportManager(sqlite_config, workdir / "export").run()
+
+    # The chunk committed with its marker, so resuming doesn't load it again
+    assert ImportManager(sqlite_config, workdir / "export", resume=True).run()
+    assert _rows(target, "child") == _rows(source, "child")
+    conn = sqlite3.connect(target)
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+    conn.close()
+    assert IMPORT_MARKERS.name not in tables
@@ -0,0 +1,62 @@
+from dbferry.core.batch import Batch, Converters, typed
+from dbferry.core.schema import ColumnSchema, TableSchema
+
+
+def _schema() -> TableSchema:
+    return TableSchema(
+        name="t",
+        columns=[
+            ColumnSchema("id", "integer", False),
+            ColumnSchema("name", "text", True),
+            ColumnSchema("score", "numeric", True),
+        ],
+        primary_key=["id"],
+    )
+
+
+def test_types_follow_batch_column_order():
+    batch = Batch(["name", "id", "extra"], [], _schema())
+    assert batch.types() == ["text", "integer", ""]
+    assert Batch(["id"], []).types() == [""]
+
+
+def test_last_key_and_dicts():
+    batch = Batch(["id", "name"], [(1, "a"), (2, "b")], _schema())
+    assert batch.last_key(["id"]) == (2,)
+    assert batch.last_key(["name", "id"]) == ("b", 2)
+    assert batch.to_dicts()[1] == {"id": 2, "name": "b"}
+
+
+def test_converted_applies_converters_per_column():
+    batch = Batch(["id", "name"], [(1, "a"), (2, None)], _schema())
+    rows = batch.converted([None, lambda v: v and v.upper()])
+    assert rows == [(1, "A"), (2, None)]
+    # Nothing to convert: the rows themselves come back, uncopied
+    assert batch.converted([None, None]) is batch.rows
+
+
+def test_converters_compile_once_per_table_and_columns():
+    compiled = []
+
+    def compile(column_type):
+        compiled.append(column_type)
+        return str if column_type == "integer" else None
+
+    converters = Converters(compile)
+    batch = Batch(["id", "name"], [(1, "a")], _schema())
+    assert converters("t", batch) == [str, None]
+    assert converters("t", Batch(["id", "name"], [(2, "b")], _schema())) == [
+        str,
+        None,
+    ]
+    assert compiled == ["integer", "text"]
+
+    converters("t", Batch(["name"], [], _schema()))
+    assert compiled == ["integer", "text", "text"]
+
+
+def test_typed_takes_fast_path_for_exact_types_only():
+    convert = typed((int,), fast=lambda v: f"int:{v}", fallback=repr)
+    assert convert(3) == "int:3"
+    assert convert(True) == "True"  # bool is not exactly int
+    assert convert(None) == "None"
@@ -0,0 +1,73 @@
+from dbferry.core.batching import BatchSizer
+from dbferry.core.config import OptionsConfig
+
+
+class _Source:
+    def __init__(self, row_bytes):
+        self.row_bytes = row_bytes
+
+    def avg_row_width(self, table):
+        return self.row_bytes
+
+
+def test_first_batch_sized_from_row_width():
+    sizer = BatchSizer(target_seconds=0.5, max_bytes=64 * 1024**2, row_bytes=1024)
+    assert sizer() == BatchSizer.START_BYTES // 1024
+
+
+def test_without_row_width_starts_from_initial():
+    sizer = BatchSizer(target_seconds=0.5, max_bytes=64 * 1024**2, initial=250)
+    assert sizer() == 250
+
+
+def test_grows_at_most_max_step_per_batch():
+    sizer = BatchSizer(target_seconds=0.5, max_bytes=1024**3, initial=100)
+    # Far faster than the target: wants a much bigger batch
+    sizer.observe("fetch", 100, 0.001)
+    assert sizer() == 100 * BatchSizer.MAX_STEP
+
+
+def test_shrinks_at_most_max_step_per_batch():
+    sizer = BatchSizer(target_seconds=0.5, max_bytes=1024**3, initial=1000)
+    sizer.observe("write", 1000, 100.0)
+    assert sizer() == 1000 / BatchSizer.MAX_STEP
+
+
+def test_follows_the_slower_side():
+    sizer = BatchSizer(target_seconds=1.0, max_bytes=1024**3, initial=1000)
+    sizer.observe("fetch", 1000, 0.5)  # 2000 rows/s: wants 2000
+    sizer.observe("write", 1000, 1.0)  # 1000 rows/s: wants 1000
+    assert sizer() == 1000
+
+
+def test_batch_bytes_capped():
+    sizer = BatchSizer(target_seconds=10.0, max_bytes=8 * 1024**2, initial=100)
+    # Fast enough for MAX_ROWS, but 64 rows of 128 KiB fill max_bytes
+    sizer.observe("write", 100, 0.01, nbytes=100 * 128 * 1024)
+    assert sizer() == 64
+
+
+def test_clamped_to_bounds():
+    sizer = BatchSizer(target_seconds=0.5, max_bytes=1024**3, initial=10**9)
+    assert sizer() == BatchSizer.MAX_ROWS
+    sizer = BatchSizer(target_seconds=0.5, max_bytes=1024**3, initial=0)
+    assert sizer() == BatchSizer.MIN_ROWS
+
+
+def test_empty_batches_are_ignored():
+    sizer = BatchSizer(target_seconds=0.5, max_bytes=1024**3, initial=100)
+    sizer.observe("fetch", 0, 5.0)
+    assert sizer() == 100
+    assert sizer.row_seconds == {}
+
+
+def test_for_table_follows_options():
+    assert (
+        BatchSizer.for_table(OptionsConfig(adaptive_batching=False), None, "t") is None
+    )
+
+    options = OptionsConfig(batch_target_ms=250, batch_max_mb=8, batch_size=500)
+    sizer = BatchSizer.for_table(options, _Source(None), "t")
+    assert sizer.target_seconds == 0.25
+    assert sizer.max_bytes == 8 * 1024**2
+    assert sizer() == 500
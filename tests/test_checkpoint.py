@@ -0,0 +1,95 @@
+from dataclasses import replace
+
+import pytest
+
+from dbferry.core.checkpoint import WHOLE_TABLE, CheckpointJournal
+from dbferry.core.chunking import Chunk
+
+
+def _open(config, resume, **kwargs) -> CheckpointJournal:
+    return CheckpointJournal.open(config, resume=resume, **kwargs)
+
+
+def _record_run(config):
+    journal = _open(config, resume=False)
+    journal.save_plan("orders", [Chunk("id", None, 100), Chunk("id", 100, None)])
+    journal.save_progress("orders", "id:None:100", rows=100, done=True)
+    journal.save_progress("orders", "id:100:None", rows=40, last_key=[140])
+    journal.mark_table("users", "done")
+    journal.save_watermark("orders", "id", 140)
+    journal.save_watermark("users", "id", 7)
+    journal.close()
+
+
+def test_resume_keeps_progress(sqlite_config):
+    _record_run(sqlite_config)
+    journal = _open(sqlite_config, resume=True)
+    assert journal.table_status("users") == "done"
+    assert journal.load_plan("orders") == [
+        Chunk("id", None, 100),
+        Chunk("id", 100, None),
+    ]
+    assert journal.chunk_state("orders", "id:None:100") == (True, True, 100)
+    assert journal.chunk_state("orders", "id:100:None") == (True, False, 40)
+    assert journal.chunk_state("orders", WHOLE_TABLE) == (False, False, 0)
+
+
+def test_fresh_run_resets_progress_but_keeps_watermarks(sqlite_config):
+    _record_run(sqlite_config)
+    journal = _open(sqlite_config, resume=False)
+    assert journal.table_status("users") is None
+    assert journal.load_plan("orders") is None
+    assert journal.chunk_state("orders", "id:None:100") == (False, False, 0)
+    assert journal.get_watermark("orders", "id") == 140
+    assert journal.get_watermark("users", "id") == 7
+
+
+def test_clear_watermarks_only_touches_given_tables(sqlite_config):
+    _record_run(sqlite_config)
+    journal = _open(sqlite_config, resume=False)
+    journal.clear_watermarks(["orders"])
+    assert journal.get_watermark("orders", "id") is None
+    assert journal.get_watermark("users", "id") == 7
+
+
+def test_watermark_on_another_column_does_not_count(sqlite_config):
+    journal = _open(sqlite_config, resume=False)
+    journal.save_watermark("orders", "id", 5)
+    assert journal.get_watermark("orders", "updated_at") is None
+
+
+def test_other_pair_is_refused_on_resume(sqlite_config, workdir):
+    _record_run(sqlite_config)
+    other = replace(
+        sqlite_config,
+        target=replace(sqlite_config.target, database=str(workdir / "other.db")),
+    )
+    with pytest.raises(ValueError, match="rerun without --resume"):
+        _open(other, resume=True)
+    with pytest.raises(ValueError, match="run `dbferry migrate`"):
+        _open(other, resume=True, start_over="run `dbferry migrate` for this pair")
+
+
+def test_fresh_run_for_other_pair_drops_watermarks(sqlite_config, workdir):
+    _record_run(sqlite_config)
+    other = replace(
+        sqlite_config,
+        target=replace(sqlite_config.target, database=str(workdir / "other.db")),
+    )
+    journal = _open(other, resume=False)
+    assert journal.get_watermark("users", "id") is None
+
+
+def test_journals_at_separate_paths_are_independent(sqlite_config, workdir):
+    _record_run(sqlite_config)
+    other = _open(sqlite_config, resume=False, path=workdir / "import.db")
+    assert other.table_status("users") is None
+    assert _open(sqlite_config, resume=True).table_status("users") == "done"
+
+
+def test_clear_chunks_keeps_plan(sqlite_config):
+    _record_run(sqlite_config)
+    journal = _open(sqlite_config, resume=True)
+    journal.clear_chunks("orders")
+    assert journal.chunk_state("orders", "id:None:100") == (False, False, 0)
+    assert len(journal.load_plan("orders")) == 2
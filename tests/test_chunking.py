@@ -0,0 +1,30 @@
+from dbferry.core.chunking import Chunk
+
+
+def test_predicate_closed_range():
+    chunk = Chunk(column="id", lower=10, upper=20)
+    assert chunk.predicate() == ('"id" >= %s AND "id" < %s', (10, 20))
+
+
+def test_predicate_open_ends():
+    assert Chunk(column="id", upper=5).predicate() == ('"id" < %s', (5,))
+    assert Chunk(column="id", lower=5).predicate() == ('"id" >= %s', (5,))
+    assert Chunk(column="id").predicate() == ("TRUE", ())
+
+
+def test_predicate_casts_placeholders():
+    chunk = Chunk(column="ref", lower="a", upper="m", cast="uuid")
+    assert chunk.predicate() == (
+        '"ref" >= %s::uuid AND "ref" < %s::uuid',
+        ("a", "m"),
+    )
+
+
+def test_from_bounds_covers_key_space():
+    chunks = Chunk.from_bounds("id", [100, 200])
+    assert [(c.lower, c.upper) for c in chunks] == [
+        (None, 100),
+        (100, 200),
+        (200, None),
+    ]
+    assert len({c.id for c in chunks}) == 3
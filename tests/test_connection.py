@@ -0,0 +1,127 @@
+import asyncio
+import threading
+from dataclasses import replace
+
+import pytest
+
+from dbferry.core import connection
+from dbferry.core.connection import AsyncConnectionPool, ConnectionPool
+
+
+def _pool(config, **sizes) -> ConnectionPool:
+    return ConnectionPool(replace(config.source, **sizes))
+
+
+def test_released_connections_are_reused(sqlite_config):
+    pool = _pool(sqlite_config)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    pool.close()
+
+
+def test_min_size_opens_connections_up_front(sqlite_config):
+    pool = _pool(sqlite_config, pool_min_size=3)
+    first = pool.acquire()
+    assert len(pool._all) == 3
+    assert len(pool._idle) == 2
+    pool.release(first)
+    pool.close()
+
+
+def test_max_size_makes_callers_wait(sqlite_config):
+    pool = _pool(sqlite_config, pool_max_size=1)
+    held = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    waiter.join(0.1)
+    assert waiter.is_alive()
+
+    pool.release(held)
+    waiter.join(1)
+    assert got == [held]
+    pool.close()
+
+
+def test_acquire_times_out_when_pool_stays_full(sqlite_config, monkeypatch):
+    monkeypatch.setattr(connection, "ACQUIRE_TIMEOUT_S", 0.05)
+    pool = _pool(sqlite_config, pool_max_size=1)
+    pool.acquire()
+    with pytest.raises(RuntimeError, match="No free sqlite connection"):
+        pool.acquire()
+    pool.close()
+
+
+def test_dead_idle_connections_are_replaced(sqlite_config, monkeypatch):
+    monkeypatch.setattr(connection, "HEALTH_CHECK_AFTER_S", 0)
+    pool = _pool(sqlite_config)
+    dead = pool.acquire()
+    pool.release(dead)
+    dead.conn.close()
+
+    fresh = pool.acquire()
+    assert fresh is not dead
+    assert fresh.ping()
+    assert pool._all == [fresh]
+    pool.close()
+
+
+class _AsyncAdapter:
+    opened = 0
+
+    def __init__(self):
+        self.closed = False
+        self.broken = False
+
+    async def connect(self):
+        _AsyncAdapter.opened += 1
+
+    async def reset(self):
+        if self.broken:
+            raise RuntimeError("connection is closed")
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def async_pool():
+    _AsyncAdapter.opened = 0
+    return lambda size: AsyncConnectionPool(_AsyncAdapter, max_size=size)
+
+
+def test_async_pool_bounds_open_connections(async_pool):
+    busy = {"now": 0, "peak": 0}
+
+    async def unit(pool):
+        async with pool.connection():
+            busy["now"] += 1
+            busy["peak"] = max(busy["peak"], busy["now"])
+            await asyncio.sleep(0.01)
+            busy["now"] -= 1
+
+    async def main():
+        pool = async_pool(2)
+        await asyncio.gather(*(unit(pool) for _ in range(8)))
+        await pool.close()
+
+    asyncio.run(main())
+    assert busy["peak"] == 2
+    assert _AsyncAdapter.opened == 2
+
+
+def test_async_pool_replaces_broken_connections(async_pool):
+    async def main():
+        pool = async_pool(1)
+        async with pool.connection() as first:
+            first.broken = True
+        async with pool.connection() as second:
+            pass
+        await pool.close()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first is not second
+    assert first.closed and second.closed
+    assert _AsyncAdapter.opened == 2
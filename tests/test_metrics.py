@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from dbferry.core.metrics import BUCKETS, Histogram, RunMetrics
+
+
+def test_histogram_buckets_and_quantiles():
+    hist = Histogram()
+    for seconds in (0.0005, 0.002, 0.002, 0.2, 100):
+        hist.observe(seconds)
+    assert hist.count == 5
+    assert hist.counts[0] == 1  # <= 1ms
+    assert hist.counts[1] == 2  # <= 5ms
+    assert hist.counts[-1] == 1  # past the last bound
+    assert hist.quantile(0.5) == 0.005
+    assert hist.quantile(1.0) == float("inf")
+    assert Histogram().quantile(0.5) is None
+
+
+def test_timer_feeds_histograms_and_seconds():
+    metrics = RunMetrics()
+    with metrics.timer("t", "fetch") as lap:
+        pass
+    with metrics.timer("t", "ddl"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.timer("t", "write"):
+            raise RuntimeError("timed even when it fails")
+
+    t = metrics.table("t")
+    assert t.fetch.count == t.write.count == 1
+    assert lap.seconds >= 0
+    assert t.ddl_seconds > 0
+
+
+def test_timed_fetch_times_every_batch():
+    metrics = RunMetrics()
+    seen = []
+    batches = metrics.timed_fetch(
+        "t", iter([[1], [2, 3]]), observe=lambda b, s: seen.append(len(b))
+    )
+    assert list(batches) == [[1], [2, 3]]
+    assert seen == [1, 2]
+    # The final, empty fetch is timed too
+    assert metrics.table("t").fetch.count == 3
+
+
+def _run() -> RunMetrics:
+    metrics = RunMetrics()
+    with metrics.phase("data"):
+        metrics.record("a", rows=10, bytes=100, batches=2)
+        metrics.record("b", rows=5, bytes=50, batches=1)
+    metrics.set_status("a", "done")
+    metrics.set_status("b", "failed")
+    return metrics
+
+
+def test_json_report_totals(workdir):
+    _run().write_json(workdir / "report.json")
+    report = json.loads((workdir / "report.json").read_text())
+    assert report["totals"] == {"rows": 15, "bytes": 150, "batches": 3}
+    assert report["tables"]["b"]["status"] == "failed"
+    assert "data" in report["phases"]
+    assert not (workdir / "report.json.tmp").exists()
+
+
+def test_prometheus_exposition(workdir):
+    metrics = _run()
+    with metrics.timer("a", "write"):
+        pass
+    metrics.write_prometheus(workdir / "dbferry.prom")
+    lines = (workdir / "dbferry.prom").read_text().splitlines()
+
+    assert 'dbferry_table_rows{table="a"} 10' in lines
+    assert 'dbferry_table_failed{table="b"} 1' in lines
+    assert 'dbferry_table_failed{table="a"} 0' in lines
+    buckets = [
+        l for l in lines if l.startswith('dbferry_write_seconds_bucket{table="a"')
+    ]
+    assert len(buckets) == len(BUCKETS) + 1
+    assert buckets[-1].endswith(" 1")  # cumulative
+    assert 'dbferry_write_seconds_count{table="a"} 1' in lines
@@ -0,0 +1,139 @@
+from dbferry.core.checkpoint import CheckpointJournal
+from dbferry.core.chunking import Chunk
+from dbferry.core.migrate import MigrationManager
+from dbferry.core.schema import ColumnSchema, TableSchema
+
+
+class _Target:
+    def __init__(self):
+        self.truncated = []
+
+    def truncate_table(self, table_name):
+        self.truncated.append(table_name)
+
+
+def _manager(config) -> MigrationManager:
+    manager = MigrationManager(config, dry_run=False)
+    manager.journal = CheckpointJournal.open(config, resume=False)
+    return manager
+
+
+def _schema(primary_key) -> TableSchema:
+    return TableSchema(
+        name="events",
+        columns=[ColumnSchema("id", "integer", False)],
+        primary_key=primary_key,
+    )
+
+
+def test_half_done_ctid_chunk_restarts_the_table(sqlite_config):
+    manager = _manager(sqlite_config)
+    chunks = Chunk.from_bounds("ctid", ["(10,0)"], cast="tid")
+    manager.journal.save_progress("events", chunks[0].id, rows=5, done=True)
+    manager.journal.save_progress("events", chunks[1].id, rows=3)
+    target = _Target()
+
+    manager._restart_unkeyed_chunks(_schema([]), chunks, target)
+
+    assert target.truncated == ["events"]
+    assert manager.journal.chunk_state("events", chunks[0].id) == (False, False, 0)
+
+
+def test_finished_ctid_chunks_are_kept(sqlite_config):
+    manager = _manager(sqlite_config)
+    chunks = Chunk.from_bounds("ctid", ["(10,0)"], cast="tid")
+    manager.journal.save_progress("events", chunks[0].id, rows=5, done=True)
+    target = _Target()
+
+    manager._restart_unkeyed_chunks(_schema([]), chunks, target)
+
+    assert target.truncated == []
+    assert manager.journal.chunk_state("events", chunks[0].id)[1]
+
+
+def test_key_range_chunks_resume_in_place(sqlite_config):
+    manager = _manager(sqlite_config)
+    chunks = Chunk.from_bounds("id", [100])
+    manager.journal.save_progress("events", chunks[0].id, rows=3)
+    target = _Target()
+
+    manager._restart_unkeyed_chunks(_schema(["id"]), chunks, target)
+
+    assert target.truncated == []
+    assert MigrationManager._keyed(_schema(["id"]), chunks[0])
+    assert not MigrationManager._keyed(_schema(["id"]), Chunk("ctid"))
+    assert MigrationManager._keyed(_schema([]), None)
+
+
+class _Wide:
+    """Adapter stand-in for the wide value and large object paths."""
+
+    streams_large_values = True
+
+    def __init__(self, values=None, objects=()):
+        self.values = values or {}
+        self.objects = list(objects)
+        self.written = {}
+        self.reads = []
+        self.listed_for = []
+
+    def wide_columns(self, schema):
+        return ["doc"]
+
+    def stream_value(self, schema, column, key, piece_bytes, snapshot_id=None):
+        self.reads.append((key, snapshot_id))
+        value = self.values[key]
+        for offset in range(0, len(value), piece_bytes):
+            yield offset, value[offset : offset + piece_bytes]
+
+    def write_value(self, schema, column, key, pieces):
+        self.written[key] = b"".join(piece for _, piece in pieces)
+        return len(self.written[key])
+
+    def large_objects(self, schemas=None):
+        self.listed_for.append(schemas)
+        return self.objects
+
+
+def _wide_manager(config, source, target) -> MigrationManager:
+    config.options.wide_value_mb = 1
+    manager = _manager(config)
+    manager.source, manager.target = source, target
+    manager._connect = lambda db_cfg: source
+    manager.conn_mgr.release = lambda adapter: None
+    return manager
+
+
+def test_defer_over_needs_both_ends_and_a_key(sqlite_config):
+    source, target = _Wide(), _Wide()
+    manager = _wide_manager(sqlite_config, source, target)
+    assert manager._defer_over(_schema(["id"]), source, target) == 1024**2
+    assert manager._defer_over(_schema([]), source, target) is None
+
+    target.streams_large_values = False
+    assert manager._defer_over(_schema(["id"]), source, target) is None
+
+
+def test_fill_deferred_streams_values_in_the_given_snapshot(sqlite_config):
+    big = bytes(range(256)) * 10_000
+    source, target = _Wide(values={(1,): big, (2,): b"x"}), _Wide()
+    manager = _wide_manager(sqlite_config, source, target)
+
+    nbytes = manager._fill_deferred(
+        _schema(["id"]), target, {"doc": [(1,), (2,)]}, "snap-1"
+    )
+    assert target.written == {(1,): big, (2,): b"x"}
+    assert nbytes == len(big) + 1
+    assert source.reads == [((1,), "snap-1"), ((2,), "snap-1")]
+
+
+def test_large_objects_skip_those_already_on_target(sqlite_config):
+    source, target = _Wide(objects=[10, 11, 12]), _Wide(objects=[11])
+    manager = _wide_manager(sqlite_config, source, target)
+    copied = []
+    manager._copy_large_object = lambda oid: copied.append(oid) or 1
+
+    tables = [_schema(["id"])]
+    manager._copy_large_objects(tables)
+    assert sorted(copied) == [10, 12]
+    assert source.listed_for == [tables]
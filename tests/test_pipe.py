@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from dbferry.core.pipe import BoundedPipe, PipeAborted, prefetch, run_pipe
+
+
+def _drain(pipe: BoundedPipe, size: int = 7) -> bytes:
+    out = bytearray()
+    while data := pipe.read(size):
+        out += data
+    return bytes(out)
+
+
+def test_run_pipe_moves_every_byte():
+    chunks = [bytes([i]) * 100 for i in range(50)]
+
+    def produce(pipe):
+        for chunk in chunks:
+            pipe.write(chunk)
+
+    data, nbytes = run_pipe(produce, _drain, max_bytes=64)
+    assert data == b"".join(chunks)
+    assert nbytes == 5000
+
+
+def test_writer_blocks_once_buffer_is_full():
+    pipe = BoundedPipe(max_bytes=10)
+    pipe.write(b"x" * 10)
+    blocked = threading.Thread(target=pipe.write, args=(b"y",), daemon=True)
+    blocked.start()
+    blocked.join(0.1)
+    assert blocked.is_alive()
+
+    assert pipe.read(4) == b"xxxx"
+    blocked.join(1)
+    assert not blocked.is_alive()
+    pipe.close()
+    assert _drain(pipe) == b"xxxxxxy"
+
+
+def test_producer_error_is_raised_to_the_caller():
+    def produce(pipe):
+        pipe.write(b"partial")
+        raise ValueError("source went away")
+
+    with pytest.raises(ValueError, match="source went away"):
+        run_pipe(produce, _drain, max_bytes=1024)
+
+
+def test_consumer_error_stops_the_producer():
+    def produce(pipe):
+        while True:
+            pipe.write(b"z" * 16)
+
+    def consume(pipe):
+        pipe.read(16)
+        raise RuntimeError("target rejected a row")
+
+    with pytest.raises(RuntimeError, match="target rejected a row"):
+        run_pipe(produce, consume, max_bytes=32)
+
+
+def test_write_after_abort_raises():
+    pipe = BoundedPipe(max_bytes=4)
+    pipe.abort()
+    with pytest.raises(PipeAborted):
+        pipe.write(b"data")
+
+
+def test_prefetch_yields_batches_in_order():
+    assert list(prefetch(iter(range(100)), depth=3)) == list(range(100))
+
+
+def test_prefetch_reads_at_most_depth_ahead():
+    pulled = []
+
+    def batches():
+        for i in range(10):
+            pulled.append(i)
+            yield i
+
+    it = prefetch(batches(), depth=2)
+    assert next(it) == 0
+    time.sleep(0.2)
+    # One handed out, two queued and one waiting for room
+    assert len(pulled) == 4
+    assert list(it) == list(range(1, 10))
+
+
+def test_prefetch_reraises_reader_errors():
+    def batches():
+        yield 1
+        raise ConnectionError("source dropped")
+
+    it = prefetch(batches(), depth=4)
+    assert next(it) == 1
+    with pytest.raises(ConnectionError, match="source dropped"):
+        next(it)
+
+
+def test_prefetch_closes_source_when_caller_stops():
+    closed = threading.Event()
+
+    def batches():
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            closed.set()
+
+    it = prefetch(batches(), depth=2)
+    assert next(it) == 0
+    it.close()
+    assert closed.is_set()
@@ -0,0 +1,165 @@
+import datetime
+import decimal
+import uuid
+
+import pytest
+
+from dbferry.core.adapters.postgres import (
+    CopyUnsupported,
+    PostgresAdapter,
+    copy_converter,
+    copy_text,
+    encode_copy_rows,
+)
+from dbferry.core.batch import Batch
+from dbferry.core.schema import ColumnSchema, TableSchema
+
+
+@pytest.mark.parametrize(
+    "value, field",
+    [
+        (None, "\\N"),
+        (True, "t"),
+        (False, "f"),
+        (42, "42"),
+        (decimal.Decimal("1.50"), "1.50"),
+        (b"\x00\xff", "\\\\x00ff"),
+        (memoryview(b"ab"), "\\\\x6162"),
+        ("tab\there\nnew\\line\r", "tab\\there\\nnew\\\\line\\r"),
+        ("żółw ☃", "żółw ☃"),
+        (datetime.date(2024, 2, 29), "2024-02-29"),
+        (
+            datetime.timedelta(days=1, seconds=5, microseconds=7),
+            "1 days 5 seconds 7 microseconds",
+        ),
+        (
+            uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "12345678-1234-5678-1234-567812345678",
+        ),
+    ],
+)
+def test_copy_text(value, field):
+    assert copy_text(value) == field
+
+
+def test_copy_text_rejects_unrepresentable_values():
+    with pytest.raises(CopyUnsupported):
+        copy_text([1, 2])
+
+
+def test_typed_converters_fall_back_for_other_values():
+    as_int = copy_converter("integer")
+    assert as_int(7) == "7"
+    assert as_int(None) == "\\N"
+    as_bool = copy_converter("boolean")
+    assert (as_bool(True), as_bool(0)) == ("t", "f")
+    as_text = copy_converter("character varying")
+    assert as_text("a\tb") == "a\\tb"
+    assert as_text(None) == "\\N"
+
+
+def _schema() -> TableSchema:
+    return TableSchema(
+        name="t",
+        columns=[
+            ColumnSchema("id", "integer", False),
+            ColumnSchema("name", "text", True),
+            ColumnSchema("tags", "ARRAY", True),
+        ],
+    )
+
+
+def test_encode_copy_rows():
+    batch = Batch(["id", "name"], [(1, "a"), (2, None)], _schema())
+    converters = [copy_converter(t) for t in batch.types()]
+    assert encode_copy_rows(batch, converters) == "1\ta\n2\t\\N\n"
+
+
+class _Adapter(PostgresAdapter):
+    """PostgresAdapter that records what it would send instead of sending it."""
+
+    def __init__(self):
+        super().__init__(config=None)
+        self.sent = []
+
+    def copy_from(self, table_name, columns, source):
+        self.sent.append(("copy", source.read()))
+
+    def _insert_rows_executemany(self, table_name, batch):
+        self.sent.append(("executemany", batch.rows))
+
+
+def test_insert_rows_sends_utf8_byte_count():
+    adapter = _Adapter()
+    nbytes = adapter.insert_rows("t", Batch(["id", "name"], [(1, "☃")], _schema()))
+    assert adapter.sent == [("copy", "1\t☃\n")]
+    assert nbytes == len("1\t☃\n".encode())
+
+
+def test_insert_rows_falls_back_for_values_copy_cannot_encode():
+    adapter = _Adapter()
+    rows = [(1, "a", [1, 2])]
+    assert (
+        adapter.insert_rows("t", Batch(["id", "name", "tags"], rows, _schema())) is None
+    )
+    assert adapter.sent == [("executemany", rows)]
+
+
+def _wide_schema(**kwargs) -> TableSchema:
+    return TableSchema(
+        name="docs",
+        columns=[
+            ColumnSchema("id", "integer", False),
+            ColumnSchema("body", "bytea", True),
+            ColumnSchema("blob", "oid", True),
+        ],
+        primary_key=["id"],
+        **kwargs,
+    )
+
+
+def test_select_list_swaps_wide_values_for_placeholders():
+    cols = PostgresAdapter._select_list(_wide_schema(), ["body"], 1024**2)
+    assert cols.startswith('"id", CASE WHEN octet_length("body") > 1048576 ')
+    assert 'THEN \'\'::bytea ELSE "body" END AS "body"' in cols
+    assert cols.endswith(', "blob"')
+
+
+class _Cursor:
+    def __init__(self, executed):
+        self.executed = executed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append(sql)
+
+    def fetchall(self):
+        return [(7,)]
+
+
+class _Conn:
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self):
+        return _Cursor(self.executed)
+
+
+def test_large_objects_limited_to_referenced_oids():
+    adapter = PostgresAdapter(config=None)
+    adapter.conn = _Conn()
+
+    assert adapter.large_objects() == [7]
+    assert "WHERE" not in adapter.conn.executed[-1]
+
+    adapter.large_objects([_wide_schema(row_filter="id % 2 = 0")])
+    sql = adapter.conn.executed[-1]
+    assert 'oid IN (SELECT "blob" FROM "docs" WHERE (id %% 2 = 0) AND TRUE)' in sql
+
+    no_oids = TableSchema(name="t", columns=[ColumnSchema("id", "integer", False)])
+    assert adapter.large_objects([no_oids]) == []
@@ -0,0 +1,57 @@
+import asyncio
+
+from dbferry.core.adapters.postgres_async import AsyncPostgresAdapter
+from dbferry.core.chunking import Chunk
+
+
+class _Copy:
+    def __init__(self, calls, query, params):
+        calls.append((query, params))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+
+class _Conn:
+    """Records the statements copy_out hands to psycopg."""
+
+    def __init__(self):
+        self.calls = []
+
+    def cursor(self):
+        return self
+
+    def copy(self, query, params):
+        return _Copy(self.calls, query, params)
+
+
+def _copy_out(chunk, row_filter):
+    adapter = AsyncPostgresAdapter(config=None)
+    adapter.conn = _Conn()
+
+    async def drain():
+        return [d async for d in adapter.copy_out("t", ["id"], chunk, row_filter)]
+
+    asyncio.run(drain())
+    return adapter.conn.calls[0]
+
+
+def test_copy_out_keeps_percent_without_params():
+    query, params = _copy_out(None, "id % 10 = 0")
+    assert "(id % 10 = 0) AND TRUE" in query
+    assert params == ()
+
+
+def test_copy_out_doubles_percent_with_params():
+    query, params = _copy_out(Chunk("id", 1, 5), "id % 10 = 0")
+    assert '(id %% 10 = 0) AND "id" >= %s AND "id" < %s' in query
+    assert params == (1, 5)
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+
+import networkx as nx
+import pytest
+
+from dbferry.core.migrate import build_dependency_graph, resolve_table_order
+from dbferry.core.scheduler import AsyncTableScheduler, TableScheduler
+from dbferry.core.schema import ColumnSchema, ForeignKeySchema, TableSchema
+
+
+def _table(name: str, *parents: str) -> TableSchema:
+    return TableSchema(
+        name=name,
+        columns=[ColumnSchema("id", "integer", False)],
+        primary_key=["id"],
+        foreign_keys=[ForeignKeySchema([f"{p}_id"], p, ["id"]) for p in parents],
+    )
+
+
+def _graph(*edges, nodes=()) -> nx.DiGraph:
+    graph = nx.DiGraph()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+    return graph
+
+
+class _Recorder:
+    """run_table that records the order tables ran in and fails some."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.order: list[str] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, name: str) -> bool:
+        with self._lock:
+            self.order.append(name)
+        if name == "crash":
+            raise RuntimeError("boom")
+        return name not in self.fail
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parents_run_before_children(workers):
+    graph = _graph(("a", "b"), ("b", "c"), ("a", "d"))
+    run = _Recorder()
+    results = TableScheduler(graph, workers, run).run()
+
+    assert {r.status for r in results.values()} == {"done"}
+    for parent, child in graph.edges:
+        assert run.order.index(parent) < run.order.index(child)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_children_of_failed_table_are_skipped(workers):
+    graph = _graph(("a", "b"), ("b", "c"), nodes=["d"])
+    run = _Recorder(fail={"a"})
+    results = TableScheduler(graph, workers, run).run()
+
+    assert results["a"].status == "failed"
+    assert results["b"].status == results["c"].status == "skipped"
+    assert results["d"].status == "done"
+    assert sorted(run.order) == ["a", "d"]
+
+
+def test_crashing_table_counts_as_failed():
+    results = TableScheduler(_graph(nodes=["crash"]), 1, _Recorder()).run()
+    assert results["crash"].status == "failed"
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_fk_cycle_runs_as_one_unit(workers):
+    graph = build_dependency_graph(
+        [_table("a", "b"), _table("b", "a"), _table("c"), _table("d", "a")]
+    )
+    run = _Recorder()
+    results = TableScheduler(graph, workers, run).run()
+
+    assert set(results) == {"a", "b", "c", "d"}
+    assert {r.status for r in results.values()} == {"done"}
+    assert run.order.index("d") > max(run.order.index("a"), run.order.index("b"))
+
+
+def test_failure_in_fk_cycle_skips_its_children():
+    graph = build_dependency_graph(
+        [_table("a", "b"), _table("b", "a"), _table("d", "b")]
+    )
+    results = TableScheduler(graph, 2, _Recorder(fail={"a"})).run()
+
+    assert results["a"].status == "failed"
+    assert results["b"].status == "done"
+    assert results["d"].status == "skipped"
+
+
+def test_async_scheduler_handles_fk_cycles():
+    graph = build_dependency_graph(
+        [_table("a", "b"), _table("b", "a"), _table("c", "a")]
+    )
+    order = []
+
+    async def run_table(name):
+        order.append(name)
+        return True
+
+    results = asyncio.run(AsyncTableScheduler(graph, 2, run_table).run_async())
+    assert {r.status for r in results.values()} == {"done"}
+    assert order[-1] == "c"
+
+
+def test_critical_path_with_cycle():
+    graph = build_dependency_graph(
+        [_table("a", "b"), _table("b", "a"), _table("c", "a")]
+    )
+    scheduler = TableScheduler(graph, 1, _Recorder())
+    scheduler.run()
+    path, total = scheduler.critical_path()
+    assert path == ["a + b", "c"]
+    assert total >= 0
+
+
+def test_resolve_table_order_tolerates_cycles():
+    order = resolve_table_order(
+        [_table("c", "b"), _table("a", "b"), _table("b", "a"), _table("z")]
+    )
+    assert sorted(order) == ["a", "b", "c", "z"]
+    assert order.index("c") > max(order.index("a"), order.index("b"))
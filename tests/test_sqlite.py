@@ -0,0 +1,116 @@
+import datetime
+import decimal
+import sqlite3
+
+import pytest
+
+from dbferry.core.adapters.sqlite import (
+    SQLiteAdapter,
+    reported_type,
+    sqlite_converter,
+    sqlite_type,
+)
+
+
+@pytest.mark.parametrize(
+    "decl, reported",
+    [
+        # Affinity rules, in SQLite's order
+        ("INTEGER", "bigint"),
+        ("TINYINT", "bigint"),
+        ("UNSIGNED BIG INT", "bigint"),
+        ("FLOATING POINT", "bigint"),  # contains INT
+        ("VARCHAR(255)", "text"),
+        ("NCHAR(55)", "text"),
+        ("CLOB", "text"),
+        ("text", "text"),
+        ("BLOB", "bytea"),
+        ("", "bytea"),
+        ("REAL", "double precision"),
+        ("DOUBLE PRECISION", "double precision"),
+        ("FLOAT", "double precision"),
+        ("NUMERIC", "numeric"),
+        ("DECIMAL(10,5)", "numeric"),
+        # Names checked before affinity
+        ("BOOLEAN", "boolean"),
+        ("DATE", "date"),
+        ("DATETIME", "timestamp"),
+        ("TIMESTAMP", "timestamp"),
+        ("JSON", "json"),
+    ],
+)
+def test_reported_type(decl, reported):
+    assert reported_type(decl) == reported
+
+
+def test_sqlite_type_round_trips_native_types():
+    for pg_type in ("bigint", "double precision", "bytea", "text"):
+        assert reported_type(sqlite_type(pg_type)) == pg_type
+
+
+def test_table_schema_reports_affinity(sqlite_config, workdir):
+    conn = sqlite3.connect(workdir / "source.db")
+    conn.execute(
+        "CREATE TABLE t (id INTEGER PRIMARY KEY, name VARCHAR(20) NOT NULL, "
+        "price DECIMAL(10,2) DEFAULT 0, raw, active BOOLEAN)"
+    )
+    conn.close()
+
+    adapter = SQLiteAdapter(sqlite_config.source)
+    adapter.connect()
+    try:
+        schema = adapter.get_table_schema("t")
+    finally:
+        adapter.close()
+    assert [(c.name, c.type, c.nullable) for c in schema.columns] == [
+        ("id", "bigint", True),
+        ("name", "text", False),
+        ("price", "numeric", True),
+        ("raw", "bytea", True),
+        ("active", "boolean", True),
+    ]
+    assert schema.primary_key == ["id"]
+
+
+def test_composite_foreign_key_round_trips(sqlite_config, workdir):
+    conn = sqlite3.connect(workdir / "source.db")
+    conn.executescript(
+        """
+        CREATE TABLE parent (a INTEGER, b TEXT, PRIMARY KEY (a, b));
+        CREATE TABLE child (
+            id INTEGER PRIMARY KEY, pa INTEGER, pb TEXT,
+            FOREIGN KEY (pb, pa) REFERENCES parent (b, a)
+        );
+        """
+    )
+    conn.close()
+
+    source, target = SQLiteAdapter(sqlite_config.source), SQLiteAdapter(
+        sqlite_config.target
+    )
+    source.connect()
+    target.connect()
+    try:
+        (fk,) = source.get_table_schema("child").foreign_keys
+        assert (fk.columns, fk.ref_table, fk.ref_columns) == (
+            ["pb", "pa"],
+            "parent",
+            ["b", "a"],
+        )
+        target.create_table(source.get_table_schema("parent"))
+        target.create_table(source.get_table_schema("child"))
+        assert target.get_table_schema("child").foreign_keys == [fk]
+    finally:
+        source.close()
+        target.close()
+
+
+def test_converters_only_for_types_sqlite_cant_bind():
+    assert sqlite_converter("integer") is None
+    assert sqlite_converter("TEXT") is None
+    convert = sqlite_converter("numeric")
+    assert convert(decimal.Decimal("1.10")) == "1.10"
+    assert sqlite_converter("date")(datetime.date(2024, 1, 2)) == "2024-01-02"
+    assert sqlite_converter("jsonb")({"a": 1}) == '{"a": 1}'
+    assert sqlite_converter("bytea") is None  # sqlite3 binds memoryview itself
+    assert sqlite_converter("date")(None) is None
@@ -0,0 +1,164 @@
+import pytest
+
+from dbferry.core.config import TableSubset
+from dbferry.core.schema import (
+    ColumnSchema,
+    ForeignKeySchema,
+    IndexSchema,
+    SchemaCache,
+    TableSchema,
+    UniqueKeySchema,
+)
+from dbferry.core.subset import apply_subsets
+
+
+def _cache() -> SchemaCache:
+    schemas = {
+        "users": TableSchema(
+            name="users",
+            columns=[
+                ColumnSchema("id", "integer", False),
+                ColumnSchema("email", "text", False),
+                ColumnSchema("ssn", "text", True),
+            ],
+            primary_key=["id"],
+            unique_keys=[UniqueKeySchema(["ssn"])],
+            indexes=[
+                IndexSchema(
+                    "users_email", 'CREATE INDEX users_email ON users ("email")'
+                ),
+                IndexSchema(
+                    "users_ssn", "CREATE INDEX users_ssn ON users (lower(ssn))"
+                ),
+            ],
+        ),
+        "orders": TableSchema(
+            name="orders",
+            columns=[
+                ColumnSchema("id", "integer", False),
+                ColumnSchema("user_id", "integer", True),
+            ],
+            primary_key=["id"],
+            foreign_keys=[ForeignKeySchema(["user_id"], "users", ["id"])],
+        ),
+        "items": TableSchema(
+            name="items",
+            columns=[
+                ColumnSchema("id", "integer", False),
+                ColumnSchema("order_id", "integer", True),
+            ],
+            primary_key=["id"],
+            foreign_keys=[ForeignKeySchema(["order_id"], "orders", ["id"])],
+        ),
+    }
+    cache = SchemaCache(adapter=None)
+    cache.seed(list(schemas), [], schemas)
+    return cache
+
+
+def test_no_subsets_leaves_schemas_alone():
+    cache = _cache()
+    schemas = apply_subsets(cache, ["users", "orders"], {})
+    assert [s.name for s in schemas] == ["users", "orders"]
+    assert all(s.row_filter is None for s in schemas)
+
+
+def test_row_filters_cascade_down_foreign_keys():
+    cache = _cache()
+    tables = ["users", "orders", "items"]
+    users, orders, items = apply_subsets(
+        cache, tables, {"users": TableSubset(where="id < 10")}
+    )
+    assert users.row_filter == "(id < 10)"
+    assert orders.row_filter == (
+        '("user_id" IS NULL OR "user_id" IN '
+        '(SELECT "id" FROM "users" WHERE (id < 10)))'
+    )
+    assert items.row_filter.startswith(
+        '("order_id" IS NULL OR "order_id" IN (SELECT "id" FROM "orders" WHERE '
+    )
+    assert orders.row_filter in items.row_filter
+    # Later lookups in the run see the narrowed schemas
+    assert cache.get("items").row_filter == items.row_filter
+
+
+def test_excluded_columns_drop_their_keys_and_indexes():
+    cache = _cache()
+    (users,) = apply_subsets(
+        cache, ["users"], {"users": TableSubset(exclude_columns=["ssn"])}
+    )
+    assert [c.name for c in users.columns] == ["id", "email"]
+    assert users.unique_keys == []
+    assert [ix.name for ix in users.indexes] == ["users_email"]
+
+
+def test_column_list_keeps_only_those_columns():
+    cache = _cache()
+    (users,) = apply_subsets(
+        cache, ["users"], {"users": TableSubset(columns=["id", "email"])}
+    )
+    assert [c.name for c in users.columns] == ["id", "email"]
+
+
+def test_foreign_key_to_excluded_column_is_dropped():
+    cache = _cache()
+    cache.override(
+        [
+            TableSchema(
+                name="orders",
+                columns=[
+                    ColumnSchema("id", "integer", False),
+                    ColumnSchema("email", "text", True),
+                ],
+                primary_key=["id"],
+                foreign_keys=[ForeignKeySchema(["email"], "users", ["email"])],
+            )
+        ]
+    )
+    users, orders = apply_subsets(
+        cache,
+        ["users", "orders"],
+        {"users": TableSubset(exclude_columns=["email"])},
+    )
+    assert orders.foreign_keys == []
+
+
+def test_primary_key_columns_cannot_be_excluded():
+    with pytest.raises(ValueError, match="primary key"):
+        apply_subsets(
+            _cache(), ["users"], {"users": TableSubset(exclude_columns=["id"])}
+        )
+
+
+def test_unknown_columns_are_rejected():
+    with pytest.raises(ValueError, match="no column"):
+        apply_subsets(_cache(), ["users"], {"users": TableSubset(columns=["nope"])})
+
+
+def test_composite_foreign_key_filters_on_row_values():
+    cache = _cache()
+    cache.override(
+        [
+            TableSchema(
+                name="orders",
+                columns=[
+                    ColumnSchema("id", "integer", False),
+                    ColumnSchema("user_id", "integer", True),
+                    ColumnSchema("user_email", "text", True),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKeySchema(
+                        ["user_id", "user_email"], "users", ["id", "email"]
+                    )
+                ],
+            )
+        ]
+    )
+    _, orders = apply_subsets(
+        cache, ["users", "orders"], {"users": TableSubset(where="id < 10")}
+    )
+    assert orders.row_filter == (
+        '("user_id" IS NULL OR "user_email" IS NULL OR ("user_id", "user_email") IN '
+        '(SELECT "id", "email" FROM "users" WHERE (id < 10)))'
+    )
@@ -0,0 +1,158 @@
+import hashlib
+
+from dbferry.core.chunking import Chunk
+from dbferry.core.schema import ColumnSchema, TableSchema
+from dbferry.core.verify import ChecksumVerifier, RowCounter
+
+
+class _Side:
+    """In-memory stand-in for an adapter's digest queries."""
+
+    def __init__(self, rows: dict, bounds=()):
+        self.rows = rows
+        self.bounds = list(bounds)
+        self.calls = 0
+
+    def _keys(self, lower, upper):
+        return sorted(
+            k
+            for k in self.rows
+            if (lower is None or k >= lower) and (upper is None or k < upper)
+        )
+
+    def _digest(self, key):
+        return hashlib.md5(repr((key, self.rows[key])).encode()).hexdigest()
+
+    def key_ranges(self, schema, count):
+        return Chunk.from_bounds("id", self.bounds) if self.bounds else []
+
+    def range_digest(self, schema, lower=None, upper=None):
+        self.calls += 1
+        keys = self._keys(lower, upper)
+        digest = hashlib.md5("".join(self._digest(k) for k in keys).encode())
+        return len(keys), digest.hexdigest()
+
+    def split_key(self, schema, lower, upper, offset):
+        keys = self._keys(lower, upper)
+        return keys[offset] if 0 < offset < len(keys) else None
+
+    def row_digests(self, schema, lower, upper):
+        return {k: self._digest(k) for k in self._keys(lower, upper)}
+
+
+def _schema(primary_key=("id",)) -> TableSchema:
+    return TableSchema(
+        name="t",
+        columns=[ColumnSchema("id", "integer", False), ColumnSchema("v", "text", True)],
+        primary_key=list(primary_key),
+    )
+
+
+def _rows(n=1000) -> dict:
+    return {(i,): f"v{i}" for i in range(n)}
+
+
+def test_identical_tables_match_on_top_level_ranges():
+    source = _Side(_rows(), bounds=[250, 500, 750])
+    diff = ChecksumVerifier(source, _Side(_rows()), leaf_rows=10).verify_table(
+        _schema()
+    )
+    assert diff.matched
+    assert diff.source_rows == diff.target_rows == 1000
+    assert diff.ranges_checked == 4
+
+
+def test_bisection_pinpoints_each_kind_of_difference():
+    target = _rows()
+    del target[(10,)]
+    target[(500,)] = "edited"
+    target[(1000,)] = "stray"
+    diff = ChecksumVerifier(_Side(_rows()), _Side(target), leaf_rows=8).verify_table(
+        _schema()
+    )
+
+    assert not diff.matched
+    assert diff.missing == [(10,)]
+    assert diff.changed == [(500,)]
+    assert diff.extra == [(1000,)]
+    assert (diff.source_rows, diff.target_rows) == (1000, 1000)
+    # Only the differing branches were split down to leaves
+    assert diff.ranges_checked < 100
+
+
+def test_max_diffs_stops_the_search():
+    target = {k: "other" for k in _rows()}
+    diff = ChecksumVerifier(
+        _Side(_rows()), _Side(target), leaf_rows=8, max_diffs=5
+    ).verify_table(_schema())
+    assert len(diff.changed) == 5
+    assert not diff.matched
+
+
+def test_table_without_key_compares_whole_digest():
+    target = _rows()
+    target[(3,)] = "edited"
+    diff = ChecksumVerifier(_Side(_rows()), _Side(target)).verify_table(_schema(()))
+    assert not diff.matched
+    assert diff.ranges_checked == 1
+    assert "no primary key" in diff.note
+
+
+class _Counts:
+    """Adapter stand-in with estimates and exact counts."""
+
+    def __init__(self, exact: dict, estimates: dict):
+        self.exact = exact
+        self.estimates = estimates
+        self.counted = []
+        self.closed = False
+
+    def estimate_rows(self, tables):
+        return {t: self.estimates[t] for t in tables if t in self.estimates}
+
+    def count_rows(self, table, where=None):
+        self.counted.append((table, where))
+        return self.exact[table]
+
+    def close(self):
+        self.closed = True
+
+
+def test_row_counter_counts_both_sides_exactly():
+    source = _Counts({"a": 10, "b": 5}, {})
+    target = _Counts({"a": 10, "b": 4}, {})
+    a, b = RowCounter(lambda: source, lambda: target, workers=1).count(["a", "b"])
+    assert (a.source, a.target, a.matched) == (10, 10, True)
+    assert (b.source, b.target, b.matched) == (5, 4, False)
+    assert source.closed and target.closed
+
+
+def test_fast_mode_counts_only_disagreeing_estimates():
+    source = _Counts({"a": 1000, "b": 1000, "c": 7}, {"a": 1000, "b": 1000})
+    target = _Counts({"a": 1000, "b": 900, "c": 7}, {"a": 1005, "b": 900})
+    counter = RowCounter(lambda: source, lambda: target, workers=1, fast=True)
+    a, b, c = counter.count(["a", "b", "c"])
+
+    assert not a.exact and a.matched
+    assert b.exact and (b.source, b.target) == (1000, 900)
+    assert c.exact and c.matched  # no estimate at all
+    assert [t for t, _ in source.counted] == ["b", "c"]
+
+
+def test_row_filters_apply_to_the_source_only():
+    source = _Counts({"a": 3}, {"a": 10})
+    target = _Counts({"a": 3}, {"a": 10})
+    counter = RowCounter(
+        lambda: source, lambda: target, workers=1, fast=True, filters={"a": "id < 4"}
+    )
+    (a,) = counter.count(["a"])
+    assert a.exact and a.matched
+    assert source.counted == [("a", "id < 4")]
+    assert target.counted == [("a", None)]
+
+
+def test_count_errors_mark_the_table_unmatched():
+    source = _Counts({}, {})
+    (a,) = RowCounter(lambda: source, lambda: source, workers=1).count(["a"])
+    assert not a.matched
+    assert a.error